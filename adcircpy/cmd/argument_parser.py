@@ -12,6 +12,14 @@ def mesh(parser):
     msg += "corresponds to Mercator projection."
     parser.add_argument('--crs')
 
+    # binary mesh cache
+    msg = "Load the mesh from a binary cache, and create the cache entry on "
+    msg += "first use. Entries are invalidated when the mesh file changes."
+    parser.add_argument('--mesh-cache', action='store_true', help=msg)
+    msg = "Directory of the binary mesh cache. Implies --mesh-cache. "
+    msg += "Defaults to the user cache directory."
+    parser.add_argument('--mesh-cache-dir', help=msg)
+
 
 def output_directory(parser):
     # output directory
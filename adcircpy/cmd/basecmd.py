@@ -219,7 +219,8 @@ class AdcircCommand:
     def _mesh(self):
         mesh = AdcircMesh.open(
                 self.args.mesh,
-                self.args.crs
+                self.args.crs,
+                cache=self.args.mesh_cache_dir or self.args.mesh_cache
         )
 
         if self.args.generate_boundaries:
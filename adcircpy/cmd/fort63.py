@@ -56,7 +56,7 @@ def main():
     args = parse_args()
     fort63 = Fort63(
         args.fort63,
-        # fort14=args.fort14
+        mesh=getattr(args, 'fort14', None),
     )
     {
         'plot': plot,
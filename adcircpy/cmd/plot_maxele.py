@@ -13,7 +13,9 @@ def parse_args():
         help="Path to maxele file.")
     parser.add_argument(
         '--fort14',
-        help="Path to fort.14 file (required if maxele files is not netcdf).")
+        help="Path to fort.14 file (required if maxele files is not netcdf). "
+             "If given, the mesh geometry is memory-mapped from the binary "
+             "mesh cache instead of read from the maxele file.")
     parser.add_argument('--title', help="Plot title override.")
     parser.add_argument('--vmin', type=float)
     parser.add_argument('--vmax', type=float)
@@ -24,7 +26,7 @@ def parse_args():
 
 def main():
     args = parse_args()
-    maxele = Maxele(args.maxele)
+    maxele = Maxele(args.maxele, mesh=args.fort14)
     maxele.tricontourf(vmin=args.vmin, vmax=args.vmax, cmap=args.cmap,
                        levels=args.levels, cbar=True)
     plt.show()
@@ -0,0 +1,24 @@
+"""
+Shared cache of :class:`pyproj.Transformer` objects.
+
+Building a transformer parses both coordinate reference systems and looks up
+the transformation pipeline in the PROJ database, which costs far more than
+transforming a few points, so transformers are kept in a bounded LRU cache
+keyed by their source and destination CRS. Like pyproj transformers, the
+cached ones must not be shared across threads.
+"""
+from functools import lru_cache
+
+from pyproj import CRS, Transformer
+
+
+def get_transformer(src_crs, dst_crs):
+    """Cached ``Transformer.from_crs(src_crs, dst_crs, always_xy=True)``.
+    """
+    return _get_transformer(CRS.from_user_input(src_crs),
+                            CRS.from_user_input(dst_crs))
+
+
+@lru_cache(maxsize=32)
+def _get_transformer(src_crs: CRS, dst_crs: CRS):
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
@@ -10,7 +10,6 @@ from typing import Any, Union
 import matplotlib.pyplot as plt
 import numpy as np
 from psutil import cpu_count
-from shapely.geometry import Point
 
 from adcircpy.forcing import Tides  # , Winds
 from adcircpy.forcing.winds.best_track import BestTrackForcing
@@ -421,8 +420,12 @@ class AdcircRun(Fort15):
         station_types = ['NOUTE', 'NOUTV', 'NOUTM', 'NOUTC']
         for station_type in station_types:
             stations = Fort15.parse_stations(fort15, station_type)
-            for name, vertices in stations.items():
-                if not Point(vertices).within(self.mesh.hull.multipolygon()):
+            if len(stations) == 0:
+                continue
+            inside = self.mesh.contains(
+                [vertices[:2] for vertices in stations.values()])
+            for (name, vertices), contained in zip(stations.items(), inside):
+                if not contained:
                     continue
                 if station_type == 'NOUTE':
                     self.add_elevation_output_station(name, vertices)
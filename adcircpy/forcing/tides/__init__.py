@@ -1,10 +1,12 @@
 from adcircpy.forcing.tides.hamtide import HAMTIDE
-from adcircpy.forcing.tides.tides import TidalSource, Tides
+from adcircpy.forcing.tides.tides import TidalSource, Tides, \
+    get_astronomical_arguments
 from adcircpy.forcing.tides.tpxo import TPXO
 
 __all__ = [
     "Tides",
     'TidalSource',
     'TPXO',
-    'HAMTIDE'
+    'HAMTIDE',
+    'get_astronomical_arguments',
 ]
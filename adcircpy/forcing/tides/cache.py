@@ -0,0 +1,162 @@
+"""
+On-disk cache of tidal amplitudes and phases sampled from tidal datasets.
+
+Each entry is a ``.npz`` file holding the amplitude and phase of one
+constituent at one set of vertices, plus its key as JSON: the dataset class,
+path and version (see :attr:`TidalDataset.version`), the constituent and the
+SHA-256 of the vertex coordinates. Entries are stored under
+``DEFAULT_CACHE_DIRECTORY`` unless a different directory is given, and
+entries of a dataset file that changed are never matched again.
+"""
+import hashlib
+import json
+import logging
+import os
+import pathlib
+from typing import List, Union
+
+import appdirs
+import numpy as np
+
+from adcircpy.forcing.tides.dataset import TidalDataset
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRECTORY = pathlib.Path(appdirs.user_cache_dir('adcircpy')) \
+    / 'tides'
+STORE_VERSION = 1
+
+
+def get_cache_directory(cache_dir: Union[bool, str, os.PathLike] = None):
+    """Resolves the cache directory setting: ``None`` or ``True`` select
+    :data:`DEFAULT_CACHE_DIRECTORY`, anything else is used as a path.
+    """
+    if cache_dir is None or cache_dir is True:
+        return DEFAULT_CACHE_DIRECTORY
+    return pathlib.Path(cache_dir)
+
+
+def get_key(dataset: TidalDataset, constituent: str, vertices: np.ndarray):
+    """Key of the cache entry of ``constituent`` of ``dataset`` at
+    ``vertices``.
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+    return {
+        'version': STORE_VERSION,
+        'dataset': type(dataset).__name__,
+        'path': dataset.path,
+        'dataset_version': dataset.version,
+        'constituent': constituent.lower(),
+        'vertices': hashlib.sha256(
+            str(vertices.shape).encode() + vertices.tobytes()).hexdigest(),
+    }
+
+
+def get_entry_path(dataset: TidalDataset, constituent: str,
+                   vertices: np.ndarray,
+                   cache_dir: Union[bool, str, os.PathLike] = None):
+    """Path of the cache entry of ``constituent`` of ``dataset`` at
+    ``vertices``.
+    """
+    return _get_entry_path(get_key(dataset, constituent, vertices),
+                           cache_dir)
+
+
+def get_all(dataset: TidalDataset, constituents: List[str],
+            vertices: np.ndarray,
+            cache_dir: Union[bool, str, os.PathLike] = None):
+    """Cached version of :meth:`TidalDataset.get_all`.
+
+    Loads the constituents that have a cache entry and samples the others
+    from the dataset in a single call, writing their entries.
+    """
+    vertices = np.asarray(vertices)
+    amplitude = np.empty((len(constituents), len(vertices)))
+    phase = np.empty((len(constituents), len(vertices)))
+    missing = []
+    for i, constituent in enumerate(constituents):
+        entry = load(dataset, constituent, vertices, cache_dir)
+        if entry is None:
+            missing.append(i)
+        else:
+            amplitude[i, :], phase[i, :] = entry
+    if len(missing) > 0:
+        amplitude[missing, :], phase[missing, :] = dataset.get_all(
+            [constituents[i] for i in missing], vertices)
+        for i in missing:
+            key = get_key(dataset, constituents[i], vertices)
+            path = _get_entry_path(key, cache_dir)
+            try:
+                write_entry(path, amplitude[i], phase[i], key)
+            except OSError as e:
+                _logger.warning(f'Could not write tidal cache {path}: {e}')
+    return amplitude, phase
+
+
+def load(dataset: TidalDataset, constituent: str, vertices: np.ndarray,
+         cache_dir: Union[bool, str, os.PathLike] = None):
+    """Returns the cached amplitude and phase of ``constituent`` of
+    ``dataset`` at ``vertices``, or ``None`` if there is no valid cache entry
+    for them.
+    """
+    key = get_key(dataset, constituent, vertices)
+    path = _get_entry_path(key, cache_dir)
+    if not path.is_file():
+        return None
+    try:
+        with np.load(path) as entry:
+            if json.loads(str(entry['key'])) != key:
+                return None
+            return entry['amplitude'], entry['phase']
+    except (OSError, ValueError, KeyError) as e:
+        _logger.warning(f'Ignoring corrupt tidal cache {path}: {e}')
+        return None
+
+
+def entries(cache_dir: Union[bool, str, os.PathLike] = None):
+    """Keys of the entries in the cache directory, with the number of
+    vertices (``size``), file size in bytes (``bytes``) and path (``file``)
+    of each entry.
+    """
+    directory = get_cache_directory(cache_dir)
+    keys = []
+    for path in sorted(directory.glob('*.npz')) if directory.is_dir() \
+            else []:
+        try:
+            with np.load(path) as entry:
+                key = json.loads(str(entry['key']))
+                key['size'] = len(entry['amplitude'])
+        except (OSError, ValueError, KeyError):
+            continue
+        key['bytes'] = path.stat().st_size
+        key['file'] = str(path)
+        keys.append(key)
+    return keys
+
+
+def clear(dataset: TidalDataset = None,
+          cache_dir: Union[bool, str, os.PathLike] = None):
+    """Removes the cache entries of ``dataset`` (of any version), or every
+    entry in the cache directory if ``dataset`` is ``None``.
+    """
+    for key in entries(cache_dir):
+        if dataset is None or (key['dataset'] == type(dataset).__name__
+                               and key['path'] == dataset.path):
+            os.remove(key['file'])
+
+
+def write_entry(path: Union[str, os.PathLike], amplitude: np.ndarray,
+                phase: np.ndarray, key: dict):
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.parent / f'.{path.name}.{os.getpid()}'
+    with open(tmp, 'wb') as f:
+        np.savez(f, amplitude=amplitude, phase=phase,
+                 key=np.array(json.dumps(key)))
+    os.replace(tmp, path)
+
+
+def _get_entry_path(key, cache_dir):
+    name = hashlib.sha256(
+        json.dumps(key, sort_keys=True).encode()).hexdigest()[:32]
+    return get_cache_directory(cache_dir) / f'{name}.npz'
@@ -1,10 +1,49 @@
 from abc import ABC, abstractmethod
+import hashlib
 from os import PathLike
-from typing import Tuple, List
+from pathlib import Path
+from typing import List, NamedTuple, Tuple, Union
 
 
 import numpy as np
 
+from adcircpy.forcing.tides.interpolation import Stencil
+
+
+class GridWindow(NamedTuple):
+    """
+    Block of a tidal dataset grid covering a set of vertices. ``xslices``
+    are the slices of the x axis to read, in order, which are two when the
+    block wraps around the end of the axis, ``yslice`` is the slice of the
+    y axis, and ``x`` and ``y`` are the coordinates of the block, with x
+    increasing across the wrap.
+    """
+    xslices: Tuple[slice, ...]
+    yslice: slice
+    x: np.ndarray
+    y: np.ndarray
+
+    @property
+    def key(self):
+        return tuple((s.start, s.stop) for s in self.xslices) \
+            + ((self.yslice.start, self.yslice.stop),)
+
+
+class TidalStencil(Stencil):
+
+    def __init__(self, window: GridWindow, vertices: np.ndarray):
+        """
+        interpolation stencil of a set of vertices on the block of a tidal
+        dataset grid covering them, which can be applied to the values of
+        any constituent and variable on that block
+        :param window: block of the grid covering the vertices
+        :param vertices: XY locations at which to sample (Mx2)
+        """
+        super().__init__(window.x, window.y, vertices[:, 0], vertices[:, 1],
+                         period=360.)
+        self.window = window
+        self.vertices = vertices
+
 
 class TidalDataset(ABC):
 
@@ -15,6 +54,7 @@ class TidalDataset(ABC):
         """
 
         self.path = str(path) if path is not None else None
+        self._windows = {}
 
     def __call__(
             self,
@@ -24,11 +64,51 @@ class TidalDataset(ABC):
         """
         get tidal ampltidue and phase
         :param constituent: tidal constituent
-        :param vertices: XY locations at which to sample (Mx2)
+        :param vertices: XY locations at which to sample (Mx2), or their
+            stencil from `get_stencil`
         :return: amplitude and phase arrays at given locations
         """
-        return self.get_amplitude(constituent, vertices), \
-            self.get_phase(constituent, vertices)
+        stencil = self.get_stencil(vertices)
+        return self.get_amplitude(constituent, stencil), \
+            self.get_phase(constituent, stencil)
+
+    def get_all(
+            self,
+            constituents: List[str],
+            vertices: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        get tidal amplitude and phase of several constituents, computing
+        the interpolation stencil of the vertices once
+        :param constituents: tidal constituents
+        :param vertices: XY locations at which to sample (Mx2), or their
+            stencil from `get_stencil`
+        :return: amplitude and phase arrays of shape
+            (len(constituents), M)
+        """
+        stencil = self.get_stencil(vertices)
+        amplitude = np.empty((len(constituents), len(stencil)))
+        phase = np.empty((len(constituents), len(stencil)))
+        for i, constituent in enumerate(constituents):
+            amplitude[i, :] = self.get_amplitude(constituent, stencil)
+            phase[i, :] = self.get_phase(constituent, stencil)
+        return amplitude, phase
+
+    def get_stencil(
+            self,
+            vertices: Union[np.ndarray, TidalStencil]
+    ) -> TidalStencil:
+        """
+        compute the interpolation stencil (grid cell indices and weights)
+        of a set of vertices, to sample any constituent and variable there
+        :param vertices: XY locations (Mx2)
+        :return: stencil of the vertices, or the given stencil
+        """
+        if isinstance(vertices, TidalStencil):
+            return vertices
+        vertices = np.asarray(vertices)
+        self._assert_vertices(vertices)
+        return TidalStencil(self._get_window(vertices), vertices)
 
     @abstractmethod
     def get_amplitude(
@@ -39,7 +119,8 @@ class TidalDataset(ABC):
         """
         generate tidal ampltidue
         :param constituent: tidal constituent
-        :param vertices: XY locations at which to sample (Mx2)
+        :param vertices: XY locations at which to sample (Mx2), or their
+            stencil from `get_stencil`
         :return: amplitude at given locations
         """
         raise NotImplementedError
@@ -53,7 +134,8 @@ class TidalDataset(ABC):
         """
         generate tidal phase
         :param constituent: tidal constituent
-        :param vertices: XY locations at which to sample (Mx2)
+        :param vertices: XY locations at which to sample (Mx2), or their
+            stencil from `get_stencil`
         :return: phase at given locations
         """
         raise NotImplementedError
@@ -82,6 +164,160 @@ class TidalDataset(ABC):
         """
         raise NotImplementedError
 
+    @property
+    def version(self) -> str:
+        """
+        :return: identifier of the current contents of a local dataset,
+            from the size and modification time of its NetCDF files, or
+            None for remote datasets
+        """
+        if self.path is None:
+            return None
+        path = Path(self.path)
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = sorted(path.glob('*.nc'))
+        else:
+            return None
+        version = hashlib.sha256()
+        for file in files:
+            stat = file.stat()
+            version.update(
+                f'{file.name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+        return version.hexdigest()
+
+    def _read_window(
+            self,
+            variable: str,
+            constituent: str,
+            window: GridWindow
+    ) -> np.ndarray:
+        """
+        read a block of a dataset variable from the data source
+        :param variable: dataset variable
+        :param constituent: tidal constituent
+        :param window: block of the grid to read
+        :return: possibly masked array of shape (len(window.x),
+            len(window.y))
+        """
+        raise NotImplementedError
+
+    def _get_interpolation(
+            self,
+            variable: str,
+            constituent: str,
+            vertices: Union[np.ndarray, TidalStencil]
+    ) -> np.ndarray:
+        """
+        interpolate a dataset variable, reading only the block of the grid
+        covering the vertices; vertices whose nearest valid node may be
+        outside of the block, e.g. deep inland, are sampled again on blocks
+        of doubling width until it is found
+        """
+        stencil = self.get_stencil(vertices)
+        values, distance = stencil.sample(self._get_window_values(
+            variable, constituent, stencil.window))
+        margin = self._get_margin(stencil)
+        unresolved = np.flatnonzero(~(distance <= margin))
+        buffer = 2
+        while len(unresolved) > 0 and not np.all(np.isinf(margin)):
+            buffer *= 2
+            wider = TidalStencil(
+                self._get_window(stencil.vertices[unresolved], buffer),
+                stencil.vertices[unresolved])
+            values[unresolved], distance = wider.sample(
+                self._get_window_values(variable, constituent,
+                                        wider.window))
+            margin = self._get_margin(wider)
+            unresolved = unresolved[~(distance <= margin)]
+        return values
+
+    def _get_window_values(
+            self,
+            variable: str,
+            constituent: str,
+            window: GridWindow
+    ) -> np.ndarray:
+        key = (variable, constituent.lower(), window.key)
+        if key not in self._windows:
+            self._windows[key] = self._read_window(variable, constituent,
+                                                   window)
+        return self._windows[key]
+
+    def _get_window(self, vertices: np.ndarray, buffer: int = 2
+                    ) -> GridWindow:
+        """
+        :param vertices: XY locations (Mx2)
+        :param buffer: number of grid cells added around the vertices
+        :return: smallest block of the grid covering the vertices, buffered
+            by the given number of cells and wrapping around the dateline
+        """
+        x = np.asarray(self.x, dtype=np.float64)
+        y = np.asarray(self.y, dtype=np.float64)
+        nx, ny = len(x), len(y)
+        xq = x[0] + (vertices[:, 0] - x[0]) % 360.
+        periodic = _is_periodic(x)
+
+        columns = np.unique(np.clip(
+            np.searchsorted(x, xq, side='right') - 1, 0, nx - 1))
+        if periodic:
+            # the block is the complement of the widest gap between the
+            # cells of the vertices, around the circle
+            gaps = np.diff(np.append(columns, columns[0] + nx))
+            widest = np.argmax(gaps)
+            start = columns[(widest + 1) % len(columns)] - buffer
+            stop = columns[widest] + 2 + buffer
+            if stop <= start:
+                stop += nx
+            if stop - start >= nx:
+                start, stop = 0, nx
+        else:
+            start = max(columns[0] - buffer, 0)
+            stop = min(columns[-1] + 2 + buffer, nx)
+        indexes = np.arange(start, stop)
+        if start < 0:
+            xslices = (slice(start + nx, nx), slice(0, stop))
+        elif stop > nx:
+            xslices = (slice(start, nx), slice(0, stop - nx))
+        else:
+            xslices = (slice(start, stop),)
+
+        rows = np.clip(np.searchsorted(y, vertices[:, 1], side='right') - 1,
+                       0, ny - 1)
+        yslice = slice(int(max(np.min(rows) - buffer, 0)),
+                       int(min(np.max(rows) + 2 + buffer, ny)))
+        return GridWindow(
+            tuple(slice(int(s.start), int(s.stop)) for s in xslices),
+            yslice,
+            x[indexes % nx] + 360. * (indexes // nx),
+            y[yslice],
+        )
+
+    def _get_margin(self, stencil: TidalStencil) -> np.ndarray:
+        """
+        :param stencil: stencil of a set of vertices
+        :return: distance from each vertex to the nearest edge of the
+            block of the stencil beyond which the grid has nodes, or inf if
+            the block has every node of the grid
+        """
+        window = stencil.window
+        nx, ny = len(self.x), len(self.y)
+        periodic = _is_periodic(np.asarray(self.x, dtype=np.float64))
+        xq = window.x[0] + (stencil.vertices[:, 0] - window.x[0]) % 360.
+        yq = stencil.vertices[:, 1]
+        margin = np.full(len(xq), np.inf)
+        if sum(s.stop - s.start for s in window.xslices) < nx:
+            if periodic or window.xslices[0].start > 0:
+                margin = np.minimum(margin, xq - window.x[0])
+            if periodic or window.xslices[-1].stop < nx:
+                margin = np.minimum(margin, window.x[-1] - xq)
+        if window.yslice.start > 0:
+            margin = np.minimum(margin, yq - window.y[0])
+        if window.yslice.stop < ny:
+            margin = np.minimum(margin, window.y[-1] - yq)
+        return margin
+
     @staticmethod
     def _assert_vertices(vertices: np.ndarray):
         """
@@ -90,3 +326,11 @@ class TidalDataset(ABC):
         """
         assert len(vertices.shape) == 2 and vertices.shape[1] == 2, \
             'vertices must be of shape Mx2'
+
+
+def _is_periodic(x: np.ndarray) -> bool:
+    """
+    :param x: longitudes of the grid
+    :return: whether the grid wraps around the globe
+    """
+    return len(x) > 1 and bool(np.isclose(x[-1] + x[1] - 2. * x[0], 360.))
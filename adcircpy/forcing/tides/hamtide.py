@@ -3,9 +3,8 @@ from pathlib import Path
 
 from netCDF4 import Dataset
 import numpy as np
-from scipy.interpolate import griddata
 
-from adcircpy.forcing.tides.dataset import TidalDataset
+from adcircpy.forcing.tides.dataset import GridWindow, TidalDataset
 
 
 class HAMTIDE(TidalDataset):
@@ -47,22 +46,14 @@ class HAMTIDE(TidalDataset):
             constituent: str,
             vertices: np.ndarray
     ) -> np.ndarray:
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-        self._assert_vertices(vertices)
-        return self._get_interpolation('elevation', 'AMPL', constituent,
-                                       vertices) * 0.01
+        return self._get_interpolation('AMPL', constituent, vertices) * 0.01
 
     def get_phase(
             self,
             constituent: str,
             vertices: np.ndarray
     ) -> np.ndarray:
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-        self._assert_vertices(vertices)
-        return self._get_interpolation('elevation', 'PHAS', constituent,
-                                       vertices)
+        return self._get_interpolation('PHAS', constituent, vertices)
 
     @property
     def x(self) -> np.ndarray:
@@ -110,48 +101,18 @@ class HAMTIDE(TidalDataset):
 
         return dataset
 
-    def _get_interpolation(
-            self,
-            variable: str,
-            netcdf_variable: str,
-            constituent: str,
-            vertices: np.ndarray
-    ) -> np.ndarray:
-        self._assert_vertices(vertices)
-
-        xq = np.asarray([x + 360. if x < 0. else x
-                         for x in vertices[:, 0]]).flatten()
-        yq = vertices[:, 1].flatten()
-        dx = (self.x[-1] - self.x[0]) / len(self.x)
-        xidx = np.logical_and(
-            self.x >= np.min(xq) - 2.*dx,
-            self.x <= np.max(xq) + 2.*dx
-        )
-        dy = (self.y[-1] - self.y[0]) / len(self.y)
-        yidx = np.logical_and(
-            self.y >= np.min(yq) - 2.*dy,
-            self.y <= np.max(yq) + 2.*dy
-        )
-        xi, yi = np.meshgrid(self.x[xidx], self.y[yidx])
-        xi = xi.flatten()
-        yi = yi.flatten()
-        dataset = self._get_dataset(variable, constituent)
-        zi = dataset[netcdf_variable][yidx, xidx].flatten()
-        values = griddata(
-                (xi[~zi.mask], yi[~zi.mask]),
-                zi[~zi.mask],
-                (xq, yq),
-                method='linear',
-                fill_value=np.nan
-            )
-        nan_idxs = np.where(np.isnan(values))
-        values[nan_idxs] = griddata(
-                (xi[~zi.mask], yi[~zi.mask]),
-                zi[~zi.mask],
-                (xq[nan_idxs], yq[nan_idxs]),
-                method='nearest',
-        )
-        return values
+    def _read_window(self, variable: str, constituent: str,
+                     window: GridWindow) -> np.ma.MaskedArray:
+        """
+        `variable` is the name of a variable of the elevation NetCDF file
+        of the constituent, `AMPL` or `PHAS`.
+        """
+        dataset = self._get_dataset('elevation', constituent)
+        # HAMTIDE variables are stored as (lat, lon)
+        return np.ma.concatenate([
+            np.ma.asarray(dataset[variable][window.yslice, xslice]).T
+            for xslice in window.xslices
+        ], axis=0)
 
     def _prepend_path(self, filename: str) -> str:
         if self.path is None:
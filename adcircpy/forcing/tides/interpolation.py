@@ -0,0 +1,167 @@
+"""
+Interpolation of values given on regular longitude/latitude grids, as used
+by the tidal databases.
+
+Query points are located on the grid axes by index arithmetic and values
+are interpolated bilinearly between the four corners of the enclosing cell.
+Points whose cell has a masked (e.g. land) or missing corner, or that fall
+outside the grid, take the value of the nearest valid grid node instead.
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class Stencil:
+
+    def __init__(self, x, y, xq, yq, period: float = None):
+        """Bilinear interpolation stencil of the points ``(xq, yq)`` on the
+        grid with ascending axes ``x`` and ``y``.
+
+        If ``period`` is given, ``x`` is a periodic coordinate (longitude):
+        query points are wrapped into ``[x[0], x[0] + period)`` and, if the
+        axis spans the whole period, points past its last node are
+        interpolated across the seam.
+        """
+        self._x = np.asarray(x, dtype=np.float64)
+        self._y = np.asarray(y, dtype=np.float64)
+        xq = np.asarray(xq, dtype=np.float64).flatten()
+        yq = np.asarray(yq, dtype=np.float64).flatten()
+        if period is not None:
+            xq = self._x[0] + (xq - self._x[0]) % period
+        self._xq, self._yq = xq, yq
+        self._period = period
+        i0, i1, tx, xinside = _locate(self._x, xq, self.seam)
+        j0, j1, ty, yinside = _locate(self._y, yq, None)
+        self._i = np.stack([i0, i1, i0, i1], axis=1)
+        self._j = np.stack([j0, j0, j1, j1], axis=1)
+        self._weights = np.stack([(1. - tx) * (1. - ty), tx * (1. - ty),
+                                  (1. - tx) * ty, tx * ty], axis=1)
+        self._inside = xinside & yinside
+
+    def __call__(self, values):
+        """Interpolates ``values``, of shape ``(len(x), len(y))``, possibly
+        masked, at the query points.
+        """
+        return self.sample(values)[0]
+
+    def sample(self, values):
+        """Interpolates ``values`` like :meth:`__call__`, also returning the
+        distance from each query point to the node it took its value from:
+        zero where interpolated bilinearly, and ``inf`` where there is no
+        valid node.
+        """
+        data, valid = _split(values, (len(self._x), len(self._y)))
+        corners = data[self._i, self._j]
+        usable = valid[self._i, self._j] | (self._weights == 0.)
+        bilinear = self._inside & np.all(usable, axis=1)
+        result = np.full(len(self._xq), np.nan)
+        result[bilinear] = np.sum(
+            self._weights[bilinear]
+            * np.where(valid[self._i, self._j], corners, 0.)[bilinear],
+            axis=1)
+        distance = np.where(bilinear, 0., np.inf)
+        fallback = np.flatnonzero(~bilinear)
+        if len(fallback) > 0 and np.any(valid):
+            result[fallback], distance[fallback] = self._nearest(
+                data, valid, fallback)
+        return result, distance
+
+    def __len__(self):
+        return len(self._xq)
+
+    @property
+    def seam(self):
+        """Period of the x axis if it wraps around, else None."""
+        if self._period is None or len(self._x) < 2:
+            return None
+        dx = self._x[1] - self._x[0]
+        if np.isclose(self._x[-1] + dx - self._x[0], self._period):
+            return self._period
+        return None
+
+    def _nearest(self, data, valid, index):
+        """Values of the valid grid nodes nearest to query points ``index``,
+        and their distances to the points.
+
+        The nodes are searched in the bounding box of the points, buffered
+        by a number of cells that doubles until the nearest node found for
+        every point is closer than the buffer, so it is the nearest overall.
+        """
+        xq, yq = self._xq[index], self._yq[index]
+        nx, ny = len(self._x), len(self._y)
+        ilo, ihi = _bounds(self._x, xq)
+        jlo, jhi = _bounds(self._y, yq)
+        spacing = min(np.min(np.diff(self._x)) if nx > 1 else np.inf,
+                      np.min(np.diff(self._y)) if ny > 1 else np.inf)
+        buffer = 2
+        while True:
+            i = np.arange(ilo - buffer, ihi + buffer + 1)
+            if self.seam is not None:
+                # unwrapped across the seam, so each point sees the nodes
+                # within half a period on both sides once the buffer
+                # reaches half the axis
+                x = self._x[i % nx] + self.seam * (i // nx)
+                i = i % nx
+                whole = 2 * buffer >= nx
+            else:
+                i = i[(i >= 0) & (i < nx)]
+                x = self._x[i]
+                whole = len(i) == nx
+            j = np.arange(max(jlo - buffer, 0), min(jhi + buffer + 1, ny))
+            whole = whole and len(j) == ny
+            mask = valid[np.ix_(i, j)]
+            if np.any(mask):
+                ii, jj = np.nonzero(mask)
+                tree = cKDTree(np.column_stack([x[ii], self._y[j][jj]]))
+                distance, nearest = tree.query(np.column_stack([xq, yq]))
+                if whole or np.all(distance <= buffer * spacing):
+                    return data[i[ii[nearest]], j[jj[nearest]]], distance
+            elif whole:
+                return np.full(len(index), np.nan), \
+                    np.full(len(index), np.inf)
+            buffer *= 2
+
+
+def interpolate(x, y, values, xq, yq, period: float = None):
+    """Interpolates ``values``, of shape ``(len(x), len(y))``, at the points
+    ``(xq, yq)`` (see :class:`Stencil`).
+    """
+    return Stencil(x, y, xq, yq, period)(values)
+
+
+def _locate(axis, q, period):
+    """Index of the lower and upper nodes of the axis cell containing each
+    value of ``q``, the fractional position of the value in the cell and
+    whether the value is inside the axis.
+    """
+    n = len(axis)
+    if period is not None:
+        # extend the axis with the first node, one period later
+        axis = np.append(axis, axis[0] + period)
+    if len(axis) < 2:
+        zeros = np.zeros(len(q), dtype=int)
+        return zeros, zeros, np.zeros(len(q)), q == axis[0]
+    lower = np.clip(np.searchsorted(axis, q, side='right') - 1, 0,
+                    len(axis) - 2)
+    t = (q - axis[lower]) / (axis[lower + 1] - axis[lower])
+    inside = (t >= 0.) & (t <= 1.)
+    return lower, (lower + 1) % n, t, inside
+
+
+def _bounds(axis, q):
+    """Range of axis indexes spanning the values of ``q``."""
+    lower = np.searchsorted(axis, np.min(q), side='right') - 1
+    upper = np.searchsorted(axis, np.max(q), side='left')
+    return int(lower), int(upper)
+
+
+def _split(values, shape):
+    """Data of a possibly masked array as floats, and the mask of its valid
+    (unmasked and finite) nodes.
+    """
+    data = np.ma.getdata(values).astype(np.float64, copy=False)
+    if data.shape != shape:
+        raise ValueError(f'Expected values of shape {shape}, got '
+                         f'{data.shape}.')
+    valid = ~np.ma.getmaskarray(values) & np.isfinite(data)
+    return data, valid
@@ -2,12 +2,15 @@ from collections import OrderedDict
 from datetime import datetime, timedelta
 from enum import Enum
 from functools import lru_cache
+import math
 from os import PathLike
-from typing import Union
+from typing import List, Union
 
 import numpy as np
+import pandas as pd
 
 from adcircpy.forcing import bctypes
+from adcircpy.forcing.tides import cache as tides_cache
 from adcircpy.forcing.tides.hamtide import HAMTIDE
 from adcircpy.forcing.tides.tpxo import TPXO
 
@@ -19,7 +22,12 @@ class TidalSource(Enum):
 
 class Tides(bctypes.EtaBc):
     def __init__(self, tidal_source: Union[str, TidalSource] = None,
-                 resource: PathLike = None):
+                 resource: PathLike = None,
+                 cache: Union[bool, str, PathLike] = False):
+        """Pass ``cache=True`` (or a cache directory) to keep the amplitudes
+        and phases sampled from the tidal dataset in the on-disk cache of
+        :mod:`adcircpy.forcing.tides.cache`.
+        """
         if tidal_source is None:
             tidal_source = TidalSource.HAMTIDE
         elif isinstance(tidal_source, str):
@@ -33,6 +41,7 @@ class Tides(bctypes.EtaBc):
 
         self.tidal_source = tidal_source
         self.tidal_dataset = tidal_source.value(resource)
+        self.cache = cache
 
     def __call__(self, constituent: str) -> ():
         return self.get_tidal_constituent(constituent)
@@ -74,6 +83,17 @@ class Tides(bctypes.EtaBc):
         assert constituent in self.active_constituents, msg
         self._active_constituents.pop(constituent)
 
+    def get_tidal_dataset_values(self, constituents: List[str],
+                                 vertices: np.ndarray):
+        """Amplitude and phase arrays, of shape (len(constituents), M), of
+        the constituents sampled from the tidal dataset at the (Mx2)
+        vertices, through the on-disk cache if enabled.
+        """
+        if self.cache is False or self.cache is None:
+            return self.tidal_dataset.get_all(constituents, vertices)
+        return tides_cache.get_all(self.tidal_dataset, constituents,
+                                   vertices, self.cache)
+
     def get_active_constituents(self):
         return list(self.active_constituents.keys())
 
@@ -319,19 +339,19 @@ class Tides(bctypes.EtaBc):
         return 277.0256206 \
                + 129.38482032 * self.DYR \
                + 13.176396768 * self.DDAY \
-               + .549016532 * self.forcing_start_date.hour
+               + .549016532 * self.forcing_start_hour
 
     def get_solar_perigee(self):
         return 281.2208569 \
                + .01717836 * self.DYR \
                + .000047064 * self.DDAY \
-               + .000001961 * self.start_date.hour
+               + .000001961 * self.start_hour
 
     def get_solar_mean_longitude(self):
         return 280.1895014 \
                - .238724988 * self.DYR \
                + .9856473288 * self.DDAY \
-               + .0410686387 * self.start_date.hour
+               + .0410686387 * self.start_hour
 
     @property
     def EQ73(self):
@@ -539,9 +559,17 @@ class Tides(bctypes.EtaBc):
             'Q1': 0.695
         }
 
+    @property
+    def start_hour(self):
+        return self.start_date.hour
+
+    @property
+    def forcing_start_hour(self):
+        return self.forcing_start_date.hour
+
     @property
     def hour_middle(self):
-        return self.forcing_start_date.hour + (
+        return self.forcing_start_hour + (
                 (self.end_date - self.forcing_start_date).total_seconds()
                 / 3600 / 2)
 
@@ -572,7 +600,7 @@ class Tides(bctypes.EtaBc):
 
     @property
     def DT(self):
-        return (180. + self.start_date.hour * (360. / 24))
+        return (180. + self.start_hour * (360. / 24))
 
     @property
     def DS(self):
@@ -745,3 +773,98 @@ class Tides(bctypes.EtaBc):
     @property
     def iettype(self):
         return 3
+
+
+class _PowArray(np.ndarray):
+    """
+    Array raised to powers element by element with the C library ``pow``,
+    like numpy and Python scalars, instead of the vectorized power of numpy
+    arrays, which can differ in the last bit.
+    """
+
+    def __pow__(self, exponent):
+        return np.asarray(_pow(self, exponent), dtype=np.float64) \
+            .view(_PowArray)
+
+
+_pow = np.frompyfunc(math.pow, 2, 1)
+
+
+class _DateArrays(Tides):
+    """
+    Tides whose date dependent quantities are arrays over many forcing
+    periods, so its astronomical formulas are evaluated for all of them at
+    once. Only those formulas are used, so there is no tidal dataset.
+    """
+
+    def __init__(self, start_dates, end_dates, spinup_time: timedelta):
+        start_dates = pd.DatetimeIndex(start_dates)
+        if isinstance(end_dates, timedelta):
+            end_dates = start_dates + end_dates
+        else:
+            end_dates = pd.DatetimeIndex(np.broadcast_to(
+                np.asarray(end_dates), (len(start_dates),)))
+        forcing_start_dates = start_dates - abs(spinup_time)
+        # the formulas of Tides then evaluate to arrays matching their
+        # scalar values exactly
+        self._start_hour = start_dates.hour.to_numpy().view(_PowArray)
+        self._forcing_start_hour = forcing_start_dates.hour.to_numpy() \
+            .view(_PowArray)
+        years = forcing_start_dates.year.to_numpy()
+        self._DYR = (years - 1900.).view(_PowArray)
+        self._DDAY = (forcing_start_dates.dayofyear.to_numpy()
+                      + np.trunc((years - 1901.) / 4.).astype(int)
+                      - 1).view(_PowArray)
+        self._hour_middle = self._forcing_start_hour + (
+                (end_dates - forcing_start_dates).total_seconds().to_numpy()
+                / 3600 / 2)
+
+    @property
+    def start_hour(self):
+        return self._start_hour
+
+    @property
+    def forcing_start_hour(self):
+        return self._forcing_start_hour
+
+    @property
+    def hour_middle(self):
+        return self._hour_middle
+
+    @property
+    def DYR(self):
+        return self._DYR
+
+    @property
+    def DDAY(self):
+        return self._DDAY
+
+
+def get_astronomical_arguments(
+        constituents: List[str],
+        start_dates,
+        end_dates,
+        spinup_time: timedelta = timedelta(0.),
+):
+    """Nodal factors and equilibrium arguments (Greenwich factors) of
+    ``constituents`` for many forcing periods at once, as computed by
+    :meth:`Tides.get_nodal_factor` and :meth:`Tides.get_greenwich_factor`.
+
+    Args:
+        start_dates: Start dates of the forcing periods.
+        end_dates: End dates of the forcing periods, one for all of them,
+            or the duration of the forcing periods as a timedelta.
+        spinup_time: Spinup time of the forcing periods.
+
+    Returns:
+        Arrays of nodal factors and equilibrium arguments, of shape
+        (len(constituents), len(start_dates)).
+    """
+    dates = _DateArrays(start_dates, end_dates, spinup_time)
+    shape = (len(dates.start_hour),)
+    nodal_factors = np.empty((len(constituents),) + shape)
+    greenwich_factors = np.empty((len(constituents),) + shape)
+    for i, constituent in enumerate(constituents):
+        nodal_factors[i, :] = dates.get_nodal_factor(constituent)
+        greenwich_factors[i, :] = dates.get_greenwich_factor(constituent)
+    return nodal_factors, greenwich_factors
@@ -5,9 +5,8 @@ from pathlib import Path
 import appdirs
 from netCDF4 import Dataset
 import numpy as np
-from scipy.interpolate import griddata
 
-from adcircpy.forcing.tides.dataset import TidalDataset
+from adcircpy.forcing.tides.dataset import GridWindow, TidalDataset
 
 TPXO_ENVIRONMENT_VARIABLE = 'TPXO_NCFILE'
 TPXO_FILENAME = 'h_tpxo9.v1.nc'
@@ -27,9 +26,8 @@ class TPXO(TidalDataset):
 
         super().__init__(tpxo_dataset_filename)
 
-        if self.path is not None:
-            self.dataset = Dataset(self.path)
-        else:
+        if self.path is None or not (Path(self.path).is_file()
+                                     or '://' in self.path):
             raise FileNotFoundError('\n'.join([
                 f'No TPXO file found at "{self.path}".',
                 'New users will need to register and request a copy of '
@@ -45,28 +43,32 @@ class TPXO(TidalDataset):
             constituent: str,
             vertices: np.ndarray
     ) -> np.ndarray:
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-        self._assert_vertices(vertices)
-        return self._get_interpolation(self.ha, constituent, vertices)
+        return self._get_interpolation('ha', constituent, vertices)
 
     def get_phase(
             self,
             constituent: str,
             vertices: np.ndarray
     ) -> np.ndarray:
-        if not isinstance(vertices, np.ndarray):
-            vertices = np.asarray(vertices)
-        self._assert_vertices(vertices)
-        return self._get_interpolation(self.hp, constituent, vertices)
+        return self._get_interpolation('hp', constituent, vertices)
+
+    @property
+    def dataset(self) -> Dataset:
+        if not hasattr(self, '_dataset'):
+            self._dataset = Dataset(self.path)
+        return self._dataset
 
     @property
     def x(self) -> np.ndarray:
-        return self.dataset['lon_z'][:, 0].data
+        if not hasattr(self, '_x'):
+            self._x = self.dataset['lon_z'][:, 0].data
+        return self._x
 
     @property
     def y(self) -> np.ndarray:
-        return self.dataset['lat_z'][0, :].data
+        if not hasattr(self, '_y'):
+            self._y = self.dataset['lat_z'][0, :].data
+        return self._y
 
     @property
     def ha(self) -> np.ndarray:
@@ -84,52 +86,15 @@ class TPXO(TidalDataset):
                     '|S1').tostring().decode('utf-8').split()]
         return self._constituents
 
-    def _get_interpolation(self, tpxo_array: np.ndarray, constituent: str,
-                           vertices: np.ndarray):
+    def _read_window(self, variable: str, constituent: str,
+                     window: GridWindow) -> np.ma.MaskedArray:
         """
-        `tpxo_index_key` is either `ha` or `hp` based on the keys used
+        `variable` is either `ha` or `hp` based on the keys used
         internally in the TPXO NetCDF file.
         """
-
-        self._assert_vertices(vertices)
         constituents = list(map(lambda x: x.lower(), self.constituents))
         constituent = constituents.index(constituent.lower())
-        array = tpxo_array[constituent, :, :].flatten()
-        _x = np.asarray([x + 360. for x in vertices[:, 0] if x < 0]).flatten()
-        _y = vertices[:, 1].flatten()
-        x, y = np.meshgrid(self.x, self.y, indexing='ij')
-        x = x.flatten()
-        y = y.flatten()
-        dx = np.mean(np.diff(self.x))
-        dy = np.mean(np.diff(self.y))
-
-        # buffer the bbox by 2 difference units
-        _idx = np.where(
-                np.logical_and(
-                        np.logical_and(
-                                x >= np.min(_x) - 2 * dx,
-                                x <= np.max(_x) + 2 * dx
-                        ),
-                        np.logical_and(
-                                y >= np.min(_y) - 2 * dy,
-                                y <= np.max(_y) + 2 * dy
-                        )
-                )
-        )
-
-        # "method" can be 'spline' or any string accepted by griddata()'s method kwarg.
-        values = griddata(
-                (x[_idx], y[_idx]),
-                array[_idx],
-                (_x, _y),
-                method='linear',
-                fill_value=np.nan,
-        )
-        nan_idxs = np.where(np.isnan(values))
-        values[nan_idxs] = griddata(
-                (x[_idx], y[_idx]),
-                array[_idx],
-                (_x[nan_idxs], _y[nan_idxs]),
-                method='nearest',
-        )
-        return values
+        return np.ma.concatenate([
+            self.dataset[variable][constituent, xslice, window.yslice]
+            for xslice in window.xslices
+        ], axis=0)
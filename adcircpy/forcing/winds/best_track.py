@@ -17,11 +17,12 @@ from matplotlib.transforms import Bbox
 import numpy as np
 import pandas
 from pandas import DataFrame, read_csv
-from pyproj import CRS, Proj, Transformer
+from pyproj import CRS, Proj
 from shapely import ops
 from shapely.geometry import Point, Polygon
 import utm
 
+from adcircpy.crs import get_transformer
 from adcircpy.forcing.winds.base import WindForcing
 
 logger = logging.getLogger(__name__)
@@ -430,12 +431,10 @@ class BestTrackForcing(WindForcing):
                         'WGS 84': 'WGS84'
                     }[df_crs.ellipsoid.name]
             )
-            transformer = Transformer.from_crs(
-                    df_crs, utm_crs, always_xy=True)
+            transformer = get_transformer(df_crs, utm_crs)
             p = Point(*transformer.transform(lon, lat))
             pol = p.buffer(radii)
-            transformer = Transformer.from_crs(
-                    utm_crs, bbox_crs, always_xy=True)
+            transformer = get_transformer(utm_crs, bbox_crs)
             pol = ops.transform(transformer.transform, pol)
             if _switch is True:
                 if not pol.intersects(bbox_pol):
@@ -389,13 +389,15 @@ class Fort15:
                             # f'{len(self.mesh.open_boundaries)}',
                         ]
                 )
+            xy = self.mesh.get_xy(crs='EPSG:4326')
+            tides = self.mesh.forcings.tides
+            active = tides.get_active_constituents()
             for row in self.mesh.boundaries.ocean.gdf.itertuples():
-                for constituent in self.mesh.forcings.tides.get_active_constituents():
+                vertices = xy[row.indexes, :]
+                amps, phases = tides.get_tidal_dataset_values(active,
+                                                              vertices)
+                for constituent, amp, phase in zip(active, amps, phases):
                     f.append(fort15_line(constituent))
-                    vertices = self.mesh.get_xy(crs='EPSG:4326')[row.indexes,
-                               :]
-                    amp, phase = self.mesh.forcings.tides.tidal_dataset(
-                            constituent, vertices)
                     f.extend(
                             fort15_line(f'{amp[i]:.8e} {phase[i]:.8e}')
                             for i in range(len(vertices))
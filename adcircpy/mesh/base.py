@@ -1,11 +1,10 @@
 from abc import ABC
-from collections import defaultdict
+from collections import defaultdict, deque
 from functools import lru_cache
 import logging
-from itertools import permutations
 import os
 import pathlib
-from typing import Union, Sequence, Hashable, List, Dict
+from typing import Union, Sequence, Hashable, List, Dict, Tuple
 
 import geopandas as gpd
 from matplotlib.collections import PolyCollection
@@ -14,7 +13,9 @@ import matplotlib.pyplot as plt
 from matplotlib.tri import Triangulation
 from matplotlib.transforms import Bbox
 import numpy as np
-from pyproj import Transformer, CRS
+from pyproj import CRS
+from scipy.spatial import cKDTree
+import shapely
 from shapely.geometry import (
     box,
     LinearRing,
@@ -23,74 +24,279 @@ from shapely.geometry import (
     Polygon,
     Point,
 )
+from shapely.strtree import STRtree
 
-from adcircpy.mesh.parsers import grd, sms2dm
+from adcircpy.crs import get_transformer
+from adcircpy.mesh import cache as mesh_cache, ordering, partition
+from adcircpy.mesh.parsers import grd, sms2dm, ugrid
+from adcircpy.mesh.quality import MeshQuality
 from adcircpy.figures import figure
 
 _logger = logging.getLogger(__name__)
 
 
-class Nodes:
+class _IdIndex:
+    """Vectorized translation between id's and array indexes.
 
-    def __init__(self, nodes: Dict[Hashable, List[List]], crs=None):
+    Integer id's are looked up arithmetically when they are contiguous (e.g.
+    1..N) and through a sorted-id :func:`numpy.searchsorted` otherwise.
+    Subclasses provide the ``id`` array.
+    """
+
+    def get_index_by_id(self, id):
+        scalar = np.ndim(id) == 0
+        if self.id.dtype == object:
+            index = np.array([self._id_map[i] for i in
+                              np.atleast_1d(np.asarray(id, dtype=object))],
+                             dtype=int)
+        else:
+            id = np.atleast_1d(id)
+            try:
+                query = id.astype(np.int64)
+            except (TypeError, ValueError):
+                raise KeyError(id)
+            if id.dtype.kind in 'fc':
+                # only integral id's match, like a dict lookup would
+                nonintegral = query != id
+                if np.any(nonintegral):
+                    raise KeyError(id[nonintegral][0])
+            if self._offset is not None:
+                index = query - self._offset
+                valid = (index >= 0) & (index < len(self.id))
+            else:
+                pos = np.searchsorted(self.id, query, sorter=self._sorter)
+                index = self._sorter[np.minimum(pos, len(self.id) - 1)]
+                valid = self.id[index] == query
+            if not np.all(valid):
+                raise KeyError(query[~valid][0])
+        return int(index[0]) if scalar else index
+
+    def get_id_by_index(self, index):
+        return self.id[index]
+
+    @property
+    def _offset(self):
+        if not hasattr(self, '_id_offset'):
+            offset = None
+            if len(self.id) > 0 and self.id.dtype != object and \
+                    self.id[-1] - self.id[0] == len(self.id) - 1 and \
+                    np.all(np.diff(self.id) == 1):
+                offset = int(self.id[0])
+            self._id_offset = offset
+        return self._id_offset
+
+    @property
+    def _sorter(self):
+        if not hasattr(self, '_id_sorter'):
+            self._id_sorter = np.argsort(self.id, kind='stable')
+        return self._id_sorter
+
+    @property
+    def _id_map(self):
+        if not hasattr(self, '_id_to_index'):
+            self._id_to_index = {id: i for i, id in enumerate(self.id)}
+        return self._id_to_index
+
+
+def _as_id_array(ids):
+    """Casts a sequence of id's to an int32 array (int64 if required).
+    Id's that are not integer-like are kept in an object array.
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind not in 'iu':
+        try:
+            ids = ids.astype(np.int64)
+        except (TypeError, ValueError):
+            _ids = np.empty(len(ids), dtype=object)
+            _ids[:] = list(ids)
+            return _ids
+    if ids.size == 0 or (ids.min() >= np.iinfo(np.int32).min
+                         and ids.max() <= np.iinfo(np.int32).max):
+        return ids.astype(np.int32)
+    return ids.astype(np.int64)
+
+
+def _get_bounds(bbox):
+    return bbox.bounds if hasattr(bbox, 'bounds') else tuple(bbox)
+
+
+def _in_bbox(coords, bbox):
+    xmin, ymin, xmax, ymax = _get_bounds(bbox)
+    return (coords[:, 0] >= xmin) & (coords[:, 0] <= xmax) \
+        & (coords[:, 1] >= ymin) & (coords[:, 1] <= ymax)
+
+
+class Adjacency:
+    """Compressed sparse row (CSR) adjacency.
+
+    The neighbors of item ``i`` are ``indices[indptr[i]:indptr[i + 1]]``,
+    sorted in ascending order.
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices)
+
+    @classmethod
+    def from_pairs(cls, rows, cols, size: int):
+        """Builds the adjacency of ``size`` items from (row, col) neighbor
+        pairs. Duplicate pairs are dropped.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        ncols = cols.max() + 1 if cols.size > 0 else 1
+        keys = np.sort(rows * ncols + cols)
+        keys = keys[np.append(True, np.diff(keys) != 0)] if keys.size > 0 \
+            else keys
+        rows, cols = np.divmod(keys, ncols)
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+        return cls(indptr, cols.astype(np.int32))
+
+    @classmethod
+    def from_connectivity(cls, connectivity, size: int):
+        """Builds the adjacency of ``size`` nodes sharing an element of a
+        -1 padded connectivity array of node indexes.
+        """
+        return cls.from_pairs(*_vertex_pairs(connectivity), size)
+
+    def __getitem__(self, index):
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def items(self):
+        """Iterates over ``(index, neighbors)`` for items with neighbors."""
+        for index in np.flatnonzero(self.degree):
+            yield index, self[index]
+
+    def union(self, index):
+        """Sorted unique neighbors of all the items in ``index``."""
+        index = np.atleast_1d(index)
+        start = self.indptr[index]
+        length = self.indptr[index + 1] - start
+        offset = np.repeat(start - np.cumsum(length) + length, length)
+        return np.unique(self.indices[offset + np.arange(length.sum())])
+
+    def pairs(self):
+        """(row, col) arrays of all neighbor pairs."""
+        return np.repeat(np.arange(len(self)), self.degree), self.indices
+
+    @property
+    def degree(self):
+        """Number of neighbors of each item."""
+        return np.diff(self.indptr)
+
+
+def _vertex_pairs(connectivity):
+    """Ordered pairs of distinct vertices sharing an element, from a -1
+    padded connectivity array.
+    """
+    connectivity = np.asarray(connectivity)
+    width = connectivity.shape[1]
+    i, j = np.nonzero(~np.eye(width, dtype=bool))
+    rows = connectivity[:, i].ravel()
+    cols = connectivity[:, j].ravel()
+    mask = (rows != -1) & (cols != -1)
+    return rows[mask], cols[mask]
+
+
+class Nodes(_IdIndex):
+
+    def __init__(self, nodes: Union[Dict[Hashable, List[List]], Tuple],
+                 crs=None):
         """Setter for the nodes attribute.
 
         Argument nodes must be of the form:
             {id: [(x0, y0), z0]}
             or
             {id: [(x0, y0), [z0, ..., zn]}
+            or
+            (id, coords, values)
+        where the last form is a tuple of arrays as returned by
+        :func:`adcircpy.mesh.parsers.grd.buffer_to_arrays`.
 
         Grd format is assumed to be exclusively a 2D format that can hold
-        triangles or quads.
+        triangles or quads. Nodes are stored as contiguous arrays of id's
+        (int32), coordinates and values (float64).
 
         """
 
-        for coords, _ in nodes.values():
-            if len(coords) != 2:
-                raise ValueError(
-                    'Coordinate vertices for a gr3 type must be 2D, but got '
-                    f'coordinates {coords}.')
+        if isinstance(nodes, tuple):
+            id, coords, values = nodes
+        else:
+            id = list(nodes.keys())
+            coords = [coords for coords, _ in nodes.values()]
+            values = [value for _, value in nodes.values()]
+
+        coords = np.array(coords, dtype=np.float64)
+        if coords.size == 0:
+            coords = coords.reshape((0, 2))
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError(
+                'Coordinate vertices for a gr3 type must be 2D, but got '
+                f'coordinates of shape {coords.shape}.')
 
-        self._id = list(nodes.keys())
-        self._coords = np.array(
-            [coords for coords, _ in nodes.values()])
+        self._id = _as_id_array(id)
+        self._coords = coords
         self._crs = CRS.from_user_input(crs) if crs is not None else crs
-        self._values = np.array(
-            [value for _, value in nodes.values()])
+        self._values = np.array(values, dtype=np.float64)
 
     def transform_to(self, dst_crs):
         dst_crs = CRS.from_user_input(dst_crs)
         if not self.crs.equals(dst_crs):
-            self._coords = self.get_xy(dst_crs)
+            self._coords = self._transform(dst_crs)
             self._crs = dst_crs
 
         if hasattr(self, '_gdf'):
             del self._gdf
+        if hasattr(self, '_xy'):
+            del self._xy
 
     def get_xy(self, crs: Union[CRS, str] = None):
+        """Node coordinates in ``crs``. Reprojected coordinates are
+        memoized per CRS until :meth:`transform_to` is called, and returned
+        as read-only arrays.
+        """
         if crs is not None:
             crs = CRS.from_user_input(crs)
             if not crs.equals(self.crs):
-                transformer = Transformer.from_crs(
-                    self.crs, crs, always_xy=True)
-                x, y = transformer.transform(
-                    self.coord[:, 0], self.coord[:, 1])
-                return np.vstack([x, y]).T
+                if not hasattr(self, '_xy'):
+                    self._xy = {}
+                if crs not in self._xy:
+                    xy = self._transform(crs)
+                    xy.flags.writeable = False
+                    self._xy[crs] = xy
+                return self._xy[crs]
         return self.coord
 
+    def _transform(self, crs):
+        x, y = get_transformer(self.crs, crs).transform(
+            self.coord[:, 0], self.coord[:, 1])
+        return np.vstack([x, y]).T
+
     @property
     def gdf(self):
         if not hasattr(self, '_gdf'):
-            data = []
-            for id, coord, values in zip(self._id, self._coords, self.values):
-                data.append({
-                    'geometry': Point(coord),
-                    'id': id,
-                    'values': values
-                    })
-            self._gdf = gpd.GeoDataFrame(data, crs=self.crs)
+            self._gdf = self.get_gdf()
         return self._gdf
 
+    def get_gdf(self, bbox=None):
+        """GeoDataFrame of the nodes, indexed by node index, optionally
+        restricted to the nodes inside ``bbox``, given as
+        ``(xmin, ymin, xmax, ymax)`` or as a geometry whose bounds are used.
+        """
+        index = self.index if bbox is None \
+            else np.flatnonzero(_in_bbox(self._coords, bbox))
+        values = self.values[index]
+        return gpd.GeoDataFrame(
+            {'id': self._id[index],
+             'values': values if values.ndim == 1 else list(values)},
+            geometry=gpd.points_from_xy(self._coords[index, 0],
+                                        self._coords[index, 1]),
+            index=index, crs=self.crs)
+
     @property
     def id(self):
         return self._id
@@ -117,78 +323,143 @@ class Nodes:
     def coord(self):
         return self.coords
 
-    def get_index_by_id(self, id: Hashable):
-        if not hasattr(self, 'node_id_to_index'):
-            self.node_id_to_index = {
-                self.id[i]: i for i in range(len(self.id))}
-        return self.node_id_to_index[id]
-
-    def get_id_by_index(self, index: int):
-        if not hasattr(self, 'node_index_to_id'):
-            self.node_index_to_id = {
-                i: self.id[i] for i in range(len(self.id))}
-        return self.node_index_to_id[index]
-
     def to_dict(self):
         nodes = {
             nid: (coo, val)
-            for nid, coo, val in zip(self._id, self._coords, self.values)}
+            for nid, coo, val in zip(self._id.tolist(), self._coords,
+                                     self.values)}
         return nodes
 
 
-class Elements:
+class Elements(_IdIndex):
 
-    def __init__(self, nodes: Nodes, elements: Dict[Hashable, Sequence]):
-        if not isinstance(elements, dict):
-            raise TypeError('Argument elements must be a dict.')
+    def __init__(self, nodes: Nodes, elements: Union[Dict[Hashable, Sequence],
+                                                     Tuple]):
+        """Argument elements must be of the form:
+            {id: [node_id0, node_id1, node_id2, ...]}
+            or
+            (id, connectivity)
+        where the last form is a tuple of arrays as returned by
+        :func:`adcircpy.mesh.parsers.grd.buffer_to_arrays`, with
+        connectivity given as node id's padded with -1.
 
-        vertex_id_set = set(nodes.id)
-        for id, geom in elements.items():
-            if not isinstance(geom, Sequence):
-                raise TypeError(f'Element with id {id} of the elements '
-                                f'argument must be of type {Sequence}, not '
-                                f'type {type(geom)}.')
-            if not set(geom).issubset(vertex_id_set):
-                ValueError(f'Element with id {id} is not a subset of the '
-                           "coordinate id's.")
+        Connectivity is stored as an int32 array of node indexes, padded with
+        -1 for mixed triangle/quad meshes.
+        """
         self.nodes = nodes
-        self.elements = elements
+        if isinstance(elements, tuple):
+            id, connectivity = elements
+            connectivity = np.asarray(connectivity)
+            mask = connectivity != -1
+            node_ids = connectivity[mask]
+        else:
+            if not isinstance(elements, dict):
+                raise TypeError('Argument elements must be a dict.')
+            for id, geom in elements.items():
+                if not isinstance(geom, Sequence):
+                    raise TypeError(f'Element with id {id} of the elements '
+                                    f'argument must be of type {Sequence}, '
+                                    f'not type {type(geom)}.')
+            id = list(elements.keys())
+            nverts = np.array([len(geom) for geom in elements.values()],
+                              dtype=int)
+            mask = np.arange(nverts.max() if len(nverts) > 0 else 3) \
+                < nverts[:, None]
+            node_ids = [node_id for geom in elements.values()
+                        for node_id in geom]
+
+        try:
+            indexes = nodes.get_index_by_id(node_ids)
+        except KeyError as e:
+            raise ValueError(f'Elements reference node id {e} which is not '
+                             'part of the nodes.')
+        self._id = _as_id_array(id)
+        self._connectivity = np.full(mask.shape, -1, dtype=np.int32)
+        self._connectivity[mask] = indexes
+
+    @property
+    def elements(self):
+        """Elements as a dictionary of the form {id: [node_id, ...]}."""
+        ids = self.nodes.id.tolist()
+        return {
+            id: [ids[i] for i in row if i != -1]
+            for id, row in zip(self.id.tolist(), self._connectivity.tolist())}
 
     @property
     def id(self):
-        if not hasattr(self, '_id'):
-            self._id = list(self.elements.keys())
         return self._id
 
     @property
     def index(self):
         if not hasattr(self, '_index'):
-            self._index = np.arange(len(self.elements))
+            self._index = np.arange(len(self.id))
         return self._index
 
-    def get_index_by_id(self, id: Hashable):
-        if not hasattr(self, 'element_id_to_index'):
-            self.element_id_to_index = {
-                self.id[i]: i for i in range(len(self.id))}
-        return self.element_id_to_index[id]
+    @property
+    def connectivity(self):
+        """(NE, max_vertices) array of node indexes, padded with -1."""
+        return self._connectivity
 
-    def get_id_by_index(self, index: int):
-        if not hasattr(self, 'element_index_to_id'):
-            self.element_index_to_id = {
-                i: self.id[i] for i in range(len(self.id))}
-        return self.element_index_to_id[index]
+    @property
+    def nverts(self):
+        """Number of vertices of each element."""
+        if not hasattr(self, '_nverts'):
+            self._nverts = np.count_nonzero(self._connectivity != -1, axis=1)
+        return self._nverts
 
     def get_indexes_around_index(self, index):
-        if not hasattr(self, 'indexes_around_index'):
-            def append_geom(geom):
-                for simplex in geom:
-                    for i, j in permutations(simplex, 2):
-                        indexes_around_index[i].add(j)
-            indexes_around_index = defaultdict(set)
-            append_geom(self.triangles)
-            append_geom(self.quads)
-            self.indexes_around_index = indexes_around_index
-        return list(self.indexes_around_index[index])
+        return self.node_neighbors[index].tolist()
+
+    @property
+    def node_neighbors(self):
+        """:class:`Adjacency` of nodes sharing an element (quad diagonals
+        included).
+        """
+        if not hasattr(self, '_node_neighbors'):
+            self._node_neighbors = Adjacency.from_connectivity(
+                self._connectivity, len(self.nodes.id))
+        return self._node_neighbors
+
+    @property
+    def node_elements(self):
+        """:class:`Adjacency` from nodes to the elements they belong to."""
+        if not hasattr(self, '_node_elements'):
+            element, _ = np.nonzero(self._connectivity != -1)
+            self._node_elements = Adjacency.from_pairs(
+                self._connectivity[self._connectivity != -1], element,
+                len(self.nodes.id))
+        return self._node_elements
+
+    @property
+    def element_neighbors(self):
+        """:class:`Adjacency` of elements sharing an edge.
+
+        Every element on an edge is a neighbor of all the other elements on
+        it, including on non-manifold edges shared by more than two
+        elements.
+        """
+        if not hasattr(self, '_element_neighbors'):
+            element, column = np.nonzero(self._connectivity != -1)
+            nverts = self.nverts[element]
+            first = self._connectivity[element, column]
+            second = self._connectivity[element, (column + 1) % nverts]
+            keys = np.minimum(first, second).astype(np.int64) \
+                * len(self.nodes.id) + np.maximum(first, second)
+            sorter = np.argsort(keys, kind='stable')
+            element = element[sorter]
+            # pair each element with every element of its edge group
+            start = np.flatnonzero(np.append(True, np.diff(keys[sorter])))
+            size = np.diff(np.append(start, len(keys)))
+            group = np.repeat(np.arange(len(start)), size)
+            count = size[group]
+            left = np.repeat(np.arange(len(keys)), count)
+            right = np.repeat(start[group] - np.cumsum(count) + count,
+                              count) + np.arange(count.sum())
+            distinct = left != right
+            self._element_neighbors = Adjacency.from_pairs(
+                element[left[distinct]], element[right[distinct]],
+                len(self.id))
+        return self._element_neighbors
 
     def get_ball(self, order: int, id=None, index=None):
 
@@ -214,39 +485,25 @@ class Elements:
         eidxs = set([index])
         for i in range(order):
             elements = self.array[list(sorted(eidxs)), :]
-            new_neighbors = list(
-                    map(self.get_indexes_around_index,
-                        list(set(elements.data.flatten()))))
-            new_neighbors = set([item for sublist in new_neighbors
-                                 for item in sublist])
+            new_neighbors = self.node_neighbors.union(
+                np.unique(elements.compressed()))
             eidxs = eidxs.union(set(np.where(
                 np.logical_and(
-                    np.any(
-                        np.isin(self.array, list(set(new_neighbors))), axis=1),
+                    np.any(np.isin(self.array, new_neighbors), axis=1),
                     np.any(np.isin(self.array, elements), axis=1),
                 ))[0]))
-        return self.gdf.loc[eidxs].geometry.unary_union.exterior
+        return self.gdf.loc[sorted(eidxs)].geometry.unary_union.exterior
 
     @property
     def array(self):
         if not hasattr(self, '_array'):
-            rank = int(max(map(len, self.elements.values())))
-            array = np.full((len(self.elements), rank), -1)
-            for i, element in enumerate(self.elements.values()):
-                row = np.array(
-                    list(map(self.nodes.get_index_by_id, element)))
-                array[i, :len(row)] = row
-            array = np.ma.masked_equal(array, -1)
-            self._array = array
+            self._array = np.ma.masked_equal(self._connectivity, -1)
         return self._array
 
     @property
     def triangles(self):
         if not hasattr(self, '_triangles'):
-            self._triangles = np.array(
-                [list(map(self.nodes.get_index_by_id, element))
-                 for element in self.elements.values()
-                 if len(element) == 3])
+            self._triangles = self._connectivity[self.nverts == 3, :3]
         return self._triangles
 
     @property
@@ -256,19 +513,20 @@ class Elements:
     @property
     def quads(self):
         if not hasattr(self, '_quads'):
-            self._quads = np.array(
-                [list(map(self.nodes.get_index_by_id, element))
-                 for element in self.elements.values()
-                 if len(element) == 4])
+            if self._connectivity.shape[1] < 4:
+                self._quads = np.empty((0, 4), dtype=np.int32)
+            else:
+                self._quads = self._connectivity[self.nverts == 4, :4]
         return self._quads
 
     @property
     def triangulation(self):
         if not hasattr(self, '_triangulation'):
-            triangles = self.triangles.tolist()
-            for quad in self.quads:
-                triangles.append([quad[0], quad[1], quad[3]])
-                triangles.append([quad[1], quad[2], quad[3]])
+            triangles = np.vstack([
+                self.triangles,
+                self.quads[:, [0, 1, 3]],
+                self.quads[:, [1, 2, 3]],
+            ])
             self._triangulation = Triangulation(
                 self.nodes.coord[:, 0],
                 self.nodes.coord[:, 1],
@@ -278,16 +536,55 @@ class Elements:
     @property
     def gdf(self):
         if not hasattr(self, '_gdf'):
-            data = []
-            for id, element in self.elements.items():
-                data.append({
-                    'geometry': Polygon(
-                        self.nodes.coord[list(
-                            map(self.get_index_by_id, element))]),
-                    'id': id})
-            self._gdf = gpd.GeoDataFrame(data, crs=self.nodes.crs)
+            self._gdf = self.get_gdf()
         return self._gdf
 
+    def get_gdf(self, bbox=None):
+        """GeoDataFrame of the elements, indexed by element index,
+        optionally restricted to the elements whose bounding box intersects
+        ``bbox`` (see :meth:`Nodes.get_gdf`).
+        """
+        index = self.index if bbox is None \
+            else self.get_indexes_in_bbox(bbox)
+        return gpd.GeoDataFrame(
+            {'id': self._id[index]}, geometry=self.get_polygons(index),
+            index=index, crs=self.nodes.crs)
+
+    def get_indexes_in_bbox(self, bbox):
+        """Indexes of the elements whose bounding box intersects ``bbox``,
+        given as ``(xmin, ymin, xmax, ymax)`` or as a geometry.
+        """
+        xmin, ymin, xmax, ymax = _get_bounds(bbox)
+        x, y = self.nodes.coords.T
+        vertices = self._get_vertices()
+        exmin = exmax = x[vertices[:, 0]]
+        eymin = eymax = y[vertices[:, 0]]
+        for column in vertices.T[1:]:
+            exmin = np.minimum(exmin, x[column])
+            exmax = np.maximum(exmax, x[column])
+            eymin = np.minimum(eymin, y[column])
+            eymax = np.maximum(eymax, y[column])
+        return np.flatnonzero((exmax >= xmin) & (exmin <= xmax)
+                              & (eymax >= ymin) & (eymin <= ymax))
+
+    def get_polygons(self, index=None):
+        """Array of shapely polygons of the elements at ``index`` (all by
+        default).
+        """
+        index = self.index if index is None else np.asarray(index)
+        nverts = self.nverts[index]
+        coords = self.nodes.coords[self._get_vertices()[index]]
+        polygons = np.empty(len(index), dtype=object)
+        for n in np.unique(nverts):
+            mask = nverts == n
+            polygons[mask] = shapely.polygons(coords[mask, :n])
+        return polygons
+
+    def _get_vertices(self):
+        # connectivity with the padding pointing back to the first vertex
+        return np.where(self._connectivity != -1, self._connectivity,
+                        self._connectivity[:, :1])
+
 
 class Edges:
 
@@ -321,11 +618,9 @@ class Rings:
     @lru_cache(maxsize=1)
     def __call__(self) -> gpd.GeoDataFrame:
         tri = self._grd.elements.triangulation
-        idxs = np.vstack(list(np.where(tri.neighbors == -1))).T
-        boundary_edges = []
-        for i, j in idxs:
-            boundary_edges.append(
-                (tri.triangles[i, j], tri.triangles[i, (j+1) % 3]))
+        i, j = np.where(tri.neighbors == -1)
+        boundary_edges = np.column_stack(
+            [tri.triangles[i, j], tri.triangles[i, (j + 1) % 3]])
         sorted_rings = sort_rings(edges_to_rings(boundary_edges),
                                   self._grd.nodes.coord)
         data = []
@@ -411,6 +706,132 @@ class Hull:
         return geometry
 
 
+class SpatialIndex:
+    """Point-location queries on a :class:`Grd`.
+
+    Holds a :class:`scipy.spatial.cKDTree` of the nodes and a
+    :class:`shapely.strtree.STRtree` of the bounding boxes of the mesh
+    triangles (quads split in two). Points are given in the CRS of the mesh,
+    as an (n, 2) array or a single (x, y) pair.
+    """
+
+    def __init__(self, grd: "Grd"):
+        self._grd = grd
+
+    def nearest_node(self, points, return_distance: bool = False):
+        """Indexes of the nodes nearest to ``points``."""
+        points, scalar = self._as_points(points)
+        distance, index = self.nodes.query(points)
+        if scalar:
+            distance, index = distance[0], int(index[0])
+        if return_distance is True:
+            return index, distance
+        return index
+
+    def locate_elements(self, points, tolerance: float = 1e-12):
+        """Finds the elements containing ``points``.
+
+        Returns a tuple ``(element_index, weights)``, where ``element_index``
+        is -1 for points outside the mesh and ``weights`` holds, for each
+        point, the barycentric interpolation weights of the vertices of its
+        element in the order of :attr:`Elements.connectivity` (zero for
+        points outside the mesh).
+        """
+        points, scalar = self._as_points(points)
+        elements = self._grd.elements
+        triangles = elements.triangulation.triangles
+        point_index, triangle_index = self.elements.query(
+            shapely.points(points))
+
+        coords = self._grd.nodes.coord[triangles[triangle_index]]
+        lambdas = _barycentric(points[point_index], coords)
+        inside = np.all(lambdas >= -tolerance, axis=1)
+        point_index = point_index[inside]
+        triangle_index = triangle_index[inside]
+        lambdas = lambdas[inside]
+        first = np.unique(point_index, return_index=True)[1]
+        point_index = point_index[first]
+        triangle_index = triangle_index[first]
+
+        element_index = np.full(len(points), -1, dtype=int)
+        element_index[point_index] = self._triangle_element[triangle_index]
+        weights = np.zeros((len(points), elements.connectivity.shape[1]))
+        weights[point_index[:, None],
+                self._triangle_columns[triangle_index]] = lambdas[first]
+        if scalar:
+            return int(element_index[0]), weights[0]
+        return element_index, weights
+
+    def contains(self, points):
+        """Whether each of ``points`` falls inside an element of the
+        mesh.
+        """
+        element_index, _ = self.locate_elements(points)
+        return element_index != -1
+
+    @property
+    def nodes(self):
+        if not hasattr(self, '_nodes'):
+            self._nodes = cKDTree(self._grd.nodes.coord)
+        return self._nodes
+
+    @property
+    def elements(self):
+        if not hasattr(self, '_elements'):
+            coords = self._grd.nodes.coord[
+                self._grd.elements.triangulation.triangles]
+            xmin, ymin = coords.min(axis=1).T
+            xmax, ymax = coords.max(axis=1).T
+            self._elements = STRtree(shapely.box(xmin, ymin, xmax, ymax))
+        return self._elements
+
+    @property
+    def _triangle_element(self):
+        """Element index of each triangle of the triangulation."""
+        if not hasattr(self, '_tri_element'):
+            nverts = self._grd.elements.nverts
+            quads = np.flatnonzero(nverts == 4)
+            self._tri_element = np.concatenate(
+                [np.flatnonzero(nverts == 3), quads, quads])
+        return self._tri_element
+
+    @property
+    def _triangle_columns(self):
+        """Connectivity columns of the vertices of each triangle of the
+        triangulation.
+        """
+        if not hasattr(self, '_tri_columns'):
+            nverts = self._grd.elements.nverts
+            ntri, nquad = np.sum(nverts == 3), np.sum(nverts == 4)
+            self._tri_columns = np.vstack([
+                np.tile([0, 1, 2], (ntri, 1)),
+                np.tile([0, 1, 3], (nquad, 1)),
+                np.tile([1, 2, 3], (nquad, 1)),
+            ])
+        return self._tri_columns
+
+    @staticmethod
+    def _as_points(points):
+        points = np.asarray(points, dtype=np.float64)
+        scalar = points.ndim == 1
+        return points.reshape((-1, 2)), scalar
+
+
+def _barycentric(points, triangles):
+    """Barycentric coordinates of (n, 2) ``points`` with respect to (n, 3, 2)
+    ``triangles``.
+    """
+    x1, y1 = triangles[:, 0, :].T
+    x2, y2 = triangles[:, 1, :].T
+    x3, y3 = triangles[:, 2, :].T
+    x, y = points.T
+    det = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        l1 = ((y2 - y3) * (x - x3) + (x3 - x2) * (y - y3)) / det
+        l2 = ((y3 - y1) * (x - x3) + (x1 - x3) * (y - y3)) / det
+    return np.column_stack([l1, l2, 1. - l1 - l2])
+
+
 class Grd(ABC):
 
     def __init__(self, nodes, elements=None, description=None, crs=None):
@@ -421,7 +842,7 @@ class Grd(ABC):
         self.hull = Hull(self)
 
     def __str__(self):
-        return grd.to_string(**self.to_dict())
+        return grd.to_string(**self.to_arrays())
 
     def to_dict(self):
         return {
@@ -430,9 +851,27 @@ class Grd(ABC):
             "elements": self.elements.elements,
             "crs": self.crs}
 
-    def write(self, path, overwrite=False, format='gr3'):
+    def to_arrays(self):
+        """Same as :meth:`to_dict`, but nodes and elements are given as the
+        tuples of arrays described in
+        :func:`adcircpy.mesh.parsers.grd.buffer_to_arrays`.
+        """
+        connectivity = self.elements.connectivity
+        return {
+            "description": self.description,
+            "nodes": (self.nodes.id, self.coords, self.values),
+            "elements": (
+                self.elements.id,
+                np.where(connectivity != -1,
+                         self.nodes.id[connectivity], -1)),
+            "crs": self.crs}
+
+    def write(self, path, overwrite=False, format='gr3',
+              float_format='%.16E'):
         if format in ['gr3', 'grd']:
-            grd.write(self.to_dict(), path, overwrite)
+            grd.write(self.to_arrays(), path, overwrite, float_format)
+        elif format in ['ugrid', 'nc', 'netcdf']:
+            ugrid.write(self.to_arrays(), path, overwrite)
         elif format in ['sms', '2dm', 'sms2dm']:
             sms2dm.write({
                 'ND': {i+1: (coord, -self.values[i] if not
@@ -460,8 +899,7 @@ class Grd(ABC):
         crs = self.crs if crs is None else crs
         if crs is not None:
             if not self.crs.equals(crs):
-                transformer = Transformer.from_crs(
-                    self.crs, crs, always_xy=True)
+                transformer = get_transformer(self.crs, crs)
                 (xmin, xmax), (ymin, ymax) = transformer.transform(
                     (xmin, xmax), (ymin, ymax))
         if output_type == 'polygon':
@@ -480,17 +918,138 @@ class Grd(ABC):
         """Transforms coordinate system of mesh in-place.
         """
         self.nodes.transform_to(dst_crs)
+        if hasattr(self.elements, '_gdf'):
+            del self.elements._gdf
+        if hasattr(self, '_spatial_index'):
+            del self._spatial_index
+
+    def nearest_node(self, points, return_distance: bool = False):
+        """See :meth:`SpatialIndex.nearest_node`."""
+        return self.spatial_index.nearest_node(points, return_distance)
+
+    def locate_elements(self, points, tolerance: float = 1e-12):
+        """See :meth:`SpatialIndex.locate_elements`."""
+        return self.spatial_index.locate_elements(points, tolerance)
+
+    def contains(self, points):
+        """See :meth:`SpatialIndex.contains`."""
+        return self.spatial_index.contains(points)
 
     def vertices_around_vertex(self, index):
-        return self.nodes.vertices_around_vertex(index)
+        return self.elements.get_indexes_around_index(index)
 
     def copy(self):
         return self.__class__(**self.to_dict())
 
+    def clip(self, geometry, renumber: bool = True):
+        """Returns a new mesh made of the elements intersecting
+        ``geometry``, given in the coordinates of the mesh.
+
+        Only the nodes of those elements are kept, along with their values.
+        With ``renumber=True`` nodes and elements are numbered from 1 in
+        their original order, otherwise their id's are kept.
+        """
+        index = self.elements.get_indexes_in_bbox(geometry)
+        shapely.prepare(geometry)
+        index = index[shapely.intersects(
+            geometry, self.elements.get_polygons(index))]
+        return self._subset(index, renumber)
+
+    def subset(self, bbox, renumber: bool = True):
+        """Same as :meth:`clip`, for the bounding box ``bbox`` given as
+        ``(xmin, ymin, xmax, ymax)`` or as a geometry whose bounds are used.
+        """
+        return self.clip(box(*_get_bounds(bbox)), renumber)
+
+    def reorder(self, method: str = 'rcm', renumber: bool = True):
+        """Returns a copy of the mesh with its nodes reordered for memory
+        locality, along with the ``node_index`` and ``element_index``
+        permutations, such that node ``i`` of the new mesh is node
+        ``node_index[i]`` of this one.
+
+        Argument ``method`` is one of ``'rcm'`` (reverse Cuthill-McKee, see
+        :mod:`adcircpy.mesh.ordering`), ``'hilbert'`` or ``'morton'``.
+        Elements follow their lowest reordered node. With ``renumber=True``
+        nodes and elements are numbered from 1 in the new order.
+        """
+        if method == 'rcm':
+            node_index = ordering.rcm(self.elements.node_neighbors)
+        elif method == 'hilbert':
+            node_index = ordering.hilbert(self.coords)
+        elif method == 'morton':
+            node_index = ordering.morton(self.coords)
+        else:
+            raise ValueError(f'Unknown ordering method {method}, must be '
+                             '\'rcm\', \'hilbert\' or \'morton\'.')
+        node_map = np.empty(len(node_index), dtype=int)
+        node_map[node_index] = np.arange(len(node_index))
+        vertices = node_map[self.elements._get_vertices()]
+        element_index = np.argsort(vertices.min(axis=1), kind='stable')
+        mesh = self._subset(element_index, renumber, node_index)
+        _logger.info(f'Reordered mesh with {method}: bandwidth '
+                     f'{self.bandwidth} -> {mesh.bandwidth}.')
+        return mesh, node_index, element_index
+
+    def partition(self, nproc: int, method: str = 'rcb', **kwargs):
+        """Previews the decomposition of the mesh into ``nproc`` ranks. See
+        :func:`adcircpy.mesh.partition.partition`.
+        """
+        return partition.partition(self, nproc, method, **kwargs)
+
+    def quality(self, cfl: float = 1., maxvel: float = 5., g: float = 9.81):
+        """Element quality metrics, see
+        :class:`adcircpy.mesh.quality.MeshQuality`.
+        """
+        return MeshQuality(self, cfl, maxvel, g)
+
+    def _subset(self, element_index, renumber=True, node_index=None):
+        if node_index is None:
+            node_index = self._get_subset_node_index(element_index)
+        node_map = np.full(len(self.nodes.id), -1)
+        node_map[node_index] = np.arange(len(node_index))
+        if renumber is True:
+            node_id = np.arange(1, len(node_index) + 1)
+            element_id = np.arange(1, len(element_index) + 1)
+        else:
+            node_id = self.nodes.id[node_index]
+            element_id = self.elements.id[element_index]
+        connectivity = self.elements.connectivity[element_index]
+        return self.__class__(
+            nodes=(node_id, self.coords[node_index], self.values[node_index]),
+            elements=(element_id, np.where(
+                connectivity != -1, node_id[node_map[connectivity]], -1)),
+            description=self.description,
+            crs=self.crs,
+            **self._get_subset_kwargs(node_map, node_id))
+
+    def _get_subset_node_index(self, element_index):
+        connectivity = self.elements.connectivity[element_index]
+        used = np.zeros(len(self.nodes.id), dtype=bool)
+        used[connectivity[connectivity != -1]] = True
+        return np.flatnonzero(used)
+
+    def _get_subset_kwargs(self, node_map, node_id):
+        """Extra constructor arguments of a mesh made of the nodes at
+        ``node_map != -1``, renumbered to ``node_id``.
+        """
+        return {}
+
     @classmethod
     def open(cls, file: Union[str, os.PathLike],
-             crs: Union[str, CRS] = None):
-        return cls(**grd.read(pathlib.Path(file), boundaries=False))
+             crs: Union[str, CRS] = None,
+             cache: Union[bool, str, os.PathLike] = False):
+        """Opens a grd-formatted or UGRID NetCDF mesh file. Pass
+        ``cache=True`` (or a cache directory) to load a grd file from, or save
+        it to, the binary mesh cache in :mod:`adcircpy.mesh.cache`.
+        """
+        if ugrid.is_ugrid(file):
+            _grd = ugrid.read(pathlib.Path(file), boundaries=False)
+        elif cache:
+            _grd = mesh_cache.read_arrays(pathlib.Path(file), boundaries=False,
+                                          cache_dir=cache)
+        else:
+            _grd = grd.read_arrays(pathlib.Path(file), boundaries=False)
+        return cls(**_grd)
 
     @figure
     def tricontourf(self, axes=None, show=True, figsize=None, cbar=False,
@@ -574,6 +1133,11 @@ class Grd(ABC):
     def coords(self):
         return self.nodes.coord
 
+    @property
+    def bandwidth(self):
+        """Largest index distance between nodes sharing an element."""
+        return ordering.bandwidth(self.elements.node_neighbors)
+
     @property
     def coord(self):
         return self.nodes.coord
@@ -622,41 +1186,102 @@ class Grd(ABC):
     def bbox(self):
         return self.get_bbox()
 
+    @property
+    def spatial_index(self):
+        if not hasattr(self, '_spatial_index'):
+            self._spatial_index = SpatialIndex(self)
+        return self._spatial_index
+
 
 def edges_to_rings(edges):
+    """Orders boundary edges into closed rings.
+
+    Returns a list of rings, each one an (n, 2) array of consecutive edges.
+    Every ring starts with the last edge (in input order) that is not part of
+    a previous ring. When every boundary vertex has exactly one outgoing and
+    one incoming edge, rings are ranked with vectorized pointer jumping over a
+    next-edge map; otherwise (e.g. pinched boundaries or inconsistently
+    oriented edges) they are walked with vertex to edge hash maps.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape((-1, 2))
     if len(edges) == 0:
-        return edges
-    # start ordering the edges into linestrings
-    edge_collection = list()
-    ordered_edges = [edges.pop(-1)]
-    e0, e1 = [list(t) for t in zip(*edges)]
-    while len(edges) > 0:
-        if ordered_edges[-1][1] in e0:
-            idx = e0.index(ordered_edges[-1][1])
-            ordered_edges.append(edges.pop(idx))
-        elif ordered_edges[0][0] in e1:
-            idx = e1.index(ordered_edges[0][0])
-            ordered_edges.insert(0, edges.pop(idx))
-        elif ordered_edges[-1][1] in e1:
-            idx = e1.index(ordered_edges[-1][1])
-            ordered_edges.append(
-                list(reversed(edges.pop(idx))))
-        elif ordered_edges[0][0] in e0:
-            idx = e0.index(ordered_edges[0][0])
-            ordered_edges.insert(
-                0, list(reversed(edges.pop(idx))))
-        else:
-            edge_collection.append(tuple(ordered_edges))
-            idx = -1
-            ordered_edges = [edges.pop(idx)]
-        e0.pop(idx)
-        e1.pop(idx)
-    # finalize
-    if len(edge_collection) == 0 and len(edges) == 0:
-        edge_collection.append(tuple(ordered_edges))
-    else:
-        edge_collection.append(tuple(ordered_edges))
-    return edge_collection
+        return []
+    e0, e1 = edges[:, 0], edges[:, 1]
+    sorter = np.argsort(e0, kind='stable')
+    if np.any(e0[sorter][1:] == e0[sorter][:-1]) or \
+            not np.array_equal(e0[sorter], np.sort(e1)):
+        return _walk_rings(edges)
+    next_edge = sorter[np.searchsorted(e0, e1, sorter=sorter)]
+    iterations = int(np.ceil(np.log2(len(edges)))) + 1
+
+    # label every edge with the largest edge index of its ring, which is where
+    # the ring starts
+    start, jump = np.arange(len(edges)), next_edge
+    for _ in range(iterations):
+        start = np.maximum(start, start[jump])
+        jump = jump[jump]
+
+    # rank edges by their distance to the start of the ring
+    is_start = start == np.arange(len(edges))
+    distance = (~is_start).astype(np.int64)
+    jump = np.where(is_start, np.arange(len(edges)), next_edge)
+    for _ in range(iterations):
+        distance = distance + distance[jump]
+        jump = jump[jump]
+    length = np.bincount(start, minlength=len(edges))[start]
+    position = np.where(is_start, 0, length - distance)
+
+    order = np.lexsort((position, -start))
+    bounds = np.flatnonzero(np.diff(start[order])) + 1
+    return np.split(edges[order], bounds)
+
+
+def _walk_rings(edges):
+    # Follows the ring under construction from its last vertex (or back from
+    # its first vertex) through the lowest-indexed unused edge touching it,
+    # reversing edges that run against the ring.
+    by_e0, by_e1 = defaultdict(deque), defaultdict(deque)
+    for k, (i, j) in enumerate(edges.tolist()):
+        by_e0[i].append(k)
+        by_e1[j].append(k)
+    unused = np.ones(len(edges), dtype=bool)
+
+    def first(queue):
+        while len(queue) > 0 and not unused[queue[0]]:
+            queue.popleft()
+        return queue[0] if len(queue) > 0 else None
+
+    def take(k):
+        unused[k] = False
+        return edges[k].tolist()
+
+    rings = []
+    last = len(edges) - 1
+    ring = deque([take(last)])
+    for _ in range(len(edges) - 1):
+        head, tail = ring[0][0], ring[-1][1]
+        k = first(by_e0[tail])
+        if k is not None:
+            ring.append(take(k))
+            continue
+        k = first(by_e1[head])
+        if k is not None:
+            ring.appendleft(take(k))
+            continue
+        k = first(by_e1[tail])
+        if k is not None:
+            ring.append(take(k)[::-1])
+            continue
+        k = first(by_e0[head])
+        if k is not None:
+            ring.appendleft(take(k)[::-1])
+            continue
+        rings.append(np.array(ring))
+        while not unused[last]:
+            last -= 1
+        ring = deque([take(last)])
+    rings.append(np.array(ring))
+    return rings
 
 
 def sort_rings(index_rings, vertices):
@@ -666,69 +1291,58 @@ def sort_rings(index_rings, vertices):
     "interior" components. Any doubly-nested rings are considered exterior
     rings.
 
-    TODO: Refactor and optimize. Calls that use :class:matplotlib.path.Path can
-    probably be optimized using shapely.
+    The parent of each ring is the smallest larger ring containing one of
+    its vertices, the first one that is not on any other ring if there is
+    one, so rings touching at pinched vertices are nested correctly.
+    Candidate parents are found by querying a :class:`shapely.strtree.STRtree`
+    of the rings with those vertices, and confirmed with
+    :meth:`matplotlib.path.Path.contains_points`. Exteriors are numbered by
+    decreasing area and their interiors are listed in reverse input order.
     """
-
-    # sort index_rings into corresponding "polygons"
-    areas = list()
+    index_rings = [np.asarray(index_ring) for index_ring in index_rings]
+    polygons = [Polygon(vertices[index_ring[:, 0], :])
+                for index_ring in index_rings]
+    areas = np.array([float(polygon.area) for polygon in polygons])
+    counts = np.bincount(np.concatenate(
+        [index_ring[:, 0] for index_ring in index_rings]))
+    points = []
     for index_ring in index_rings:
-        e0, e1 = [list(t) for t in zip(*index_ring)]
-        areas.append(float(Polygon(vertices[e0, :]).area))
-
-    # maximum area must be main mesh
-    idx = areas.index(np.max(areas))
-    exterior = index_rings.pop(idx)
-    areas.pop(idx)
-    _id = 0
+        unshared = np.flatnonzero(counts[index_ring[:, 0]] == 1)
+        points.append(index_ring[unshared[0] if len(unshared) > 0 else 0, 0])
+    points = vertices[points, :]
+
+    point_index, ring_index = STRtree(polygons).query(
+        [Point(point) for point in points])
+    candidates = areas[ring_index] > areas[point_index]
+    point_index = point_index[candidates]
+    ring_index = ring_index[candidates]
+    contained = np.zeros(len(point_index), dtype=bool)
+    for j in np.unique(ring_index):
+        e0 = index_rings[j][:, 0]
+        path = Path(vertices[np.append(e0, e0[0]), :], closed=True)
+        mask = ring_index == j
+        contained[mask] = path.contains_points(points[point_index[mask]])
+    point_index = point_index[contained]
+    ring_index = ring_index[contained]
+
+    parent = np.full(len(index_rings), -1)
+    order = np.lexsort((areas[ring_index], point_index))
+    first = np.unique(point_index[order], return_index=True)[1]
+    parent[point_index[order][first]] = ring_index[order][first]
+
+    by_area = np.argsort(-areas, kind='stable')
+    depth = np.zeros(len(index_rings), dtype=int)
+    for i in by_area:
+        if parent[i] != -1:
+            depth[i] = depth[parent[i]] + 1
+
     _index_rings = dict()
-    _index_rings[_id] = {
-        'exterior': np.asarray(exterior),
-        'interiors': []
-    }
-    e0, e1 = [list(t) for t in zip(*exterior)]
-    path = Path(vertices[e0 + [e0[0]], :], closed=True)
-    while len(index_rings) > 0:
-        # find all internal rings
-        potential_interiors = list()
-        for i, index_ring in enumerate(index_rings):
-            e0, e1 = [list(t) for t in zip(*index_ring)]
-            if path.contains_point(vertices[e0[0], :]):
-                potential_interiors.append(i)
-        # filter out nested rings
-        real_interiors = list()
-        for i, p_interior in reversed(
-                list(enumerate(potential_interiors))):
-            _p_interior = index_rings[p_interior]
-            check = [index_rings[k]
-                     for j, k in
-                     reversed(list(enumerate(potential_interiors)))
-                     if i != j]
-            has_parent = False
-            for _path in check:
-                e0, e1 = [list(t) for t in zip(*_path)]
-                _path = Path(vertices[e0 + [e0[0]], :], closed=True)
-                if _path.contains_point(vertices[_p_interior[0][0], :]):
-                    has_parent = True
-            if not has_parent:
-                real_interiors.append(p_interior)
-        # pop real rings from collection
-        for i in reversed(sorted(real_interiors)):
-            _index_rings[_id]['interiors'].append(
-                np.asarray(index_rings.pop(i)))
-            areas.pop(i)
-        # if no internal rings found, initialize next polygon
-        if len(index_rings) > 0:
-            idx = areas.index(np.max(areas))
-            exterior = index_rings.pop(idx)
-            areas.pop(idx)
-            _id += 1
-            _index_rings[_id] = {
-                'exterior': np.asarray(exterior),
-                'interiors': []
-            }
-            e0, e1 = [list(t) for t in zip(*exterior)]
-            path = Path(vertices[e0 + [e0[0]], :], closed=True)
+    for _id, i in enumerate(by_area[depth[by_area] % 2 == 0]):
+        _index_rings[_id] = {
+            'exterior': index_rings[i],
+            'interiors': [index_rings[j] for j in
+                          reversed(np.flatnonzero(parent == i))]
+        }
     return _index_rings
 
 
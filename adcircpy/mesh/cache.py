@@ -0,0 +1,244 @@
+"""
+On-disk binary cache of parsed grd/fort.14 meshes.
+
+Each cached mesh is a directory holding the node and element arrays (and
+the node indexes of the mesh triangulation) as ``.npy`` files plus a
+``metadata.json`` file with the description,
+boundaries and the key of the source file (size, modification time and
+SHA-256 of its contents). Entries are stored under ``DEFAULT_CACHE_DIRECTORY``
+unless a different directory is given, and are invalidated automatically when
+the source file changes.
+"""
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+from typing import Union
+
+import appdirs
+import numpy as np
+
+from adcircpy.mesh.parsers import grd
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRECTORY = pathlib.Path(appdirs.user_cache_dir('adcircpy')) \
+    / 'mesh'
+STORE_VERSION = 2
+ARRAYS = {
+    'nodes': ('node_id', 'coords', 'values'),
+    'elements': ('element_id', 'connectivity'),
+}
+
+
+def get_cache_directory(cache_dir: Union[bool, str, os.PathLike] = None):
+    """Resolves the cache directory setting: ``None`` or ``True`` select
+    :data:`DEFAULT_CACHE_DIRECTORY`, anything else is used as a path.
+    """
+    if cache_dir is None or cache_dir is True:
+        return DEFAULT_CACHE_DIRECTORY
+    return pathlib.Path(cache_dir)
+
+
+def get_store_path(path: Union[str, os.PathLike],
+                   cache_dir: Union[bool, str, os.PathLike] = None):
+    """Path of the binary store that caches the mesh file ``path``."""
+    path = pathlib.Path(path).resolve()
+    name = hashlib.sha256(str(path).encode()).hexdigest()[:32]
+    return get_cache_directory(cache_dir) / f'{path.name}-{name}'
+
+
+def read_arrays(path: Union[str, os.PathLike], boundaries: bool = True,
+                crs=True, cache_dir: Union[bool, str, os.PathLike] = None):
+    """Cached version of :func:`adcircpy.mesh.parsers.grd.read_arrays`.
+
+    Loads the mesh from its binary store when the store matches the current
+    file, otherwise parses the file and (re)writes the store.
+    """
+    path = pathlib.Path(path)
+    store = get_store_path(path, cache_dir)
+    _grd = load(path, cache_dir)
+    if _grd is None:
+        with open(path, 'r') as stream:
+            _grd = grd.buffer_to_arrays(stream)
+        try:
+            write_store(store, _grd, get_file_key(path, checksum=True))
+        except OSError as e:
+            _logger.warning(f'Could not write mesh cache {store}: {e}')
+    return grd._finalize(_grd, path, boundaries, crs)
+
+
+def load(path: Union[str, os.PathLike],
+         cache_dir: Union[bool, str, os.PathLike] = None, mmap_mode=None):
+    """Returns the cached arrays for the mesh file ``path``, or ``None`` if
+    there is no valid cache entry for it.
+    """
+    path = pathlib.Path(path)
+    store = get_store_path(path, cache_dir)
+    metadata = _read_metadata(store)
+    if metadata is None:
+        return None
+    key = metadata['key']
+    if key is None:
+        return None
+    current = get_file_key(path)
+    if current['size'] != key['size']:
+        return None
+    if current['mtime_ns'] != key['mtime_ns']:
+        # same size but touched: only the contents can tell
+        if get_file_key(path, checksum=True)['sha256'] != key['sha256']:
+            return None
+        metadata['key']['mtime_ns'] = current['mtime_ns']
+        _write_metadata(store, metadata)
+    _logger.info(f'Loading {path} from mesh cache {store}.')
+    try:
+        return read_store(store, mmap_mode)
+    except (OSError, ValueError) as e:
+        _logger.warning(f'Ignoring corrupt mesh cache {store}: {e}')
+        return None
+
+
+def update(path: Union[str, os.PathLike],
+           cache_dir: Union[bool, str, os.PathLike] = None):
+    """Makes sure the binary store of the mesh file ``path`` is current,
+    (re)building it if needed, and returns the store path.
+    """
+    path = pathlib.Path(path)
+    store = get_store_path(path, cache_dir)
+    if load(path, cache_dir, mmap_mode='r') is None:
+        with open(path, 'r') as stream:
+            _grd = grd.buffer_to_arrays(stream)
+        write_store(store, _grd, get_file_key(path, checksum=True))
+    return store
+
+
+def clear(path: Union[str, os.PathLike] = None,
+          cache_dir: Union[bool, str, os.PathLike] = None):
+    """Removes the cache entry of the mesh file ``path``, or every entry in
+    the cache directory if ``path`` is ``None``.
+    """
+    if path is not None:
+        stores = [get_store_path(path, cache_dir)]
+    else:
+        directory = get_cache_directory(cache_dir)
+        stores = list(directory.iterdir()) if directory.is_dir() else []
+    for store in stores:
+        if (store / 'metadata.json').is_file():
+            shutil.rmtree(store)
+
+
+def get_file_key(path: Union[str, os.PathLike], checksum: bool = False):
+    stat = pathlib.Path(path).stat()
+    key = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if checksum is True:
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(2**20), b''):
+                sha256.update(block)
+        key['sha256'] = sha256.hexdigest()
+    return key
+
+
+def write_store(store: Union[str, os.PathLike], _grd, key=None):
+    """Writes a grd dictionary in the form returned by
+    :func:`adcircpy.mesh.parsers.grd.buffer_to_arrays` to a binary store.
+    """
+    store = pathlib.Path(store)
+    tmp = store.parent / f'.{store.name}.{os.getpid()}'
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for entry, names in ARRAYS.items():
+        for name, array in zip(names, _grd[entry]):
+            np.save(tmp / f'{name}.npy', np.asarray(array))
+    np.save(tmp / 'triangles.npy',
+            _triangulate(_grd['nodes'][0], _grd['elements'][1]))
+    _write_metadata(tmp, {
+        'version': STORE_VERSION,
+        'key': key,
+        'description': _grd['description'],
+        'boundaries': _boundaries_to_json(_grd.get('boundaries')),
+    })
+    if store.exists():
+        shutil.rmtree(store)
+    os.replace(tmp, store)
+
+
+def read_store(store: Union[str, os.PathLike], mmap_mode=None):
+    """Reads a binary store written by :func:`write_store`. Pass
+    ``mmap_mode='r'`` to get read-only memory-mapped arrays.
+    """
+    store = pathlib.Path(store)
+    metadata = _read_metadata(store)
+    if metadata is None:
+        raise IOError(f'{store} is not a mesh store.')
+    _grd = {'description': metadata['description']}
+    for entry, names in ARRAYS.items():
+        _grd[entry] = tuple(
+            np.load(store / f'{name}.npy', mmap_mode=mmap_mode)
+            for name in names)
+    boundaries = _boundaries_from_json(metadata['boundaries'])
+    if boundaries is not None:
+        _grd['boundaries'] = boundaries
+    return _grd
+
+
+def _triangulate(node_id, connectivity):
+    """Node indexes of the triangles of the mesh, quads split in two, in the
+    same order as :attr:`adcircpy.mesh.base.Elements.triangulation`.
+    """
+    node_id = np.asarray(node_id)
+    connectivity = np.asarray(connectivity)
+    sorter = np.argsort(node_id, kind='stable')
+    index = np.full(connectivity.shape, -1, dtype=np.int32)
+    mask = connectivity != -1
+    index[mask] = sorter[np.searchsorted(node_id, connectivity[mask],
+                                         sorter=sorter)]
+    nverts = np.count_nonzero(mask, axis=1)
+    quads = index[nverts == 4, :4] if index.shape[1] >= 4 \
+        else np.empty((0, 4), dtype=np.int32)
+    return np.vstack([
+        index[nverts == 3, :3],
+        quads[:, [0, 1, 3]],
+        quads[:, [1, 2, 3]],
+    ]).astype(np.int32)
+
+
+def _read_metadata(store):
+    try:
+        with open(pathlib.Path(store) / 'metadata.json', 'r') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if metadata.get('version') != STORE_VERSION:
+        return None
+    return metadata
+
+
+def _write_metadata(store, metadata):
+    with open(pathlib.Path(store) / 'metadata.json', 'w') as f:
+        json.dump(metadata, f)
+
+
+def _boundaries_to_json(boundaries):
+    # JSON objects cannot have None keys, so boundaries are flattened to
+    # [ibtype, id, data] entries.
+    if boundaries is None:
+        return None
+    return [[ibtype, id, {key: np.asarray(values).tolist()
+                          for key, values in data.items()}]
+            for ibtype, _boundaries in boundaries.items()
+            for id, data in _boundaries.items()]
+
+
+def _boundaries_from_json(entries):
+    if entries is None:
+        return None
+    boundaries = {}
+    for ibtype, id, data in entries:
+        data['node_id'] = [tuple(node_id) if isinstance(node_id, list)
+                           else node_id for node_id in data['node_id']]
+        boundaries.setdefault(ibtype, {})[id] = data
+    return boundaries
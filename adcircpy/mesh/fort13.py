@@ -1,63 +1,87 @@
 import logging
-import pathlib
 
 import numpy as np
+import shapely
+
+from adcircpy.mesh.parsers import fort13 as fort13_parser
 
 
 logger = logging.getLogger(__name__)
 
 
+class NodalAttribute(dict):
+    """A nodal attribute stored sparsely, as a ``defaults`` row plus the
+    sorted ``non_default_indexes`` of the nodes that differ from it and
+    their ``non_default_values`` block.
+
+    The dense ``(NP, n)`` array is built on request by :meth:`to_dense` and
+    is not kept; use :meth:`NodalAttributes.set_attribute` or
+    :meth:`NodalAttributes.add_patch` to modify the attribute.
+    """
+
+    def __init__(self, size: int, units: str, coldstart: bool = False,
+                 hotstart: bool = False):
+        super().__init__(units=units, coldstart=coldstart, hotstart=hotstart,
+                         defaults=None,
+                         non_default_indexes=np.empty((0,), dtype=int),
+                         non_default_values=None)
+        self.size = size
+
+    def to_dense(self):
+        """Dense ``(NP, n)`` array of the values of the attribute, or
+        ``None`` if they have not been set.
+        """
+        defaults = self['defaults']
+        if defaults is None:
+            return None
+        values = np.empty((self.size, len(defaults)))
+        values[:] = defaults
+        values[self['non_default_indexes']] = self['non_default_values']
+        return values
+
+
 class NodalAttributes:
 
     def __init__(self, fort14):
         self._fort14 = fort14
         self._attributes = {}
+        self._AGRID = None
 
     def __iter__(self):
         for name, data in self._attributes.items():
             yield name, data
 
     def __str__(self):
-        fort13 = [
-            f'{self._fort14.description} nodal attributes',
-            f'{len(self._fort14.nodes.id)}',
-            f'{len(self.get_attribute_names())}',
-        ]
-
-        for name in self.get_attribute_names():
-            attribute = self.get_attribute(name)
-            fort13.extend([
-                f'{name}',
-                f'{attribute["units"]}',
-                f'{len(attribute["defaults"])}',
-                ' '.join(f'{n:<.16E}' for n in attribute['defaults'])
-            ])
-        for name in self.get_attribute_names():
-            attribute = self.get_attribute(name)
-            fort13.extend([
-                f'{name}',
-                f'{len(attribute["non_default_indexes"])}',
-            ])
-            for i, values in enumerate(
-                    attribute['values'][attribute['non_default_indexes'], :]):
-                node_id = self._fort14.nodes.get_id_by_index(
-                    attribute["non_default_indexes"][i])
-                line = [f'{node_id}']
-                for value in values:
-                    line.append(f'{value}')
-                fort13.append(' '.join(line))
-        return '\n'.join(fort13)
+        return fort13_parser.to_string(self.to_dict())
+
+    def to_dict(self):
+        """Returns the attributes in the form read and written by
+        :mod:`adcircpy.mesh.parsers.fort13`. Attributes without values are
+        left out.
+        """
+        return {
+            'AGRID': f'{self._fort14.description} nodal attributes'
+            if self._AGRID is None else self._AGRID,
+            'NumOfNodes': len(self._fort14.nodes.id),
+            'attributes': {
+                name: {
+                    'units': attribute['units'],
+                    'defaults': attribute['defaults'],
+                    'node_id': self._fort14.nodes.get_id_by_index(
+                        attribute['non_default_indexes']),
+                    'values': attribute['non_default_values'],
+                } for name, attribute in self._attributes.items()
+                if attribute['defaults'] is not None
+            },
+        }
 
     def add_attribute(self, name: str, units: str = None):
         if name in self._attributes:
             raise AttributeError(f'Cannot add nodal attribute with name '
                                  f'{name}: attribute already exists.')
-        self._attributes.setdefault(name, {}).update({
-            'units': 'unitless' if units is None else str(units),
-            'values': None,
-            'coldstart': False,
-            'hotstart': False,
-            })
+        self._attributes[name] = NodalAttribute(
+            len(self._fort14.nodes.id),
+            'unitless' if units is None else str(units))
 
     def get_coldstart_attributes(self):
         coldstart_attributes = dict()
@@ -99,27 +123,6 @@ class NodalAttributes:
         if name not in self.get_attribute_names():
             msg = f"Nodal attribute with name {name} has not been loaded."
             raise AttributeError(msg)
-        if self._attributes[name].get('defaults') is None:
-            # TODO: the 'values' array can be generated more succintly.
-            def mode_rows(a):
-                a = np.ascontiguousarray(a)
-                void_dt = np.dtype((np.void,
-                                    a.dtype.itemsize * np.prod(a.shape[1:])))
-                _, ids, count = np.unique(a.view(void_dt).ravel(),
-                                          return_index=True,
-                                          return_counts=True)
-                largest_count_id = ids[count.argmax()]
-                most_frequent_row = a[largest_count_id]
-                return most_frequent_row
-
-            _attr = self._attributes[name]
-            if _attr['values'].ndim == 1:  # rewrite as column major
-                _attr['values'] = _attr['values'].reshape(
-                        (_attr['values'].shape[0], 1))
-            _attr['defaults'] = mode_rows(_attr['values'])
-            _attr['non_default_indexes'] = np.where(
-                    (_attr['values'] != _attr['defaults']).all(axis=1))[0]
-            self._attributes[name] = _attr
         return self._attributes[name]
 
     def has_attribute(self, attribute_name, runtype=None):
@@ -146,98 +149,170 @@ class NodalAttributes:
             coldstart: bool = False,
             hotstart: bool = False
     ):
+        """Sets the attribute from a dense array of shape (NP,) or (NP, n).
+        The most frequent row becomes the default row.
+        """
         if name not in self.get_attribute_names():
             raise AttributeError(f'Cannot set nodal attribute with name '
                                  f'{name}: attribute has not been '
                                  f'added yet.')
         assert isinstance(coldstart, bool)
         assert isinstance(hotstart, bool)
+        values = np.asarray(values, dtype=np.float64)
         assert values.flatten().shape[0] % self._fort14.values.shape[0] == 0
-        self._attributes[name].update({
-                'values': values,
-                'coldstart': coldstart,
-                'hotstart': hotstart
-            })
+        values = values.reshape((self._fort14.values.shape[0], -1))
+        defaults = _mode_row(values)
+        indexes = np.flatnonzero((values != defaults).any(axis=1))
+        self.set_sparse_attribute(name, defaults, indexes, values[indexes],
+                                  coldstart, hotstart)
+
+    def set_sparse_attribute(
+            self,
+            name,
+            defaults,
+            indexes,
+            values,
+            coldstart: bool = None,
+            hotstart: bool = None
+    ):
+        """Sets the attribute from its ``defaults`` row and the rows of
+        ``values`` taken by the nodes at ``indexes``. Rows equal to the
+        default are dropped. The coldstart/hotstart states are left
+        unchanged when not given.
+        """
+        attribute = self.get_attribute(name)
+        defaults = np.atleast_1d(np.asarray(defaults, dtype=np.float64))
+        indexes = np.asarray(indexes, dtype=int)
+        values = np.asarray(values, dtype=np.float64).reshape(
+            (len(indexes), len(defaults)))
+        indexes, unique = np.unique(indexes[::-1], return_index=True)
+        values = values[::-1][unique]  # last assignment wins
+        keep = (values != defaults).any(axis=1)
+        attribute.update({
+            'defaults': defaults,
+            'non_default_indexes': indexes[keep],
+            'non_default_values': values[keep],
+        })
+        if coldstart is not None:
+            attribute['coldstart'] = coldstart
+        if hotstart is not None:
+            attribute['hotstart'] = hotstart
 
     def add_patch(self, name, patch, value):
+        self.add_patches(name, [patch], [value])
+
+    def add_patches(self, name, patches, values):
+        """Assigns ``values[i]`` to the nodes strictly inside ``patches[i]``
+        in a single pass; where patches overlap, the later one wins. A
+        scalar ``values`` is used for every patch.
+        """
         if name not in self.get_attribute_names():
             raise AttributeError(
                 f'Cannot add patch to nodal attribute with name {name}: '
                 'attribute has not been added yet.')
-        idxs = [row.Index for row in self._fort14.nodes.gdf.geometry.within(patch).itertuples()]
-        self._attributes[name]['values'][idxs] = value
+        patches = list(patches)
+        if np.ndim(values) == 0:
+            values = [values] * len(patches)
+        if len(values) != len(patches):
+            raise ValueError('Expected one value per patch.')
+        if len(patches) == 0:
+            return
+        x, y = self._fort14.coords.T
+        order = np.argsort(x, kind='stable')
+        x_sorted = x[order]
+        indexes = [_indexes_in_geometry(x, y, order, x_sorted, patch)
+                   for patch in patches]
+        self._assign(name, np.concatenate(indexes + [[]]), np.repeat(
+            np.asarray(values, dtype=np.float64).reshape(
+                (len(patches), -1)),
+            [len(i) for i in indexes], axis=0))
+
+    def _assign(self, name, indexes, values):
+        """Assigns the rows ``values`` to the nodes at ``indexes``."""
+        attribute = self.get_attribute(name)
+        if attribute['defaults'] is None:
+            raise AttributeError(f'Cannot assign values to nodal attribute '
+                                 f'with name {name}: attribute has no '
+                                 f'values.')
+        indexes = np.asarray(indexes, dtype=int)
+        values = np.broadcast_to(
+            np.asarray(values, dtype=np.float64),
+            (len(indexes), len(attribute['defaults'])))
+        self.set_sparse_attribute(
+            name, attribute['defaults'],
+            np.concatenate([attribute['non_default_indexes'], indexes]),
+            np.vstack([attribute['non_default_values'], values]))
 
     def import_fort13(self, fort13):
-        fort13 = parse_fort13(fort13)
-        if fort13.pop('NumOfNodes') != len(self._fort14.nodes.id):
+        fort13 = fort13_parser.read(fort13)
+        if fort13['NumOfNodes'] != len(self._fort14.nodes.id):
             raise Exception('fort.13 file does not match the mesh.')
-        self._AGRID = fort13.pop('AGRID')
-        for attribute, data in fort13.items():
-            values = np.asarray(data['values'])
-            if values.ndim == 1:
-                values = values.reshape((values.shape[0], 1))
-            full_values = np.full(
-                    (self._fort14.values.size,
-                     np.asarray(data['defaults']).flatten().size),
-                    np.nan)
-            for i, idx in enumerate(data['indexes']):
-                for j, value in enumerate(values[i, :].tolist()):
-                    full_values[idx, j] = value
-            idxs = np.where(np.isnan(full_values).all(axis=1))[0]
-            for idx in idxs:
-                for i, value in enumerate(data['defaults']):
-                    full_values[idx, i] = value
-            # converts from column major to row major, leave it column major.
-            # if full_values.shape[1] == 1:
-            #     full_values = full_values.flatten()
-            self.add_attribute(attribute, data['units'])
-            self.set_attribute(attribute, full_values)
+        self._AGRID = fort13['AGRID']
+        for name, data in fort13['attributes'].items():
+            indexes = self._fort14.nodes.get_index_by_id(data['node_id'])
+            order = np.argsort(indexes, kind='stable')
+            self.add_attribute(name, _get_units(data['units']))
+            # rows equal to the defaults are kept, so the file round-trips
+            self.get_attribute(name).update({
+                'defaults': data['defaults'],
+                'non_default_indexes': indexes[order],
+                'non_default_values': data['values'][order],
+            })
 
     def write(self, path, overwrite=False):
         if path is not None:
-            path = pathlib.Path(path)
-            if path.is_file() and not overwrite:
-                msg = 'File exists, pass overwrite=True to allow overwrite.'
-                raise Exception(msg)
-            else:
-                with open(path, 'w') as f:
-                    f.write(str(self))
+            fort13_parser.write(self.to_dict(), path, overwrite)
         else:
             print(str(self))
 
 
+def _indexes_in_geometry(x, y, order, x_sorted, geometry):
+    """Indexes of the points strictly inside ``geometry``. Candidates are
+    taken from the bounding box of the geometry, using ``order``, the
+    argsort of ``x``, and tested against the prepared geometry.
+    """
+    xmin, ymin, xmax, ymax = geometry.bounds
+    candidates = order[np.searchsorted(x_sorted, xmin, side='left'):
+                       np.searchsorted(x_sorted, xmax, side='right')]
+    candidates = candidates[(y[candidates] >= ymin)
+                            & (y[candidates] <= ymax)]
+    shapely.prepare(geometry)
+    inside = shapely.contains_xy(geometry, x[candidates], y[candidates])
+    return np.sort(candidates[inside])
+
+
+def _get_units(units):
+    """Units of a nodal attribute read from a fort.13 file, where
+    dimensionless attributes have units of ``1``.
+    """
+    return 'unitless' if units == '1' else units
+
+
+def _mode_row(values):
+    """Most frequent row of a 2D array."""
+    a = np.ascontiguousarray(values)
+    void_dt = np.dtype((np.void, a.dtype.itemsize * np.prod(a.shape[1:])))
+    _, ids, count = np.unique(a.view(void_dt).ravel(), return_index=True,
+                              return_counts=True)
+    return a[ids[count.argmax()]]
+
+
 def parse_fort13(path):
-    fort13 = {}
-    with open(path, 'r') as f:
-        fort13['AGRID'] = f.readline().strip()
-        fort13['NumOfNodes'] = NP = int(f.readline().split()[0])
-        NAttr = int(f.readline().split()[0])
-        i = 0
-        while i < NAttr:
-            attribute_name = f.readline().strip()
-            units = f.readline().strip()
-            if units == '1':
-                units = 'unitless'
-            f.readline()
-            defaults = [float(x) for x in f.readline().split()]
-            fort13[attribute_name] = {'units': units,
-                                      'defaults': defaults,
-                                      'indexes': []}
-            i += 1
-        for i in range(NAttr):
-            attribute_name = f.readline().strip()
-            numOfNodes = int(f.readline())
-            values = np.zeros((NP, len(fort13[attribute_name]['defaults'])))
-            values[:] = np.nan
-            j = 0
-            while j < numOfNodes:
-                str = f.readline().split()
-                index = int(str[0]) - 1
-                fort13[attribute_name]['indexes'].append(index)
-                node_values = [float(x) for x in str[1:]]
-                values[index, :] = node_values
-                j += 1
-            values[np.where(np.isnan(values[:, 0])), :] = \
-                fort13[attribute_name]['defaults']
-            fort13[attribute_name]['values'] = values
-        return fort13
+    """Reads a fort.13 file into dense (NP, n) arrays of values, with the
+    non-default node indexes of each attribute under ``'indexes'``.
+    """
+    fort13 = fort13_parser.read(path)
+    NP = fort13['NumOfNodes']
+    parsed = {'AGRID': fort13['AGRID'], 'NumOfNodes': NP}
+    for name, data in fort13['attributes'].items():
+        indexes = data['node_id'] - 1
+        values = np.empty((NP, len(data['defaults'])))
+        values[:] = data['defaults']
+        values[indexes] = data['values']
+        parsed[name] = {
+            'units': _get_units(data['units']),
+            'defaults': data['defaults'].tolist(),
+            'indexes': indexes.tolist(),
+            'values': values,
+        }
+    return parsed
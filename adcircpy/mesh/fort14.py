@@ -9,7 +9,8 @@ import numpy as np
 from shapely.geometry import LineString, MultiLineString
 
 from adcircpy.figures import figure, get_topobathy_kwargs
-from adcircpy.mesh.parsers import grd
+from adcircpy.mesh import cache as mesh_cache
+from adcircpy.mesh.parsers import grd, ugrid
 from adcircpy.mesh.base import Grd  # , sort_edges, signed_polygon_area
 
 _logger = logging.getLogger(__name__)
@@ -33,9 +34,8 @@ class BaseBoundaries:
             self._indexes = list()
             for data in self._data.values():
                 self._indexes.append(
-                    list(map(
-                        self._mesh.nodes.get_index_by_id, data['node_id'])))
-        return np.array(self._indexes)
+                    self._mesh.nodes.get_index_by_id(data['node_id']))
+        return self._indexes
 
     @property
     def node_id(self):
@@ -84,9 +84,8 @@ class BarrierBaseBoundaries(BaseBoundaries):
         if not hasattr(self, '_indexes'):
             self._indexes = list()
             for data in self._data.values():
-                self._indexes.append(np.array([list(
-                    map(self._mesh.nodes.get_index_by_id, geom))
-                    for geom in data['node_id']]))
+                self._indexes.append(self._mesh.nodes.get_index_by_id(
+                    np.asarray(data['node_id'])))
         return self._indexes
 
     @property
@@ -212,6 +211,29 @@ class Fort14Boundaries:
         return boundaries
 
 
+def _trim_boundary(fort14, boundary, node_map, node_id):
+    index = node_map[fort14.nodes.get_index_by_id(
+        np.asarray(boundary['node_id']))]
+    paired = index.ndim == 2
+    kept = np.all(index != -1, axis=1) if paired else index != -1
+    # barrier pairs stand on their own, other boundaries need two nodes
+    min_length = 1 if paired else 2
+    edges = np.diff(np.concatenate([[False], kept, [False]]).astype(int))
+    for start, end in zip(np.flatnonzero(edges == 1),
+                          np.flatnonzero(edges == -1)):
+        if end - start < min_length:
+            continue
+        run = {}
+        for key, value in boundary.items():
+            if isinstance(value, (list, tuple, np.ndarray)) \
+                    and len(value) == len(index):
+                value = list(value[start:end])
+            run[key] = value
+        ids = node_id[index[start:end]].tolist()
+        run['node_id'] = list(map(tuple, ids)) if paired else ids
+        yield run
+
+
 class Fort14(Grd):
     """
     Class that represents the unstructured planar mesh used by SCHISM.
@@ -223,10 +245,19 @@ class Fort14(Grd):
         self._boundaries = Fort14Boundaries(self, boundaries)
 
     @classmethod
-    def open(cls, path, crs=None):
-        _grd = grd.read(path, crs=crs)
-        _grd['nodes'] = {id: (coords, -val) for id, (coords, val)
-                         in _grd['nodes'].items()}
+    def open(cls, path, crs=None, cache=False):
+        """Opens a fort.14 or UGRID NetCDF file. Pass ``cache=True`` (or a
+        cache directory) to load a fort.14 from, or save it to, the binary
+        mesh cache in :mod:`adcircpy.mesh.cache`.
+        """
+        if ugrid.is_ugrid(path):
+            _grd = ugrid.read(path, crs=True if crs is None else crs)
+        elif cache:
+            _grd = mesh_cache.read_arrays(path, crs=crs, cache_dir=cache)
+        else:
+            _grd = grd.read_arrays(path, crs=crs)
+        id, coords, values = _grd['nodes']
+        _grd['nodes'] = (id, coords, -values)
         return cls(**_grd)
 
     def to_dict(self, boundaries=True):
@@ -239,6 +270,29 @@ class Fort14(Grd):
                 })
         return _grd
 
+    def _get_subset_kwargs(self, node_map, node_id):
+        """Trims the boundaries to the kept nodes. A boundary loses its
+        dropped nodes and is split into its remaining runs of consecutive
+        nodes; runs too short to form a segment are discarded.
+        """
+        boundaries = {}
+        for ibtype, _boundaries in self.boundaries.to_dict().items():
+            for boundary in _boundaries.values():
+                for run in _trim_boundary(self, boundary, node_map, node_id):
+                    _boundaries = boundaries.setdefault(ibtype, {})
+                    _boundaries[len(_boundaries)] = run
+        return {'boundaries': boundaries}
+
+    def to_arrays(self, boundaries=True):
+        _grd = super().to_arrays()
+        if boundaries is True:
+            id, coords, values = _grd['nodes']
+            _grd.update({
+                "nodes": (id, coords, -values),
+                "boundaries": self.boundaries.to_dict()
+                })
+        return _grd
+
     @figure
     def make_plot(
         self,
@@ -0,0 +1,99 @@
+"""
+Read-only, memory-mapped access to meshes kept in the binary mesh cache.
+
+Coordinates, values and connectivity of a :class:`MappedMesh` are
+:class:`numpy.memmap` views over the ``.npy`` files of the store written by
+:mod:`adcircpy.mesh.cache`, so several processes mapping the same mesh share
+its pages instead of each holding a private copy.
+"""
+import os
+import pathlib
+from typing import Union
+
+from matplotlib.tri import Triangulation
+import numpy as np
+from pyproj import CRS
+
+from adcircpy.mesh import cache as mesh_cache
+from adcircpy.mesh.parsers import grd
+
+
+class MappedMesh:
+
+    def __init__(self, store: Union[str, os.PathLike], crs=None):
+        """Maps the binary mesh store ``store``. Use :meth:`open` to map a
+        grd/fort.14 file, building its store first if needed.
+        """
+        self._store = pathlib.Path(store)
+        self._grd = mesh_cache.read_store(self._store, mmap_mode='r')
+        self._triangles = np.load(self._store / 'triangles.npy',
+                                  mmap_mode='r')
+        if crs is None:
+            crs = grd._finalize(
+                {'description': self.description}, self._store,
+                boundaries=False, crs=None)['crs']
+        self._crs = CRS.from_user_input(crs) if crs is not None else crs
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike], crs=None,
+             cache: Union[bool, str, os.PathLike] = True):
+        """Maps the grd-formatted mesh file ``path`` through its binary store
+        in the cache directory ``cache`` (see
+        :func:`adcircpy.mesh.cache.get_cache_directory`), writing the store
+        there if it is missing or out of date.
+        """
+        return cls(mesh_cache.update(path, cache), crs)
+
+    @property
+    def description(self):
+        return self._grd['description']
+
+    @property
+    def crs(self):
+        return self._crs
+
+    @property
+    def id(self):
+        return self._grd['nodes'][0]
+
+    @property
+    def coords(self):
+        return self._grd['nodes'][1]
+
+    @property
+    def x(self):
+        return self.coords[:, 0]
+
+    @property
+    def y(self):
+        return self.coords[:, 1]
+
+    @property
+    def values(self):
+        """Nodal values as written in the mesh file (positive depths for a
+        fort.14).
+        """
+        return self._grd['nodes'][2]
+
+    @property
+    def element_id(self):
+        return self._grd['elements'][0]
+
+    @property
+    def connectivity(self):
+        """(NE, max_vertices) array of node id's, padded with -1."""
+        return self._grd['elements'][1]
+
+    @property
+    def triangles(self):
+        """Node indexes of the triangles of the mesh, with quads split in
+        two.
+        """
+        return self._triangles
+
+    @property
+    def triangulation(self):
+        if not hasattr(self, '_triangulation'):
+            self._triangulation = Triangulation(self.x, self.y,
+                                                self.triangles)
+        return self._triangulation
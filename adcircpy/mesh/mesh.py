@@ -1,10 +1,8 @@
 # type: ignore[attr-defined]
-from collections import defaultdict
-from itertools import permutations
 from typing import Union
 
-from haversine import Unit, haversine
 import numpy as np
+from pyproj import Geod
 from shapely.geometry import Polygon, MultiPolygon
 
 
@@ -12,8 +10,24 @@ from adcircpy.forcing.bctypes import BoundaryCondition
 from adcircpy.forcing.tides import Tides
 from adcircpy.forcing.waves import WaveForcing
 from adcircpy.forcing.winds.base import WindForcing
+from adcircpy.mesh.base import Adjacency
 from adcircpy.mesh.fort14 import Fort14
 from adcircpy.mesh.fort13 import NodalAttributes
+from adcircpy.mesh.parsers import ugrid
+
+
+# mean Earth radius in meters, as used by the haversine package
+EARTH_RADIUS = 6371008.8
+
+
+def haversine(lon0, lat0, lon1, lat1):
+    """Great circle distance in meters between arrays of points given in
+    degrees.
+    """
+    lon0, lat0, lon1, lat1 = map(np.radians, (lon0, lat0, lon1, lat1))
+    a = np.sin((lat1 - lat0) / 2.) ** 2 \
+        + np.cos(lat0) * np.cos(lat1) * np.sin((lon1 - lon0) / 2.) ** 2
+    return 2. * EARTH_RADIUS * np.arcsin(np.sqrt(a))
 
 
 class ModelForcings:
@@ -53,7 +67,9 @@ class NodalAttributeDescriptor:
         obj.nodal_attributes.set_attribute(self.name, val, True, True)
 
     def __get__(self, obj, val):
-        return self.nodal_attributes.get_attribute(self.name)
+        if obj is None:
+            return self
+        return obj.nodal_attributes.get_attribute(self.name)
 
 
 class AdcircMeshMeta(type):
@@ -94,6 +110,59 @@ class AdcircMesh(metaclass=AdcircMeshMeta):
         if fort13 is not None:
             self.import_nodal_attributes(fort13)
 
+    @classmethod
+    def open(cls, path, crs=None, cache=False):
+        """Opens a fort.14 or UGRID NetCDF file. Nodal attributes stored in a
+        UGRID file (see :meth:`write`) are loaded along with the mesh.
+        """
+        mesh = super().open(path, crs, cache)
+        if ugrid.is_ugrid(path):
+            for name, attribute in ugrid.read_nodal_attributes(path).items():
+                mesh.add_nodal_attribute(name, attribute['units'])
+                mesh.set_nodal_attribute(
+                    name, attribute['values'], attribute['coldstart'],
+                    attribute['hotstart'])
+        return mesh
+
+    def write(self, path, overwrite=False, format='gr3',
+              float_format='%.16E'):
+        """Writes the mesh. With ``format='ugrid'`` the nodal attributes are
+        stored in the same NetCDF file as the mesh.
+        """
+        if format in ['ugrid', 'nc', 'netcdf']:
+            ugrid.write(
+                self.to_arrays(), path, overwrite,
+                nodal_attributes={
+                    name: {
+                        'units': attribute['units'],
+                        'values': attribute.to_dense(),
+                        'coldstart': attribute['coldstart'],
+                        'hotstart': attribute['hotstart'],
+                    } for name, attribute in self.nodal_attributes
+                    if attribute['defaults'] is not None
+                })
+        else:
+            super().write(path, overwrite, format, float_format)
+
+    def _subset(self, element_index, renumber=True, node_index=None):
+        if node_index is None:
+            node_index = self._get_subset_node_index(element_index)
+        mesh = super()._subset(element_index, renumber, node_index)
+        node_map = np.full(len(self.nodes.id), -1)
+        node_map[node_index] = np.arange(len(node_index))
+        for name, attribute in self.nodal_attributes:
+            mesh.add_nodal_attribute(name, attribute['units'])
+            mesh.set_nodal_attribute_state(
+                name, attribute['coldstart'], attribute['hotstart'])
+            if attribute['defaults'] is None:
+                continue
+            index = node_map[attribute['non_default_indexes']]
+            kept = index != -1
+            mesh.nodal_attributes.set_sparse_attribute(
+                name, attribute['defaults'], index[kept],
+                attribute['non_default_values'][kept])
+        return mesh
+
     def add_forcing(self, forcing):
         self.forcings.add(forcing)
 
@@ -128,6 +197,9 @@ class AdcircMesh(metaclass=AdcircMeshMeta):
     def add_nodal_attribute_patch(self, name, patch, value):
         self.nodal_attributes.add_patch(name, patch, value)
 
+    def add_nodal_attribute_patches(self, name, patches, values):
+        self.nodal_attributes.add_patches(name, patches, values)
+
     def has_nodal_attribute(self, name, runtype=None):
         return self.nodal_attributes.has_attribute(name, runtype)
 
@@ -171,7 +243,8 @@ class AdcircMesh(metaclass=AdcircMeshMeta):
             deep_tau0=0.005,
             threshold_depth=-10.,
             coldstart=True,
-            hotstart=True
+            hotstart=True,
+            metric='projected',
     ):
         """
         Reimplementation of tau0_gen.f by Robert Weaver (2008)
@@ -179,61 +252,105 @@ class AdcircMesh(metaclass=AdcircMeshMeta):
         2) averages all distances to find rep. distance @ each node.
         3) Assigns a tau0 value based on depth and rep. distance.
         Asssumes threshold_distance is given in meters.
+
+        Distances are measured with ``metric`` (see :meth:`get_edge_lengths`);
+        the default ``'projected'`` matches tau0_gen.f.
         """
         msg = "Cannot compute TAU0 with nan depth values."
         assert not np.any(np.isnan(self.values)), msg
         msg = "Cannot compute TAU0 with no coordinate reference system set."
         assert self.crs is not None, msg
-        points = self.get_xy(3395)
+        neighbors = self.node_neighbors
+        has_neighbors = neighbors.degree > 0
+        distance = np.zeros(len(neighbors))
+        distance[has_neighbors] = np.add.reduceat(
+            self.get_node_distances(metric),
+            neighbors.indptr[:-1][has_neighbors]) \
+            / neighbors.degree[has_neighbors]
         values = np.full(self.values.shape, default_value)
-        for k, v in self.node_neighbors.items():
-            x0, y0 = points[k]
-            distances = list()
-            for idx in v:
-                x1, y1 = points[idx]
-                distances.append(np.sqrt((x0 - x1) ** 2 + (y0 - y1) ** 2))
-            distance = np.mean(distances)
-            if distance >= threshold_distance:
-                if self.values[k] >= threshold_depth:
-                    values[k] = shallow_tau0
-                else:
-                    values[k] = deep_tau0
+        coarse = has_neighbors & (distance >= threshold_distance)
+        values[coarse] = np.where(self.values[coarse] >= threshold_depth,
+                                  shallow_tau0, deep_tau0)
         self.primitive_weighting_in_continuity_equation = values
 
     def critical_timestep(self, cfl, maxvel=5., g=9.8):
         """
         http://swash.sourceforge.net/online_doc/swashuse/node47.html
         """
-        dxdy = len(self.values) * [None]
-        for k, v in self.node_distances_in_meters.items():
-            _dxdy = []
-            for idx in v:
-                _dxdy.append(self.node_distances_in_meters[k][idx])
-            dxdy[k] = np.min(_dxdy)
-        return cfl * np.min(dxdy) / np.abs(maxvel)
+        return np.min(self.node_critical_timestep(cfl, maxvel))
+
+    def node_critical_timestep(self, cfl, maxvel=5.):
+        """Critical timestep of each node, from the length of its shortest
+        edge. Nodes without neighbors get ``inf``.
+        """
+        neighbors = self.node_neighbors
+        dxdy = np.full(len(neighbors), np.inf)
+        has_neighbors = neighbors.degree > 0
+        dxdy[has_neighbors] = np.minimum.reduceat(
+            self.node_distances_in_meters,
+            neighbors.indptr[:-1][has_neighbors])
+        return cfl * dxdy / np.abs(maxvel)
+
+    def get_edge_lengths(self, metric: str = 'haversine'):
+        """Lengths in meters of the unique edges of the mesh triangulation.
+
+        Returns a tuple ``(edges, lengths)``, where ``edges`` is an (E, 2)
+        array of node indexes with ``edges[:, 0] < edges[:, 1]``. Argument
+        ``metric`` selects the great circle distance on a sphere of radius
+        :data:`EARTH_RADIUS` (``'haversine'``), the geodesic distance on the
+        ellipsoid of the mesh CRS (``'geodesic'``) or the euclidean distance
+        in World Mercator, EPSG:3395 (``'projected'``).
+        """
+        rows, cols = self.node_neighbors.pairs()
+        upper = rows < cols
+        edges = np.column_stack([rows[upper], cols[upper]])
+        if metric == 'projected':
+            x, y = self.get_xy(3395).T
+            lengths = np.sqrt((x[edges[:, 0]] - x[edges[:, 1]]) ** 2
+                              + (y[edges[:, 0]] - y[edges[:, 1]]) ** 2)
+            return edges, lengths
+        lon, lat = self.get_xy('EPSG:4326').T
+        if metric == 'haversine':
+            lengths = haversine(lon[edges[:, 0]], lat[edges[:, 0]],
+                                lon[edges[:, 1]], lat[edges[:, 1]])
+        elif metric == 'geodesic':
+            geod = self.crs.get_geod() if self.crs.is_geographic \
+                else Geod(ellps='WGS84')
+            _, _, lengths = geod.inv(lon[edges[:, 0]], lat[edges[:, 0]],
+                                     lon[edges[:, 1]], lat[edges[:, 1]])
+        else:
+            raise ValueError(f'Unknown distance metric {metric}, must be '
+                             '\'haversine\', \'geodesic\' or '
+                             '\'projected\'.')
+        return edges, lengths
+
+    def get_node_distances(self, metric: str = 'haversine'):
+        """Distance in meters from each node to each of its neighbors,
+        aligned with ``node_neighbors.indices``. See
+        :meth:`get_edge_lengths` for ``metric``.
+        """
+        edges, lengths = self.get_edge_lengths(metric)
+        nodes = len(self.node_neighbors)
+        rows, cols = self.node_neighbors.pairs()
+        keys = np.minimum(rows, cols) * nodes + np.maximum(rows, cols)
+        return lengths[np.searchsorted(edges[:, 0] * nodes + edges[:, 1],
+                                       keys)]
 
     @property
     def node_distances_in_meters(self):
+        """Haversine distance from each node to each of its neighbors,
+        aligned with ``node_neighbors.indices``.
+        """
         if not hasattr(self, '_node_distances_in_meters'):
-            points = self.get_xy('EPSG:4326')
-            self._node_distances_in_meters = {}
-            for k, v in self.node_neighbors.items():
-                x0, y0 = points[k]
-                self._node_distances_in_meters[k] = {}
-                for idx in v:
-                    x1, y1 = points[idx]
-                    self._node_distances_in_meters[k][idx] = haversine(
-                        (x0, y0),
-                        (x1, y1),
-                        unit=Unit.METERS
-                    )
+            self._node_distances_in_meters = self.get_node_distances()
         return self._node_distances_in_meters
 
     @property
     def node_neighbors(self):
+        """:class:`~adcircpy.mesh.base.Adjacency` of nodes sharing an edge of
+        the mesh triangulation.
+        """
         if not hasattr(self, "_node_neighbors"):
-            self._node_neighbors = defaultdict(set)
-            for simplex in self.triangulation.triangles:
-                for i, j in permutations(simplex, 2):
-                    self._node_neighbors[i].add(j)
+            self._node_neighbors = Adjacency.from_connectivity(
+                self.triangulation.triangles, len(self.nodes.id))
         return self._node_neighbors
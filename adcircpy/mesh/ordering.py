@@ -0,0 +1,79 @@
+"""
+Node orderings used by :meth:`adcircpy.mesh.base.Grd.reorder`.
+
+Each function returns a permutation of the node indexes: the node placed at
+position ``i`` of the reordered mesh is node ``order[i]`` of the original
+one.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+
+def rcm(adjacency):
+    """Reverse Cuthill-McKee ordering of an
+    :class:`~adcircpy.mesh.base.Adjacency`, which minimizes its bandwidth.
+    """
+    size = len(adjacency)
+    graph = csr_matrix(
+        (np.ones(len(adjacency.indices), dtype=np.int8),
+         adjacency.indices, adjacency.indptr), shape=(size, size))
+    return reverse_cuthill_mckee(graph, symmetric_mode=True).astype(int)
+
+
+def hilbert(coords, bits: int = 16):
+    """Ordering of (n, 2) ``coords`` along a Hilbert curve over their
+    bounding box, on a grid of ``2**bits`` by ``2**bits`` cells.
+    """
+    x, y = _quantize(coords, bits)
+    n = 1 << bits
+    d = np.zeros(len(x), dtype=np.int64)
+    s = n >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx) ^ ry)
+        # rotate the quadrant so the curve stays continuous
+        flip = ~ry & rx
+        x = np.where(flip, n - 1 - x, x)
+        y = np.where(flip, n - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return np.argsort(d, kind='stable')
+
+
+def morton(coords, bits: int = 16):
+    """Ordering of (n, 2) ``coords`` along a Morton (Z-order) curve over
+    their bounding box, on a grid of ``2**bits`` by ``2**bits`` cells.
+    """
+    x, y = _quantize(coords, bits)
+    return np.argsort(_spread_bits(x) | (_spread_bits(y) << 1),
+                      kind='stable')
+
+
+def bandwidth(adjacency):
+    """Largest index distance between neighbors of an
+    :class:`~adcircpy.mesh.base.Adjacency`.
+    """
+    rows, cols = adjacency.pairs()
+    return int(np.max(np.abs(rows - cols))) if len(rows) > 0 else 0
+
+
+def _quantize(coords, bits):
+    coords = np.asarray(coords, dtype=np.float64)
+    lower = coords.min(axis=0) if len(coords) > 0 else np.zeros(2)
+    extent = np.ptp(coords, axis=0) if len(coords) > 0 else np.ones(2)
+    extent[extent == 0.] = 1.
+    scaled = (coords - lower) / extent * ((1 << bits) - 1)
+    x, y = np.round(scaled).astype(np.int64).T
+    return x, y
+
+
+def _spread_bits(v):
+    # inserts a zero bit between each of the lower 32 bits of v
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                        (1, 0x5555555555555555)]:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
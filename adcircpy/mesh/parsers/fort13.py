@@ -0,0 +1,117 @@
+"""
+Bulk reader and streaming writer for ADCIRC nodal attribute (fort.13) files.
+
+A fort.13 file is read into a dictionary of the form::
+
+    {'AGRID': str,
+     'NumOfNodes': int,
+     'attributes': {name: {'units': str,
+                           'defaults': array of shape (n,),
+                           'node_id': array of shape (k,),
+                           'values': array of shape (k, n)}}}
+
+where ``node_id`` and ``values`` hold the non-default block of each
+attribute, in file order. The non-default blocks are written in the order of
+the default values, as in most fort.13 files. Default values are written
+with ``%.16E`` and non-default values with the shortest representation that
+parses back to the same float, one space apart, and the file ends with a
+newline. Any fort.13 file reads back to identical arrays once written, but
+only files in this format (e.g. written by :func:`write`) are written back
+byte for byte: the number formatting and spacing of other files is not
+kept.
+"""
+import io
+import os
+import pathlib
+from typing import TextIO, Union
+
+import numpy as np
+
+from adcircpy.mesh.parsers.grd import _fromstring, _read_lines
+
+
+def buffer_to_dict(buf: TextIO, chunksize: int = 2**20):
+    """Reads a fort.13-formatted buffer. The non-default block of each
+    attribute is parsed ``chunksize`` lines at a time.
+    """
+    fort13 = {'AGRID': buf.readline().rstrip('\r\n')}
+    fort13['NumOfNodes'] = int(buf.readline().split()[0])
+    NAttr = int(buf.readline().split()[0])
+    attributes = {}
+    for _ in range(NAttr):
+        name = buf.readline().strip()
+        units = buf.readline().strip()
+        buf.readline()
+        attributes[name] = {
+            'units': units,
+            'defaults': np.array(buf.readline().split(), dtype=float),
+        }
+    for _ in range(NAttr):
+        name = buf.readline().strip()
+        if name not in attributes:
+            raise ValueError(f'Nodal attribute {name} has no default values.')
+        attribute = attributes[name]
+        ncols = len(attribute['defaults']) + 1
+        blocks = []
+        for nrows, text in _read_lines(buf, int(buf.readline().split()[0]),
+                                       chunksize):
+            block = _fromstring(text, float)
+            if block.size != nrows * ncols:
+                raise ValueError(
+                    f'Non-default values of nodal attribute {name} are '
+                    f'malformed: expected every row to have {ncols} '
+                    'columns.')
+            blocks.append(block.reshape((nrows, ncols)))
+        block = np.concatenate(blocks) if len(blocks) > 0 \
+            else np.empty((0, ncols))
+        attribute['node_id'] = block[:, 0].astype(int)
+        attribute['values'] = np.ascontiguousarray(block[:, 1:])
+    fort13['attributes'] = attributes
+    return fort13
+
+
+def dict_to_buffer(buf: TextIO, fort13, chunksize: int = 2**16):
+    """Streams a fort.13 dictionary, in the form returned by
+    :func:`buffer_to_dict`, to a writable buffer ``chunksize`` rows at a
+    time.
+    """
+    attributes = fort13['attributes']
+    buf.write(f"{fort13['AGRID']}\n{fort13['NumOfNodes']}\n"
+              f"{len(attributes)}\n")
+    for name, attribute in attributes.items():
+        defaults = np.atleast_1d(attribute['defaults'])
+        buf.write(f"{name}\n{attribute['units']}\n{len(defaults)}\n")
+        buf.write(' '.join(f'{n:<.16E}' for n in defaults) + '\n')
+    for name, attribute in attributes.items():
+        node_id = np.asarray(attribute['node_id'])
+        values = np.asarray(attribute['values'], dtype=np.float64).reshape(
+            (len(node_id), len(np.atleast_1d(attribute['defaults']))))
+        buf.write(f'{name}\n{len(node_id)}\n')
+        line = ' '.join(['%s'] + ['%r'] * values.shape[1]) + '\n'
+        for start in range(0, len(node_id), chunksize):
+            end = min(start + chunksize, len(node_id))
+            columns = [node_id[start:end].tolist(),
+                       *values[start:end].T.tolist()]
+            flat = [None] * (len(columns) * (end - start))
+            for i, column in enumerate(columns):
+                flat[i::len(columns)] = column
+            buf.write(line * (end - start) % tuple(flat))
+
+
+def read(path: Union[str, os.PathLike], chunksize: int = 2**20):
+    with open(pathlib.Path(path), 'r') as f:
+        return buffer_to_dict(f, chunksize)
+
+
+def write(fort13, path: Union[str, os.PathLike], overwrite=False):
+    path = pathlib.Path(path)
+    if path.is_file() and not overwrite:
+        raise Exception('File exists, pass overwrite=True to allow overwrite.')
+    with open(path, 'w') as f:
+        dict_to_buffer(f, fort13)
+
+
+def to_string(fort13):
+    buf = io.StringIO()
+    dict_to_buffer(buf, fort13)
+    return buf.getvalue()
@@ -1,4 +1,6 @@
 from collections import defaultdict
+import io
+from itertools import islice
 import os
 import numbers
 import pathlib
@@ -35,13 +37,132 @@ def buffer_to_dict(buf: TextIO):
     for _ in range(NE):
         line = buf.readline().split()
         elements[line[0]] = line[2:]
+    grd = {'description': description,
+           'nodes': nodes,
+           'elements': elements}
+    boundaries = _read_boundaries(buf)
+    if boundaries is not None:
+        grd['boundaries'] = boundaries
+    return grd
+
+
+def buffer_to_arrays(buf: TextIO, chunksize: int = 2**20):
+    """Reads a grd-formatted buffer into NumPy arrays.
+
+    Bulk counterpart of :func:`buffer_to_dict`. The node and element blocks
+    are parsed in chunks of ``chunksize`` lines, so no per-node Python objects
+    are created. The returned dictionary has the same keys as
+    :func:`buffer_to_dict`, but ``nodes`` is an ``(id, coords, values)``
+    tuple and ``elements`` is an ``(id, connectivity)`` tuple, where
+    ``connectivity`` holds node id's padded with -1 for mixed meshes.
+    Boundary node id's are returned as integers.
+    """
+    description = buf.readline().strip()
+    NE, NP = map(int, buf.readline().split())
+    grd = {'description': description,
+           'nodes': _read_node_block(buf, NP, chunksize),
+           'elements': _read_element_block(buf, NE, chunksize)}
+    boundaries = _read_boundaries(buf, node_id=int)
+    if boundaries is not None:
+        grd['boundaries'] = boundaries
+    return grd
+
+
+def _read_lines(buf: TextIO, count: int, chunksize: int):
+    while count > 0:
+        lines = list(islice(buf, min(count, chunksize)))
+        if len(lines) == 0:
+            raise ValueError('Unexpected end of file while reading mesh.')
+        count -= len(lines)
+        yield len(lines), ''.join(lines)
+
+
+def _fromstring(text: str, dtype):
+    # np.fromstring stops at the first token it cannot parse and warns,
+    # callers detect that case by checking the size of the output.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        return np.fromstring(text, dtype=dtype, sep=' ')
+
+
+def _read_node_block(buf: TextIO, NP: int, chunksize: int):
+    blocks = []
+    ncols = None
+    for nrows, text in _read_lines(buf, NP, chunksize):
+        if ncols is None:
+            ncols = len(text.split('\n', 1)[0].split())
+        block = _fromstring(text, float)
+        if block.size != nrows * ncols:
+            raise ValueError(
+                'Node table is malformed: expected every node row to have '
+                f'{ncols} columns.')
+        blocks.append(block.reshape((nrows, ncols)))
+    if len(blocks) == 0:
+        return (np.empty((0,), dtype=int), np.empty((0, 2)), np.empty((0,)))
+    array = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+    # See buffer_to_dict for the 2D mesh assumption on the value columns.
+    values = array[:, 3] if ncols == 4 else array[:, 3:]
+    return (array[:, 0].astype(int),
+            np.ascontiguousarray(array[:, 1:3]),
+            np.ascontiguousarray(values))
+
+
+def _tokens_per_line(text: str, nrows: int):
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    space = chars <= 32
+    starts = ~space
+    starts[1:] &= space[:-1]
+    line = np.cumsum(chars == 10)[starts]
+    return np.bincount(line, minlength=nrows)[:nrows]
+
+
+def _read_element_block(buf: TextIO, NE: int, chunksize: int):
+    ids = []
+    blocks = []
+    for nrows, text in _read_lines(buf, NE, chunksize):
+        tokens = _fromstring(text, int)
+        for nvert in (3, 4):
+            # uniform chunk: every row is "id nvert n0 ... n{nvert-1}"
+            ncols = nvert + 2
+            if tokens.size == nrows * ncols \
+                    and np.all(tokens[1::ncols] == nvert):
+                rows = tokens.reshape((nrows, ncols))
+                ids.append(rows[:, 0])
+                blocks.append(rows[:, 2:])
+                break
+        else:
+            counts = _tokens_per_line(text, nrows)
+            if counts.sum() != tokens.size:
+                raise ValueError('Element table is malformed.')
+            offsets = np.cumsum(counts) - counts
+            nverts = tokens[offsets + 1]
+            if np.any(counts != nverts + 2):
+                raise ValueError(
+                    'Element table is malformed: number of vertices does not '
+                    'match the element definition.')
+            cols = np.arange(nverts.max())
+            mask = cols < nverts[:, None]
+            block = np.full((nrows, cols.size), -1, dtype=int)
+            block[mask] = tokens[(offsets[:, None] + 2 + cols)[mask]]
+            ids.append(tokens[offsets])
+            blocks.append(block)
+    if len(blocks) == 0:
+        return np.empty((0,), dtype=int), np.empty((0, 3), dtype=int)
+    width = max(block.shape[1] for block in blocks)
+    connectivity = np.full((NE, width), -1, dtype=int)
+    start = 0
+    for block in blocks:
+        connectivity[start:start + block.shape[0], :block.shape[1]] = block
+        start += block.shape[0]
+    return np.concatenate(ids), connectivity
+
+
+def _read_boundaries(buf: TextIO, node_id=str):
     # Assume EOF if NOPE is empty.
     try:
         NOPE = int(buf.readline().split()[0])
     except IndexError:
-        return {'description': description,
-                'nodes': nodes,
-                'elements': elements}
+        return None
     # let NOPE=-1 mean an ellipsoidal-mesh
     # reassigning NOPE to 0 until further implementation is applied.
     boundaries: Dict = defaultdict(dict)
@@ -54,7 +175,7 @@ def buffer_to_dict(buf: TextIO):
         boundaries[None][_bnd_id]['node_id'] = list()
         while _cnt < NETA:
             boundaries[None][_bnd_id]['node_id'].append(
-                buf.readline().split()[0].strip())
+                node_id(buf.readline().split()[0].strip()))
             _cnt += 1
         _bnd_id += 1
     NBOU = int(buf.readline().split()[0])
@@ -87,34 +208,35 @@ def buffer_to_dict(buf: TextIO):
         while _pnt_cnt < int(npts):
             line = buf.readline().split()
             if ibtype.endswith('3'):
-                boundaries[ibtype][_bnd_id]['node_id'].append((line[0],))
+                boundaries[ibtype][_bnd_id]['node_id'].append(
+                    (node_id(line[0]),))
                 boundaries[ibtype][_bnd_id]['barrier_height'].append(float(line[1]))
                 boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[2]))
             elif ibtype.endswith('4'):
-                boundaries[ibtype][_bnd_id]['node_id'].append((line[0], line[1]))
+                boundaries[ibtype][_bnd_id]['node_id'].append(
+                    (node_id(line[0]), node_id(line[1])))
                 boundaries[ibtype][_bnd_id]['barrier_height'].append(float(line[2]))
                 boundaries[ibtype][_bnd_id]['subcritical_flow_coefficient'].append(float(line[3]))
                 boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[4]))
             elif ibtype.endswith('5'):
-                boundaries[ibtype][_bnd_id]['node_id'].append((line[0], line[1]))
+                boundaries[ibtype][_bnd_id]['node_id'].append(
+                    (node_id(line[0]), node_id(line[1])))
                 boundaries[ibtype][_bnd_id]['barrier_height'].append(float(line[2]))
                 boundaries[ibtype][_bnd_id]['subcritical_flow_coefficient'].append(float(line[3]))
                 boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[4]))
-                boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[4]))
-                boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[4]))
-                boundaries[ibtype][_bnd_id]['supercritical_flow_coefficient'].append(float(line[4]))
-
+                boundaries[ibtype][_bnd_id]['cross_barrier_pipe_height'].append(float(line[5]))
+                boundaries[ibtype][_bnd_id]['friction_factor'].append(float(line[6]))
+                boundaries[ibtype][_bnd_id]['pipe_diameter'].append(float(line[7]))
             else:
-                boundaries[ibtype][_bnd_id]['node_id'].append(line[0])
+                boundaries[ibtype][_bnd_id]['node_id'].append(
+                    node_id(line[0]))
             _pnt_cnt += 1
         _nbnd_cnt += 1
-    return {'description': description,
-            'nodes': nodes,
-            'elements': elements,
-            'boundaries': boundaries}
+    return boundaries
 
 
-def to_string(description, nodes, elements, boundaries=None, crs=None):
+def to_string(description, nodes, elements, boundaries=None, crs=None,
+              float_format='%.16E'):
     """
     must contain keys:
         description
@@ -125,16 +247,23 @@ def to_string(description, nodes, elements, boundaries=None, crs=None):
         values
         boundaries (optional)
             indexes
+
+    Nodes and elements may also be given as the tuples of arrays described
+    in :func:`buffer_to_arrays`.
     """
+    if isinstance(nodes, tuple):
+        buf = io.StringIO()
+        arrays_to_buffer(buf, description, nodes, elements, boundaries,
+                         float_format=float_format)
+        return buf.getvalue()
     NE, NP = len(elements), len(nodes)
     out = [f"{description}", f"{NE} {NP}"]
-    # TODO: Probably faster if using np.array2string
     for id, (coords, values) in nodes.items():
         if isinstance(values, numbers.Number):
             values = [values]
         line = [f"{id}"]
-        line.extend([f"{x:<.16E}" for x in coords])
-        line.extend([f"{x:<.16E}" for x in values])
+        line.extend([float_format % x for x in coords])
+        line.extend([float_format % x for x in values])
         out.append(" ".join(line))
 
     for id, element in elements.items():
@@ -143,6 +272,68 @@ def to_string(description, nodes, elements, boundaries=None, crs=None):
         line.extend([f"{e}" for e in element])
         out.append(" ".join(line))
 
+    out.extend(_boundaries_to_lines(boundaries))
+    return "\n".join(out)
+
+
+def arrays_to_buffer(buf: TextIO, description, nodes, elements,
+                     boundaries=None, crs=None, float_format='%.16E',
+                     chunksize: int = 2**16):
+    """Streams a grd-formatted mesh to a writable buffer.
+
+    Counterpart of :func:`buffer_to_arrays`: nodes are given as an
+    ``(id, coords, values)`` tuple and elements as an ``(id, connectivity)``
+    tuple of node id's padded with -1. The node and element blocks are
+    formatted ``chunksize`` rows at a time and written to ``buf`` as they are
+    produced. With the default ``float_format`` the output is identical to
+    :func:`to_string`; a shorter format such as ``'%.8E'`` roughly halves the
+    size of the node block.
+    """
+    node_id, coords, values = nodes
+    element_id, connectivity = elements
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values.reshape((values.size, 1))
+    NP, NE = len(node_id), len(element_id)
+    buf.write(f"{description}\n{NE} {NP}\n")
+
+    line = ' '.join(['%s'] + [float_format] * (2 + values.shape[1])) + '\n'
+    for start in range(0, NP, chunksize):
+        end = min(start + chunksize, NP)
+        columns = [np.asarray(node_id[start:end]).tolist(),
+                   *coords[start:end].T.tolist(),
+                   *values[start:end].T.tolist()]
+        flat = [None] * (len(columns) * (end - start))
+        for i, column in enumerate(columns):
+            flat[i::len(columns)] = column
+        buf.write(line * (end - start) % tuple(flat))
+
+    element_id = np.asarray(element_id)
+    connectivity = np.asarray(connectivity)
+    dtype = object if object in (element_id.dtype, connectivity.dtype) \
+        else np.int64
+    nverts = np.count_nonzero(connectivity != -1, axis=1)
+    lines = {n: ' '.join(['%s'] * (n + 2)) + '\n' for n in np.unique(nverts)}
+    for start in range(0, NE, chunksize):
+        end = min(start + chunksize, NE)
+        block = connectivity[start:end]
+        rows = np.empty((end - start, block.shape[1] + 2), dtype=dtype)
+        rows[:, 0] = element_id[start:end]
+        rows[:, 1] = nverts[start:end]
+        rows[:, 2:] = block
+        mask = np.ones(rows.shape, dtype=bool)
+        mask[:, 2:] = block != -1
+        if len(lines) == 1:
+            fmt = lines[nverts[0]] * (end - start)
+        else:
+            fmt = ''.join([lines[n] for n in nverts[start:end]])
+        buf.write(fmt % tuple(rows[mask].tolist()))
+
+    buf.write("\n".join(_boundaries_to_lines(boundaries)))
+
+
+def _boundaries_to_lines(boundaries):
+    out = []
     # ocean boundaries
     if boundaries is not None:
         ocean_boundaries = boundaries.get(None, {})
@@ -190,9 +381,9 @@ def to_string(description, nodes, elements, boundaries=None, crs=None):
             for i, node_id in enumerate(boundary['node_id']):
                 if isinstance(node_id, Iterable) and \
                         not isinstance(node_id, str):
-                    line = [' '.join([x for x in list(node_id)])]
+                    line = [' '.join([f'{x}' for x in list(node_id)])]
                 else:
-                    line = [node_id]
+                    line = [f'{node_id}']
                 if ibtype.endswith('3'):  # outflow
                     line.append(f'{boundary["barrier_height"][i]:.16e}')
                     line.append(f'{boundary["supercritical_flow_coefficient"][i]:.16e}')
@@ -208,7 +399,7 @@ def to_string(description, nodes, elements, boundaries=None, crs=None):
                     line.append(f'{boundary["friction_factor"][i]:.16e}')
                     line.append(f'{boundary["pipe_diameter"][i]:.16e}')
                 out.append(' '.join(line))
-    return "\n".join(out)
+    return out
 
 
 def read(resource: Union[str, os.PathLike], boundaries: bool = True, crs=True):
@@ -222,6 +413,21 @@ def read(resource: Union[str, os.PathLike], boundaries: bool = True, crs=True):
     resource = pathlib.Path(resource)
     with open(resource, 'r') as stream:
         grd = buffer_to_dict(stream)
+    return _finalize(grd, resource, boundaries, crs)
+
+
+def read_arrays(resource: Union[str, os.PathLike], boundaries: bool = True,
+                crs=True):
+    """Same as :func:`read`, but nodes and elements are returned as NumPy
+    arrays as described in :func:`buffer_to_arrays`.
+    """
+    resource = pathlib.Path(resource)
+    with open(resource, 'r') as stream:
+        grd = buffer_to_arrays(stream)
+    return _finalize(grd, resource, boundaries, crs)
+
+
+def _finalize(grd, resource, boundaries, crs):
     if boundaries is False:
         grd.pop('boundaries', None)
     if crs is True:
@@ -241,9 +447,12 @@ def read(resource: Union[str, os.PathLike], boundaries: bool = True, crs=True):
     return grd
 
 
-def write(grd, path, overwrite=False):
+def write(grd, path, overwrite=False, float_format='%.16E'):
     path = pathlib.Path(path)
     if path.is_file() and not overwrite:
         raise Exception('File exists, pass overwrite=True to allow overwrite.')
     with open(path, 'w') as f:
-        f.write(to_string(**grd))
+        if isinstance(grd['nodes'], tuple):
+            arrays_to_buffer(f, **grd, float_format=float_format)
+        else:
+            f.write(to_string(**grd, float_format=float_format))
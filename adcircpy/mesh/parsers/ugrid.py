@@ -0,0 +1,280 @@
+"""
+Reader and writer for grd meshes stored as UGRID NetCDF4 files.
+
+Nodes are stored as ``mesh_node_x``/``mesh_node_y``/``mesh_node_values`` and
+faces as ``mesh_face_nodes`` (zero-based node indexes, padded with
+``_FillValue`` for mixed triangle/quad meshes), next to the original node and
+element id's. Boundaries are stored as contiguous ragged arrays indexed by
+``boundary_node_count``, and AdcircMesh nodal attributes as one variable per
+attribute in the ``nodal_attributes`` group. Every array variable is chunked
+and zlib-compressed, so single variables can be read without loading the rest
+of the file.
+"""
+import os
+import pathlib
+from typing import Union
+
+from netCDF4 import Dataset
+import numpy as np
+from pyproj import CRS
+
+FILL_VALUE = -1
+BOUNDARY_FIELDS = [
+    'barrier_height',
+    'subcritical_flow_coefficient',
+    'supercritical_flow_coefficient',
+    'cross_barrier_pipe_height',
+    'friction_factor',
+    'pipe_diameter',
+]
+
+
+def is_ugrid(path: Union[str, os.PathLike]):
+    """Returns ``True`` if ``path`` is a NetCDF (classic or HDF5) file."""
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+    except OSError:
+        return False
+    return magic[:3] == b'CDF' or magic == b'\x89HDF'
+
+
+def write(grd, path: Union[str, os.PathLike], overwrite=False,
+          nodal_attributes=None, chunksize: int = 2**16, complevel: int = 4):
+    """Writes a grd dictionary in the form returned by
+    :func:`adcircpy.mesh.parsers.grd.buffer_to_arrays` to a UGRID NetCDF4
+    file.
+
+    Args:
+        nodal_attributes: Optional dictionary of the form
+            ``{name: {'units': str, 'values': array, 'coldstart': bool,
+            'hotstart': bool}}`` with nodal values of shape (NP, n).
+        chunksize: Chunk length along the node, face and boundary node
+            dimensions.
+        complevel: zlib compression level.
+    """
+    path = pathlib.Path(path)
+    if path.is_file() and not overwrite:
+        raise Exception('File exists, pass overwrite=True to allow overwrite.')
+    node_id, coords, values = grd['nodes']
+    element_id, connectivity = grd['elements']
+    node_id = np.asarray(node_id)
+    element_id = np.asarray(element_id)
+    connectivity = np.asarray(connectivity)
+    if node_id.dtype.kind not in 'iu' or element_id.dtype.kind not in 'iu':
+        raise ValueError('UGRID output requires integer node and element '
+                         'id\'s.')
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape((values.size, 1))
+
+    def create(nc, name, datatype, dimensions, fill_value=None):
+        sizes = [max(_get_dimension_size(nc, dim), 1) for dim in dimensions]
+        chunks = [min(sizes[0], chunksize)] + sizes[1:]
+        return nc.createVariable(
+            name, datatype, dimensions, zlib=True, complevel=complevel,
+            shuffle=True, chunksizes=chunks, fill_value=fill_value)
+
+    with Dataset(path, 'w', format='NETCDF4') as nc:
+        nc.Conventions = 'CF-1.8 UGRID-1.0'
+        nc.description = grd.get('description', '')
+        nc.createDimension('nMesh_node', len(node_id))
+        nc.createDimension('nMesh_face', len(element_id))
+        nc.createDimension('nMax_face_nodes', connectivity.shape[1])
+        nc.createDimension('nMesh_node_values', values.shape[1])
+
+        mesh = nc.createVariable('mesh', 'i4')
+        mesh.cf_role = 'mesh_topology'
+        mesh.topology_dimension = 2
+        mesh.node_coordinates = 'mesh_node_x mesh_node_y'
+        mesh.face_node_connectivity = 'mesh_face_nodes'
+        mesh.face_dimension = 'nMesh_face'
+
+        crs = grd.get('crs')
+        if crs is not None:
+            crs = CRS.from_user_input(crs)
+            grid_mapping = nc.createVariable('crs', 'i4')
+            grid_mapping.setncatts(
+                {key: value for key, value in crs.to_cf().items()
+                 if value is not None})
+        geographic = crs is not None and crs.is_geographic
+        for axis, name in enumerate(['x', 'y']):
+            var = create(nc, f'mesh_node_{name}', 'f8', ('nMesh_node',))
+            var[:] = np.asarray(coords)[:, axis]
+            var.standard_name = (['longitude', 'latitude'] if geographic
+                                 else ['projection_x_coordinate',
+                                       'projection_y_coordinate'])[axis]
+            if crs is not None:
+                var.grid_mapping = 'crs'
+        var = create(nc, 'mesh_node_values', 'f8',
+                     ('nMesh_node', 'nMesh_node_values'))
+        var[:] = values
+        var.mesh = 'mesh'
+        var.location = 'node'
+        create(nc, 'mesh_node_id', node_id.dtype, ('nMesh_node',))[:] = \
+            node_id
+
+        var = create(nc, 'mesh_face_nodes', 'i4',
+                     ('nMesh_face', 'nMax_face_nodes'), FILL_VALUE)
+        var.cf_role = 'face_node_connectivity'
+        var.start_index = 0
+        var[:] = _get_index(node_id, connectivity)
+        create(nc, 'mesh_face_id', element_id.dtype, ('nMesh_face',))[:] = \
+            element_id
+
+        if grd.get('boundaries') is not None:
+            _write_boundaries(nc, create, node_id, grd['boundaries'])
+
+        if nodal_attributes:
+            group = nc.createGroup('nodal_attributes')
+            for name, attribute in nodal_attributes.items():
+                values = np.asarray(attribute['values'], dtype=np.float64)
+                values = values.reshape((len(node_id), -1))
+                group.createDimension(f'{name}_values', values.shape[1])
+                var = create(group, name, 'f8',
+                             ('nMesh_node', f'{name}_values'))
+                var[:] = values
+                var.mesh = 'mesh'
+                var.location = 'node'
+                var.units = attribute['units']
+                var.coldstart = int(attribute['coldstart'])
+                var.hotstart = int(attribute['hotstart'])
+
+
+def read(path: Union[str, os.PathLike], boundaries: bool = True, crs=True):
+    """Reads a UGRID NetCDF4 file written by :func:`write` into a grd
+    dictionary in the form returned by
+    :func:`adcircpy.mesh.parsers.grd.read_arrays`.
+    """
+    with Dataset(pathlib.Path(path), 'r') as nc:
+        nc.set_auto_mask(False)
+        node_id = nc['mesh_node_id'][:]
+        values = nc['mesh_node_values'][:]
+        face_nodes = nc['mesh_face_nodes'][:]
+        connectivity = np.where(face_nodes != FILL_VALUE,
+                                node_id[face_nodes], -1)
+        grd = {
+            'description': nc.description,
+            'nodes': (
+                node_id,
+                np.column_stack([nc['mesh_node_x'][:], nc['mesh_node_y'][:]]),
+                values[:, 0] if values.shape[1] == 1 else values),
+            'elements': (nc['mesh_face_id'][:], connectivity),
+        }
+        if boundaries is True and 'boundary_type' in nc.variables:
+            grd['boundaries'] = _read_boundaries(nc)
+        if crs is True:
+            crs = CRS.from_cf(nc['crs'].__dict__) if 'crs' in nc.variables \
+                else None
+        if crs is not False:
+            grd['crs'] = crs
+    return grd
+
+
+def read_nodal_attributes(path: Union[str, os.PathLike], names=None):
+    """Reads the nodal attributes ``names`` (all by default) stored by
+    :func:`write`, in the same form as its ``nodal_attributes`` argument.
+    """
+    nodal_attributes = {}
+    with Dataset(pathlib.Path(path), 'r') as nc:
+        if 'nodal_attributes' not in nc.groups:
+            return nodal_attributes
+        group = nc.groups['nodal_attributes']
+        group.set_auto_mask(False)
+        names = list(group.variables) if names is None else names
+        for name in names:
+            var = group[name]
+            nodal_attributes[name] = {
+                'units': var.units,
+                'values': var[:],
+                'coldstart': bool(var.coldstart),
+                'hotstart': bool(var.hotstart),
+            }
+    return nodal_attributes
+
+
+def _get_dimension_size(nc, name):
+    # dimensions of parent groups are visible from their subgroups
+    while name not in nc.dimensions:
+        nc = nc.parent
+    return len(nc.dimensions[name])
+
+
+def _get_index(node_id, node_ids):
+    sorter = np.argsort(node_id, kind='stable')
+    index = np.full(node_ids.shape, FILL_VALUE, dtype=np.int32)
+    mask = node_ids != -1
+    index[mask] = sorter[np.searchsorted(node_id, node_ids[mask],
+                                         sorter=sorter)]
+    return index
+
+
+def _write_boundaries(nc, create, node_id, boundaries):
+    ibtypes, ids, widths, counts, nodes = [], [], [], [], []
+    fields = {field: [] for field in BOUNDARY_FIELDS}
+    for ibtype, _boundaries in boundaries.items():
+        for id, boundary in _boundaries.items():
+            _nodes = np.asarray(boundary['node_id'], dtype=node_id.dtype)
+            ibtypes.append('' if ibtype is None else str(ibtype))
+            ids.append(id)
+            widths.append(0 if _nodes.ndim == 1 else _nodes.shape[1])
+            counts.append(len(_nodes))
+            _nodes = _nodes.reshape((len(_nodes), max(widths[-1], 1)))
+            padded = np.full((len(_nodes), 2), -1, dtype=node_id.dtype)
+            padded[:, :_nodes.shape[1]] = _nodes
+            nodes.append(padded)
+            for field, data in fields.items():
+                data.append(np.asarray(boundary.get(
+                    field, np.full(len(_nodes), np.nan)), dtype=np.float64))
+    nodes = np.vstack(nodes) if nodes else np.empty((0, 2), dtype=int)
+
+    nc.createDimension('nBoundary', len(ibtypes))
+    nc.createDimension('nBoundary_node', len(nodes))
+    nc.createDimension('Two', 2)
+    var = nc.createVariable('boundary_type', str, ('nBoundary',))
+    var.long_name = 'ADCIRC boundary type (IBTYPE), empty for ocean ' \
+        'boundaries'
+    for i, ibtype in enumerate(ibtypes):
+        var[i] = ibtype
+    nc.createVariable('boundary_id', 'i8', ('nBoundary',))[:] = ids
+    nc.createVariable('boundary_node_width', 'i4', ('nBoundary',))[:] = \
+        widths
+    var = nc.createVariable('boundary_node_count', 'i4', ('nBoundary',))
+    var.sample_dimension = 'nBoundary_node'
+    var[:] = counts
+    var = create(nc, 'boundary_nodes', 'i4', ('nBoundary_node', 'Two'),
+                 FILL_VALUE)
+    var.start_index = 0
+    var[:] = _get_index(node_id, nodes)
+    for field, data in fields.items():
+        data = np.concatenate(data) if data else np.empty((0,))
+        if np.all(np.isnan(data)):
+            continue
+        create(nc, f'boundary_{field}', 'f8', ('nBoundary_node',),
+               np.nan)[:] = data
+
+
+def _read_boundaries(nc):
+    node_id = nc['mesh_node_id'][:]
+    nodes = nc['boundary_nodes'][:]
+    node_ids = np.where(nodes != FILL_VALUE, node_id[nodes], -1)
+    fields = {field: nc[f'boundary_{field}'][:] for field in BOUNDARY_FIELDS
+              if f'boundary_{field}' in nc.variables}
+    offsets = np.concatenate([[0], np.cumsum(nc['boundary_node_count'][:])])
+    boundaries = {}
+    for i, (ibtype, id, width) in enumerate(zip(
+            nc['boundary_type'][:], nc['boundary_id'][:].tolist(),
+            nc['boundary_node_width'][:].tolist())):
+        start, end = offsets[i], offsets[i + 1]
+        if width == 0:
+            _nodes = node_ids[start:end, 0].tolist()
+        else:
+            _nodes = list(map(tuple, node_ids[start:end, :width].tolist()))
+        boundary = {'node_id': _nodes}
+        for field, data in fields.items():
+            data = data[start:end]
+            if not np.all(np.isnan(data)):
+                boundary[field] = data.tolist()
+        boundaries.setdefault(ibtype if ibtype != '' else None, {})[id] = \
+            boundary
+    return boundaries
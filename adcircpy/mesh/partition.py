@@ -0,0 +1,167 @@
+"""
+Mesh decomposition by recursive bisection, to preview the partition that
+``adcprep --partmesh`` would produce for a given number of processors.
+
+Nodes are split recursively along the longest axis of their bounding box
+(``'rcb'``) or along their principal axis of inertia (``'rib'``), in
+proportion to the number of ranks on each side, so any ``nproc`` is
+supported. The split is then refined by greedily moving boundary nodes to
+the neighboring rank holding most of their neighbors, within the allowed
+imbalance.
+"""
+import os
+import pathlib
+from typing import Union
+
+import numpy as np
+
+
+class Partition:
+
+    def __init__(self, adjacency, parts, nproc: int):
+        """Assignment of the nodes of the node :class:`Adjacency`
+        ``adjacency`` to ranks ``parts``, numbered from 0 to ``nproc - 1``.
+        """
+        self._adjacency = adjacency
+        self._parts = np.asarray(parts)
+        self._nproc = nproc
+
+    @property
+    def parts(self):
+        """Rank of each node."""
+        return self._parts
+
+    @property
+    def nproc(self):
+        return self._nproc
+
+    @property
+    def node_counts(self):
+        """Number of nodes owned by each rank."""
+        return np.bincount(self._parts, minlength=self._nproc)
+
+    @property
+    def imbalance(self):
+        """Largest rank node count over the mean node count."""
+        return float(self.node_counts.max() * self._nproc / len(self._parts))
+
+    @property
+    def edge_cut(self):
+        """Number of mesh edges between nodes of different ranks."""
+        rows, cols = self._adjacency.pairs()
+        return int(np.count_nonzero(
+            self._parts[rows] != self._parts[cols]) // 2)
+
+    @property
+    def ghost_counts(self):
+        """Number of nodes each rank needs from other ranks, i.e. the
+        neighbors of its nodes that it does not own.
+        """
+        rows, cols = self._adjacency.pairs()
+        cut = self._parts[rows] != self._parts[cols]
+        keys = np.unique(self._parts[rows][cut].astype(np.int64)
+                         * len(self._parts) + cols[cut])
+        return np.bincount(keys // len(self._parts), minlength=self._nproc)
+
+    def write(self, path: Union[str, os.PathLike], overwrite: bool = False):
+        """Writes the partition in the ``partmesh.txt`` format of adcprep:
+        the 1-based subdomain of each node, one per line, in node order.
+        """
+        path = pathlib.Path(path)
+        if path.is_file() and not overwrite:
+            raise Exception(
+                'File exists, pass overwrite=True to allow overwrite.')
+        np.savetxt(path, self._parts + 1, fmt='%d')
+
+
+def partition(mesh, nproc: int, method: str = 'rcb', refine: int = 4,
+              tolerance: float = 1.03):
+    """Partitions the nodes of ``mesh`` into ``nproc`` ranks.
+
+    Args:
+        method: ``'rcb'`` (recursive coordinate bisection) or ``'rib'``
+            (recursive inertial bisection).
+        refine: Number of boundary refinement passes.
+        tolerance: Largest allowed rank node count over the mean node count
+            during refinement.
+    """
+    if nproc < 1:
+        raise ValueError('Argument nproc must be a positive integer.')
+    if method not in ['rcb', 'rib']:
+        raise ValueError(f'Unknown partition method {method}, must be '
+                         '\'rcb\' or \'rib\'.')
+    adjacency = mesh.elements.node_neighbors
+    parts = _bisect(mesh.coords, nproc, method)
+    capacity = int(np.ceil(tolerance * len(parts) / nproc))
+    for _ in range(refine):
+        if not _refine(adjacency, parts, nproc, capacity):
+            break
+    return Partition(adjacency, parts, nproc)
+
+
+def _bisect(coords, nproc, method):
+    parts = np.zeros(len(coords), dtype=int)
+    stack = [(np.arange(len(coords)), nproc, 0)]
+    while stack:
+        index, nparts, offset = stack.pop()
+        if nparts == 1 or len(index) == 0:
+            parts[index] = offset
+            continue
+        left = nparts // 2
+        points = coords[index]
+        if method == 'rcb':
+            axis = np.argmax(np.ptp(points, axis=0))
+            position = points[:, axis]
+        else:
+            centered = points - points.mean(axis=0)
+            _, vectors = np.linalg.eigh(centered.T @ centered)
+            position = centered @ vectors[:, -1]
+        split = int(round(len(index) * left / nparts))
+        order = np.argpartition(position, split - 1) if 0 < split \
+            < len(index) else np.argsort(position, kind='stable')
+        stack.append((index[order[:split]], left, offset))
+        stack.append((index[order[split:]], nparts - left, offset + left))
+    return parts
+
+
+def _refine(adjacency, parts, nproc, capacity):
+    """Moves boundary nodes to the neighboring rank with most of their
+    neighbors, if that reduces the edge cut and the rank has room. Returns
+    whether any node moved.
+    """
+    rows, cols = adjacency.pairs()
+    size = len(parts)
+    # number of neighbors of each node in each rank
+    keys = np.sort(rows.astype(np.int64) * nproc + parts[cols])
+    unique = np.flatnonzero(np.append(True, np.diff(keys) != 0))
+    counts = np.diff(np.append(unique, len(keys)))
+    keys = keys[unique]
+    node, rank = np.divmod(keys, nproc)
+    own = np.zeros(size, dtype=int)
+    mask = rank == parts[node]
+    own[node[mask]] = counts[mask]
+    gain = counts[~mask] - own[node[~mask]]
+    node, rank = node[~mask], rank[~mask]
+    positive = gain > 0
+    node, rank, gain = node[positive], rank[positive], gain[positive]
+    if len(node) == 0:
+        return False
+    # best target of each node, then best moves first within each rank
+    order = np.lexsort((-gain, node))
+    first = np.append(True, np.diff(node[order]) != 0)
+    node, rank, gain = node[order][first], rank[order][first], \
+        gain[order][first]
+    order = np.lexsort((-gain, rank))
+    node, rank = node[order], rank[order]
+    start = np.searchsorted(rank, np.arange(nproc))
+    room = capacity - np.bincount(parts, minlength=nproc)
+    accepted = np.arange(len(rank)) - start[rank] < room[rank]
+    # only move in the direction (to a higher or lower rank) with most
+    # moves, so two neighbors never swap ranks in the same pass
+    direction = parts[node] < rank
+    if np.count_nonzero(accepted & direction) \
+            < np.count_nonzero(accepted & ~direction):
+        direction = ~direction
+    accepted &= direction
+    parts[node[accepted]] = rank[accepted]
+    return bool(np.any(accepted))
@@ -0,0 +1,177 @@
+"""
+Element quality metrics, computed with array operations over all the
+triangles and quads of a mesh.
+
+Lengths and areas are in meters: geographic coordinates are scaled around
+each element with the local radii of curvature of the ellipsoid of the mesh
+CRS. Nodal values are taken as elevations (positive up), as stored by
+:class:`~adcircpy.mesh.fort14.Fort14`, so the water depth is their negative.
+"""
+import numpy as np
+import pandas as pd
+
+METRICS = [
+    'area',
+    'min_angle',
+    'max_angle',
+    'aspect_ratio',
+    'skewness',
+    'depth_gradient',
+    'critical_timestep',
+]
+
+# for each metric, whether lower values are worse
+LOWER_IS_WORSE = {
+    'area': True,
+    'min_angle': True,
+    'max_angle': False,
+    'aspect_ratio': False,
+    'skewness': False,
+    'depth_gradient': False,
+    'critical_timestep': True,
+}
+
+
+class MeshQuality:
+
+    def __init__(self, mesh, cfl: float = 1., maxvel: float = 5.,
+                 g: float = 9.81):
+        """Quality metrics of the elements of ``mesh``. The critical
+        timestep of each element is ``cfl`` times its shortest edge over the
+        shallow water wave celerity at its deepest node plus ``maxvel``.
+        """
+        self._mesh = mesh
+        self._cfl = cfl
+        self._maxvel = maxvel
+        self._g = g
+
+    @property
+    def df(self):
+        """DataFrame of the metrics, indexed by element index, with the
+        element id in column ``id``.
+        """
+        if not hasattr(self, '_df'):
+            elements = self._mesh.elements
+            data = {metric: np.full(len(elements.id), np.nan)
+                    for metric in METRICS}
+            vertices = elements.connectivity
+            x, y = _to_meters(self._mesh.coords, vertices, self._mesh.crs)
+            depth = -np.asarray(self._mesh.values, dtype=np.float64)
+            if depth.ndim > 1:
+                depth = depth[:, 0]
+            for n in np.unique(elements.nverts):
+                mask = elements.nverts == n
+                metrics = _get_metrics(
+                    x[mask, :n], y[mask, :n], depth[vertices[mask, :n]],
+                    self._cfl, self._maxvel, self._g)
+                for metric, values in metrics.items():
+                    data[metric][mask] = values
+            df = pd.DataFrame({'id': elements.id, 'nverts': elements.nverts,
+                               **data})
+            self._df = df
+        return self._df
+
+    def __getitem__(self, metric):
+        return self.df[metric].to_numpy()
+
+    def worst(self, metric: str = 'min_angle', n: int = 10):
+        """The ``n`` worst elements by ``metric``."""
+        if metric not in LOWER_IS_WORSE:
+            raise ValueError(f'Unknown quality metric {metric}, must be one '
+                             f'of {METRICS}.')
+        if LOWER_IS_WORSE[metric]:
+            return self.df.nsmallest(n, metric)
+        return self.df.nlargest(n, metric)
+
+    def histogram(self, metric: str, bins=10):
+        """Histogram ``(counts, bin_edges)`` of ``metric`` over the elements
+        (see :func:`numpy.histogram`).
+        """
+        values = self[metric]
+        return np.histogram(values[np.isfinite(values)], bins=bins)
+
+    def summary(self):
+        """DataFrame of the distribution of each metric."""
+        return self.df[METRICS].describe(
+            percentiles=[.001, .01, .05, .5, .95, .99, .999]).T
+
+
+def _to_meters(xy, vertices, crs):
+    """(NE, nverts) x and y coordinates of the vertices of each element,
+    relative to its first vertex and in meters for geographic coordinate
+    systems.
+    """
+    vertices = np.where(vertices != -1, vertices, vertices[:, :1])
+    x = xy[:, 0][vertices]
+    y = xy[:, 1][vertices]
+    x -= x[:, :1]
+    y -= y[:, :1]
+    if crs is not None and crs.is_geographic:
+        geod = crs.get_geod()
+        lat = np.radians(xy[vertices[:, 0], 1])
+        w = np.sqrt(1. - geod.es * np.sin(lat) ** 2)
+        # prime vertical and meridional radii of curvature
+        N = geod.a / w
+        M = geod.a * (1. - geod.es) / w ** 3
+        x = (np.radians(x) + np.pi) % (2. * np.pi) - np.pi
+        x *= (N * np.cos(lat))[:, None]
+        y = np.radians(y) * M[:, None]
+    return x, y
+
+
+def _get_metrics(x, y, depth, cfl, maxvel, g):
+    n = x.shape[1]
+    # edge from each vertex to the following one
+    ex = np.roll(x, -1, axis=1) - x
+    ey = np.roll(y, -1, axis=1) - y
+    lengths = np.hypot(ex, ey)
+    signed_area = .5 * np.sum(x * np.roll(y, -1, axis=1)
+                              - np.roll(x, -1, axis=1) * y, axis=1)
+    orientation = np.where(signed_area < 0., -1., 1.)[:, None]
+
+    # interior angle at each vertex, between the edges to its neighbors
+    ax, ay = -np.roll(ex, 1, axis=1), -np.roll(ey, 1, axis=1)
+    cross = (ex * ay - ey * ax) * orientation
+    dot = ax * ex + ay * ey
+    angles = np.degrees(np.arctan2(cross, dot)) % 360.
+    min_angle, max_angle = angles.min(axis=1), angles.max(axis=1)
+
+    equiangle = 180. * (n - 2) / n
+    skewness = np.maximum((max_angle - equiangle) / (180. - equiangle),
+                          (equiangle - min_angle) / equiangle)
+
+    area = np.abs(signed_area)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if n == 3:
+            # circumradius over twice the inradius, 1 for equilateral
+            aspect_ratio = np.prod(lengths, axis=1) \
+                * lengths.sum(axis=1) / (16. * area ** 2)
+        else:
+            aspect_ratio = lengths.max(axis=1) / lengths.min(axis=1)
+
+    # largest gradient of the linear interpolant over the element triangles
+    depth_gradient = np.zeros(len(x))
+    for i, j, k in [(0, 1, 2)] if n == 3 else [(0, 1, 3), (1, 2, 3)]:
+        ux, uy, du = x[:, j] - x[:, i], y[:, j] - y[:, i], \
+            depth[:, j] - depth[:, i]
+        vx, vy, dv = x[:, k] - x[:, i], y[:, k] - y[:, i], \
+            depth[:, k] - depth[:, i]
+        det = ux * vy - uy * vx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gx = (du * vy - dv * uy) / det
+            gy = (dv * ux - du * vx) / det
+        depth_gradient = np.maximum(depth_gradient, np.hypot(gx, gy))
+
+    celerity = np.sqrt(g * np.maximum(depth.max(axis=1), 0.)) + abs(maxvel)
+    with np.errstate(divide='ignore'):
+        critical_timestep = cfl * lengths.min(axis=1) / celerity
+
+    return {
+        'area': area,
+        'min_angle': min_angle,
+        'max_angle': max_angle,
+        'aspect_ratio': aspect_ratio,
+        'skewness': skewness,
+        'depth_gradient': depth_gradient,
+        'critical_timestep': critical_timestep,
+    }
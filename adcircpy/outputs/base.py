@@ -1,6 +1,8 @@
 import abc
 from functools import lru_cache
+import os
 import pathlib
+from typing import Union
 
 from matplotlib.animation import FuncAnimation
 import matplotlib.pyplot as plt
@@ -9,6 +11,8 @@ from netCDF4 import Dataset
 import numpy as np
 from pyproj import CRS
 
+from adcircpy.mesh.base import Grd
+from adcircpy.mesh.mapped import MappedMesh
 from adcircpy.mesh.parsers import sms2dm
 from adcircpy.figures import figure
 
@@ -25,9 +29,23 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
         "maxele": "zeta_max"
     }
 
-    def __init__(self, path, crs=None):
+    def __init__(self, path, crs=None, mesh=None,
+                 cache: Union[bool, str, os.PathLike] = False):
+        """Argument mesh optionally gives the geometry of the output, either
+        as a path to a grd/fort.14 file, a
+        :class:`~adcircpy.mesh.mapped.MappedMesh` or a
+        :class:`~adcircpy.mesh.base.Grd`. By default the geometry is read
+        from the output file itself.
+
+        A mesh file is read into memory, unless ``cache=True`` (or a cache
+        directory) is given, in which case it is memory-mapped through its
+        binary store in the mesh cache, which is written if needed (see
+        :class:`adcircpy.mesh.mapped.MappedMesh`).
+        """
         self._path = path
         self._crs = crs
+        self._cache = cache
+        self._mesh = mesh
 
     def export(self, path, overwrite=False):
         coords = {i + 1: (self.x[i], self.y[i]) for i in
@@ -79,6 +97,8 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
     @property
     @lru_cache(maxsize=None)
     def x(self):
+        if self._mesh is not None:
+            return self._mesh.x
         if isinstance(self._ptr, Dataset):
             return self._ptr['x'][:].data
         else:
@@ -87,6 +107,8 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
     @property
     @lru_cache(maxsize=None)
     def y(self):
+        if self._mesh is not None:
+            return self._mesh.y
         if isinstance(self._ptr, Dataset):
             return self._ptr['y'][:].data
         else:
@@ -95,6 +117,10 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
     @property
     @lru_cache(maxsize=None)
     def triangles(self):
+        if isinstance(self._mesh, MappedMesh):
+            return self._mesh.triangles
+        if self._mesh is not None:
+            return self._mesh.triangulation.triangles
         if isinstance(self._ptr, Dataset):
             return self._ptr['element'][:].data - 1
         else:
@@ -103,6 +129,8 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
     @property
     @lru_cache(maxsize=None)
     def triangulation(self):
+        if self._mesh is not None:
+            return self._mesh.triangulation
         return Triangulation(self.x, self.y, triangles=self.triangles)
 
     @property
@@ -134,6 +162,19 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
             crs = CRS.from_user_input(crs)
         self.__crs = crs
 
+    @property
+    def _mesh(self):
+        return self.__mesh
+
+    @_mesh.setter
+    def _mesh(self, mesh):
+        if isinstance(mesh, (str, os.PathLike)):
+            if self._cache:
+                mesh = MappedMesh.open(mesh, cache=self._cache)
+            else:
+                mesh = Grd.open(mesh)
+        self.__mesh = mesh
+
     @property
     def _cmap(self):
         return None
@@ -205,8 +246,9 @@ class SurfaceOutput(metaclass=abc.ABCMeta):
 
 class SurfaceOutputTimeseries(SurfaceOutput):
 
-    def __init__(self, path, crs=None, index=0):
-        super().__init__(path, crs)
+    def __init__(self, path, crs=None, index=0, mesh=None,
+                 cache: Union[bool, str, os.PathLike] = False):
+        super().__init__(path, crs, mesh, cache)
         self.index = index
 
     def __iter__(self):
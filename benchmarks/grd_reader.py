@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+"""
+Compares :func:`adcircpy.mesh.parsers.grd.buffer_to_dict` against
+:func:`adcircpy.mesh.parsers.grd.buffer_to_arrays` on a synthetic structured
+triangular mesh.
+
+    python benchmarks/grd_reader.py --nodes 2000000
+"""
+import argparse
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+
+from adcircpy.mesh.parsers import grd
+
+
+def synthetic_fort14(path, nodes):
+    n = int(np.ceil(np.sqrt(nodes)))
+    x, y = np.meshgrid(np.linspace(-80., -70., n), np.linspace(30., 40., n))
+    values = np.random.uniform(-100., 10., x.size)
+    idx = np.arange(x.size).reshape((n, n))
+    lower_left = idx[:-1, :-1].ravel()
+    lower_right = idx[:-1, 1:].ravel()
+    upper_left = idx[1:, :-1].ravel()
+    upper_right = idx[1:, 1:].ravel()
+    triangles = np.vstack([
+        np.column_stack([lower_left, lower_right, upper_right]),
+        np.column_stack([lower_left, upper_right, upper_left]),
+    ]) + 1
+    with open(path, 'w') as f:
+        f.write(f'synthetic EPSG:4326\n{len(triangles)} {x.size}\n')
+        np.savetxt(
+            f,
+            np.column_stack([np.arange(1, x.size + 1), x.ravel(), y.ravel(),
+                             values]),
+            fmt=['%d', '%.16E', '%.16E', '%.16E'])
+        np.savetxt(
+            f,
+            np.column_stack([np.arange(1, len(triangles) + 1),
+                             np.full(len(triangles), 3), triangles]),
+            fmt='%d')
+        f.write('0\n0\n0\n0\n')
+    return x.size, len(triangles)
+
+
+def timeit(function, path):
+    start = time.perf_counter()
+    with open(path) as f:
+        function(f)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=2000000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir) / 'fort.14'
+        NP, NE = synthetic_fort14(path, args.nodes)
+        print(f'{NP} nodes, {NE} elements')
+        bulk = timeit(grd.buffer_to_arrays, path)
+        print(f'buffer_to_arrays: {bulk:.2f} s')
+        legacy = timeit(grd.buffer_to_dict, path)
+        print(f'buffer_to_dict:   {legacy:.2f} s')
+        print(f'speedup: {legacy / bulk:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
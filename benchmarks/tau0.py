@@ -0,0 +1,74 @@
+#! /usr/bin/env python
+"""
+Compares :meth:`adcircpy.AdcircMesh.generate_tau0` against the previous
+loop-based implementation on a synthetic structured triangular mesh, and
+checks that both produce identical TAU0 values.
+
+    python benchmarks/tau0.py --nodes 200000
+"""
+import argparse
+from collections import defaultdict
+from itertools import permutations
+import pathlib
+import tempfile
+import time
+
+import numpy as np
+
+from adcircpy import AdcircMesh
+from grd_reader import synthetic_fort14
+
+
+def legacy_tau0(mesh, default_value=0.03, threshold_distance=1750.,
+                shallow_tau0=0.02, deep_tau0=0.005, threshold_depth=-10.):
+    node_neighbors = defaultdict(set)
+    for simplex in mesh.triangulation.triangles:
+        for i, j in permutations(simplex, 2):
+            node_neighbors[i].add(j)
+    points = mesh.get_xy(3395)
+    values = np.full(mesh.values.shape, default_value)
+    for k, v in node_neighbors.items():
+        x0, y0 = points[k]
+        distances = list()
+        for idx in v:
+            x1, y1 = points[idx]
+            distances.append(np.sqrt((x0 - x1) ** 2 + (y0 - y1) ** 2))
+        distance = np.mean(distances)
+        if distance >= threshold_distance:
+            if mesh.values[k] >= threshold_depth:
+                values[k] = shallow_tau0
+            else:
+                values[k] = deep_tau0
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=200000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = pathlib.Path(tmpdir) / 'fort.14'
+        NP, NE = synthetic_fort14(path, args.nodes)
+        print(f'{NP} nodes, {NE} elements')
+        mesh = AdcircMesh.open(path, crs='EPSG:4326')
+
+        start = time.perf_counter()
+        mesh.generate_tau0()
+        vectorized = time.perf_counter() - start
+        print(f'generate_tau0: {vectorized:.2f} s')
+
+        start = time.perf_counter()
+        expected = legacy_tau0(mesh)
+        legacy = time.perf_counter() - start
+        print(f'legacy:        {legacy:.2f} s')
+        print(f'speedup: {legacy / vectorized:.1f}x')
+
+        values = mesh.primitive_weighting_in_continuity_equation.to_dense()
+        identical = np.array_equal(values.ravel(), expected)
+        print(f'identical output: {identical}')
+        if not identical:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,18 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
+from haversine import Unit, haversine
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, box
 
 from adcircpy import AdcircMesh
+from adcircpy.crs import get_transformer
+from adcircpy.mesh import cache as mesh_cache
+from adcircpy.mesh.base import edges_to_rings, sort_rings
+from adcircpy.mesh.fort13 import parse_fort13
+from adcircpy.mesh.mapped import MappedMesh
+from adcircpy.outputs import Maxele
 
 
 class AdcircMeshTestCase(unittest.TestCase):
@@ -92,6 +102,61 @@ class AdcircMeshTestCase(unittest.TestCase):
                 f.write(f'{id} {len(geom)} {" ".join(idx for idx in geom)}\n')
         self.assertIsInstance(AdcircMesh.open(tmpfile.name), AdcircMesh)
 
+    def test_open_cache(self):
+        tmpdir = pathlib.Path(tempfile.mkdtemp())
+        path = tmpdir / 'fort.14'
+        AdcircMesh(self.nodes, self.elements).write(path)
+        cache_dir = tmpdir / 'cache'
+        h = AdcircMesh.open(path, cache=cache_dir)
+        store = mesh_cache.get_store_path(path, cache_dir)
+        self.assertTrue((store / 'metadata.json').is_file())
+        with patch('adcircpy.mesh.parsers.grd.buffer_to_arrays') as parser:
+            cached = AdcircMesh.open(path, cache=cache_dir)
+            parser.assert_not_called()
+        self.assertEqual(str(h), str(cached))
+
+        # a modified mesh file invalidates the cache entry
+        AdcircMesh({id: (coords, 0.) for id, (coords, _)
+                    in self.nodes.items()}, self.elements).write(
+            path, overwrite=True)
+        self.assertIsNone(mesh_cache.load(path, cache_dir))
+        self.assertTrue(np.all(
+            AdcircMesh.open(path, cache=cache_dir).values == 0.))
+
+        mesh_cache.clear(cache_dir=cache_dir)
+        self.assertFalse(store.exists())
+
+    def test_mapped_mesh(self):
+        tmpdir = pathlib.Path(tempfile.mkdtemp())
+        path = tmpdir / 'fort.14'
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        h.write(path)
+        m = MappedMesh.open(path, crs=h.crs, cache=tmpdir / 'cache')
+        self.assertIsInstance(m.x, np.memmap)
+        self.assertIsInstance(m.triangles, np.memmap)
+        np.testing.assert_array_equal(m.coords, h.coords)
+        np.testing.assert_array_equal(m.values, -h.values)
+        np.testing.assert_array_equal(
+            m.triangles, h.triangulation.triangles)
+        self.assertTrue(m.crs.equals(h.crs))
+
+    def test_output_mesh(self):
+        tmpdir = pathlib.Path(tempfile.mkdtemp())
+        path = tmpdir / 'fort.14'
+        AdcircMesh(self.nodes, self.elements).write(path)
+        (tmpdir / 'maxele.63.nc').touch()
+        # a mesh path is read without writing to the mesh cache by default
+        with patch.object(mesh_cache, 'update') as update:
+            output = Maxele(tmpdir / 'maxele.63.nc', mesh=path)
+            np.testing.assert_array_equal(output.x, [
+                node[0][0] for node in self.nodes.values()])
+        update.assert_not_called()
+        output = Maxele(tmpdir / 'maxele.63.nc', mesh=path,
+                        cache=tmpdir / 'cache')
+        self.assertIsInstance(output._mesh, MappedMesh)
+        self.assertTrue(mesh_cache.get_store_path(
+            path, tmpdir / 'cache').is_dir())
+
     @patch('matplotlib.pyplot.show')
     def test_make_plot(self, mock):
         h = AdcircMesh(self.nodes, self.elements)
@@ -133,6 +198,418 @@ class AdcircMeshTestCase(unittest.TestCase):
                           pathlib.Path(tmpdir.name) / 'test_AdcircMesh.txt',
                           format='txt')
 
+    def test_write_ugrid(self):
+        boundaries = {
+            None: {0: {'node_id': ['10', '11', '1', '2']}},
+            '20': {0: {'node_id': ['4', '6']}},
+            '4': {0: {'node_id': [('3', '9'), ('8', '7')],
+                      'barrier_height': [1., 2.],
+                      'subcritical_flow_coefficient': [.5, .5],
+                      'supercritical_flow_coefficient': [.6, .6]}},
+        }
+        h = AdcircMesh(self.nodes, self.elements, boundaries=boundaries,
+                       crs=4326)
+        h.mannings_n_at_sea_floor = np.full(h.values.shape, .025)
+        tmpdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(tmpdir.name) / 'test_AdcircMesh.nc'
+        h.write(path, format='ugrid')
+        u = AdcircMesh.open(path)
+        self.assertEqual(str(u), str(h))
+        self.assertTrue(u.crs.equals(h.crs))
+        self.assertEqual(u.boundaries.to_dict()['4'][0]['node_id'],
+                         [(3, 9), (8, 7)])
+        np.testing.assert_array_equal(
+            u.get_nodal_attribute('mannings_n_at_sea_floor').to_dense(),
+            h.get_nodal_attribute('mannings_n_at_sea_floor').to_dense())
+        self.assertTrue(u.has_nodal_attribute('mannings_n_at_sea_floor'))
+
+    def test_rings(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        rings = h.hull.rings()
+        self.assertEqual(rings['type'].tolist(), ['exterior', 'interior'])
+        self.assertEqual(
+            sorted(h.nodes.get_id_by_index(
+                sort_rings(edges_to_rings([(6, 7), (7, 8), (8, 6)]),
+                           h.coords)[0]['exterior'][:, 0]).tolist()),
+            [7, 8, 9])
+        interior = np.asarray(rings.iloc[1].geometry.coords)
+        self.assertEqual(
+            sorted(map(tuple, interior[:-1].tolist())),
+            [(.33, .33), (.5, .66), (.66, .33)])
+
+    def test_rings_pinched(self):
+        # a hole touching the outer boundary at a single vertex, on which
+        # both rings start
+        coords = np.array([[0., 0.], [4., 0.], [4., 4.], [2., 4.], [0., 4.],
+                           [1., 3.], [3., 3.]])
+        outer = np.column_stack([[3, 4, 0, 1, 2], [4, 0, 1, 2, 3]])
+        hole = np.column_stack([[3, 6, 5], [6, 5, 3]])
+        for index_rings in [[outer, hole], [hole, outer]]:
+            rings = sort_rings(index_rings, coords)
+            self.assertEqual(len(rings), 1)
+            self.assertEqual(rings[0]['exterior'][:, 0].tolist(),
+                             [3, 4, 0, 1, 2])
+            self.assertEqual(
+                [interior[:, 0].tolist() for interior in
+                 rings[0]['interiors']], [[3, 6, 5]])
+
+        # 3x3 grid with a triangle removed next to the bottom boundary
+        n = 4
+        nodes = {str(i * n + j + 1): ((float(j), float(i)), -1.)
+                 for i in range(n) for j in range(n)}
+        elements = {}
+        for i in range(n - 1):
+            for j in range(n - 1):
+                ll, lr = i * n + j + 1, i * n + j + 2
+                ul, ur = ll + n, lr + n
+                elements[str(len(elements) + 1)] = [ll, lr, ur]
+                if (i, j) != (0, 1):
+                    elements[str(len(elements) + 1)] = [ll, ur, ul]
+        elements = {id: [str(node) for node in geom]
+                    for id, geom in elements.items()}
+        rings = AdcircMesh(nodes, elements).hull.rings()
+        # the hole is walked into the boundary through the pinched vertex,
+        # so no spurious exterior is made of it
+        self.assertEqual(rings['type'].tolist(), ['exterior'])
+        self.assertAlmostEqual(Polygon(rings.iloc[0].geometry).area, 8.5)
+
+    def test_spatial_index(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        self.assertEqual(h.nearest_node((.49, .01)), 1)
+        np.testing.assert_array_equal(
+            h.nearest_node([[1.1, 1.1], [-.9, .1]]), [3, 10])
+
+        points = [[.1, .05], [-.5, .5], [.5, .45], [2., 2.]]
+        element_index, weights = h.locate_elements(points)
+        np.testing.assert_array_equal(element_index, [1, 7, -1, -1])
+        np.testing.assert_array_equal(
+            h.contains(points), [True, True, False, False])
+        np.testing.assert_allclose(weights.sum(axis=1), [1., 1., 0., 0.])
+        connectivity = h.elements.connectivity[element_index[:2]]
+        np.testing.assert_allclose(
+            np.einsum('ij,ijk->ik', weights[:2], h.coords[connectivity]),
+            points[:2])
+
+    def test_gdf(self):
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        nodes = h.nodes.gdf
+        self.assertEqual(nodes.crs, h.crs)
+        np.testing.assert_array_equal(nodes.geometry.x, h.x)
+        np.testing.assert_array_equal(nodes['values'], h.values)
+        elements = h.elements.gdf
+        self.assertEqual(elements['id'].tolist(), list(range(1, 11)))
+        self.assertEqual(
+            list(elements.geometry[7].exterior.coords),
+            [(0., 1.), (-1., 1.), (-1., 0.), (0., 0.), (0., 1.)])
+        # the triangle between nodes 7, 8 and 9 is a hole of the mesh
+        self.assertAlmostEqual(
+            shapely.area(np.asarray(elements.geometry)).sum(),
+            2.25 - .33 * .33 / 2)
+        self.assertEqual(
+            h.nodes.get_gdf((.3, .3, .7, .7)).index.tolist(), [6, 7, 8])
+        self.assertEqual(
+            h.elements.get_gdf(box(-1., 0., -.5, .5))['id'].tolist(), [8])
+
+    def test_clip(self):
+        boundaries = {
+            None: {0: {'node_id': ['10', '11', '1', '2']}},
+            '0': {0: {'node_id': ['2', '3', '4', '6', '5', '10']}},
+            '4': {0: {'node_id': [('3', '9'), ('8', '7')],
+                      'barrier_height': [1., 2.],
+                      'subcritical_flow_coefficient': [.5, .5],
+                      'supercritical_flow_coefficient': [.6, .6]}},
+        }
+        h = AdcircMesh(self.nodes, self.elements, boundaries=boundaries,
+                       crs=4326)
+        h.mannings_n_at_sea_floor = np.where(h.values > 0., .03, .02)
+        c = h.clip(box(-1., 0., -.1, .5))
+        self.assertEqual(c.elements.elements, {1: [2, 3, 4, 1]})
+        np.testing.assert_array_equal(c.coords, h.coords[[0, 4, 9, 10]])
+        np.testing.assert_array_equal(c.values, h.values[[0, 4, 9, 10]])
+        self.assertEqual(c.boundaries.to_dict(),
+                         {None: {0: {'node_id': [3, 4, 1]}},
+                          '0': {0: {'node_id': [2, 3]}}})
+        np.testing.assert_array_equal(
+            c.mannings_n_at_sea_floor.to_dense().ravel(),
+            [.02, .02, .03, .03])
+        self.assertTrue(c.has_nodal_attribute('mannings_n_at_sea_floor'))
+
+        s = h.subset((.4, -.1, 1.1, .8), renumber=False)
+        self.assertEqual(sorted(s.elements.id.tolist()), [1, 2, 3, 4, 5, 6, 9])
+        self.assertEqual(s.boundaries.to_dict()['0'],
+                         {0: {'node_id': [2, 3, 4]}})
+        self.assertEqual(s.boundaries.to_dict()['4'][0]['node_id'],
+                         [(3, 9), (8, 7)])
+        self.assertEqual(s.boundaries.to_dict()[None][0]['node_id'], [1, 2])
+
+    def test_reorder(self):
+        boundaries = {None: {0: {'node_id': ['10', '11', '1', '2']}}}
+        h = AdcircMesh(self.nodes, self.elements, boundaries=boundaries)
+        h.mannings_n_at_sea_floor = np.where(h.values > 0., .03, .02)
+        for method in ['rcm', 'hilbert', 'morton']:
+            r, node_index, element_index = h.reorder(method)
+            self.assertEqual(sorted(node_index.tolist()), list(range(11)))
+            np.testing.assert_array_equal(r.coords, h.coords[node_index])
+            np.testing.assert_array_equal(r.values, h.values[node_index])
+            np.testing.assert_array_equal(
+                r.mannings_n_at_sea_floor.to_dense(),
+                h.mannings_n_at_sea_floor.to_dense()[node_index])
+            connectivity = r.elements.connectivity
+            np.testing.assert_array_equal(
+                np.where(connectivity != -1, node_index[connectivity], -1),
+                h.elements.connectivity[element_index])
+            self.assertEqual(
+                h.nodes.id[node_index[np.array(
+                    r.boundaries.to_dict()[None][0]['node_id']) - 1]
+                ].tolist(), [10, 11, 1, 2])
+            self.assertEqual(r.nodes.id.tolist(), list(range(1, 12)))
+        self.assertLessEqual(h.reorder('rcm')[0].bandwidth, h.bandwidth)
+        self.assertRaises(ValueError, h.reorder, 'random')
+
+    def test_partition(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        for method in ['rcb', 'rib']:
+            p = h.partition(3, method)
+            self.assertEqual(p.node_counts.sum(), 11)
+            self.assertEqual(sorted(p.node_counts.tolist()), [3, 4, 4])
+            rows, cols = h.elements.node_neighbors.pairs()
+            cut = p.parts[rows] != p.parts[cols]
+            self.assertEqual(p.edge_cut, np.count_nonzero(cut) // 2)
+            for rank in range(3):
+                self.assertEqual(
+                    p.ghost_counts[rank],
+                    len(set(cols[cut & (p.parts[rows] == rank)].tolist())))
+        p = h.partition(2)
+        self.assertEqual(p.parts[h.x < 0.].tolist(), [0, 0])
+        tmpdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(tmpdir.name) / 'partmesh.txt'
+        p.write(path)
+        np.testing.assert_array_equal(np.loadtxt(path, dtype=int),
+                                      p.parts + 1)
+        self.assertRaises(ValueError, h.partition, 0)
+
+    def test_quality(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        q = h.quality(cfl=.5)
+        square = q.df.loc[7]
+        self.assertEqual((square['area'], square['min_angle'],
+                          square['max_angle'], square['aspect_ratio']),
+                         (1., 90., 90., 1.))
+        self.assertAlmostEqual(square['skewness'], 0.)
+        triangle = q.df.loc[6]  # nodes 4, 6 and 5
+        np.testing.assert_allclose(
+            triangle[['area', 'min_angle', 'max_angle', 'aspect_ratio',
+                      'skewness', 'depth_gradient', 'critical_timestep']
+                     ].to_numpy(dtype=float),
+            [.25, 45., 90., (np.sqrt(2.) + 1.) / 2., .25, np.sqrt(10.),
+             .5 * np.sqrt(.5) / (np.sqrt(9.81 * 2.) + 5.)])
+        self.assertEqual(q.worst('min_angle', 1).index.tolist(), [9])
+        counts, _ = q.histogram('skewness', bins=5)
+        self.assertEqual(counts.sum(), 10)
+        self.assertEqual(q.summary().loc['area', 'count'], 10)
+
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        area, _ = h.crs.get_geod().geometry_area_perimeter(
+            h.elements.gdf.geometry[7])
+        self.assertAlmostEqual(h.quality()['area'][7] / abs(area), 1.,
+                               places=2)
+
+    def test_get_xy(self):
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        xy = h.get_xy(3395)
+        self.assertIs(h.get_xy('EPSG:3395'), xy)
+        self.assertFalse(xy.flags.writeable)
+        self.assertIs(get_transformer(4326, 3395),
+                      get_transformer('EPSG:4326', 'EPSG:3395'))
+        h.transform_to(3395)
+        np.testing.assert_array_equal(h.coords, xy)
+        self.assertTrue(h.coords.flags.writeable)
+        np.testing.assert_allclose(
+            h.get_xy(4326),
+            [coords for coords, _ in self.nodes.values()], atol=1e-9)
+
+    def test_adjacency(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        # quad 5-10-11-1 makes 10 and 1 neighbors through its diagonal
+        self.assertEqual(h.elements.get_indexes_around_index(9),
+                         [0, 4, 10])
+        self.assertEqual(h.node_neighbors[9].tolist(), [0, 4, 10])
+        self.assertEqual(h.node_neighbors[10].tolist(), [0, 9])
+        self.assertEqual(h.elements.node_elements[4].tolist(),
+                         [0, 6, 7, 8, 9])
+        self.assertEqual(h.elements.element_neighbors[7].tolist(), [9])
+        self.assertEqual(h.elements.element_neighbors[0].tolist(), [8, 9])
+        self.assertEqual(
+            h.elements.node_neighbors.union([9, 10]).tolist(), [0, 4, 9, 10])
+
+        # non-manifold edge 1-2, shared by three elements
+        nodes = {'1': ((0., 0.), -1.), '2': ((1., 0.), -1.),
+                 '3': ((0., 1.), -1.), '4': ((0., -1.), -1.),
+                 '5': ((1., 1.), -1.), '6': ((1., 2.), -1.)}
+        elements = {'1': ['1', '2', '3'], '2': ['2', '1', '4'],
+                    '3': ['1', '2', '5'], '4': ['3', '5', '6']}
+        neighbors = AdcircMesh(nodes, elements).elements.element_neighbors
+        self.assertEqual([neighbors[i].tolist() for i in range(4)],
+                         [[1, 2], [0, 2], [0, 1], []])
+
+    def test_critical_timestep(self):
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        dt = h.node_critical_timestep(.7, maxvel=5.)
+        # node 6 (index 5) only connects to nodes 4 and 5
+        expected = min(
+            haversine((1.5, .5), (1., 1.), unit=Unit.METERS),
+            haversine((1.5, .5), (1., 0.), unit=Unit.METERS))
+        self.assertAlmostEqual(dt[5], .7 * expected / 5., places=6)
+        self.assertEqual(h.critical_timestep(.7), np.min(dt))
+        _, geodesic = h.get_edge_lengths('geodesic')
+        _, spherical = h.get_edge_lengths('haversine')
+        np.testing.assert_allclose(geodesic, spherical, rtol=1e-2)
+
+    def test_generate_tau0(self):
+        h = AdcircMesh(self.nodes, self.elements, crs=4326)
+        expected = np.where(h.values >= 0., .02, .005)
+        for metric in ['projected', 'geodesic', 'haversine']:
+            h.generate_tau0(threshold_depth=0., metric=metric)
+            np.testing.assert_array_equal(np.ravel(
+                h.primitive_weighting_in_continuity_equation.to_dense()),
+                expected)
+        h.generate_tau0(threshold_distance=1e6)
+        np.testing.assert_array_equal(
+            h.primitive_weighting_in_continuity_equation.to_dense(), .03)
+        self.assertRaises(ValueError, h.generate_tau0, metric='manhattan')
+
+    def test_nodal_attributes(self):
+        h = AdcircMesh(self.nodes, self.elements)
+        values = np.tile([1., 2.], (len(self.nodes), 1))
+        values[3, 1] = 5.  # differs from the default in one column only
+        values[7] = [3., 4.]
+        h.add_nodal_attribute('test_attribute', 'm')
+        h.set_nodal_attribute('test_attribute', values, True, False)
+        attribute = h.get_nodal_attribute('test_attribute')
+        np.testing.assert_array_equal(attribute['defaults'], [1., 2.])
+        self.assertEqual(attribute['non_default_indexes'].tolist(), [3, 7])
+        np.testing.assert_array_equal(attribute.to_dense(), values)
+        self.assertNotIn('values', attribute)
+        self.assertIsNone(attribute.get('values'))
+
+        h.add_nodal_attribute('unset_attribute', 'm')
+        self.assertIsNone(
+            h.get_nodal_attribute('unset_attribute').to_dense())
+        with self.assertRaisesRegex(AttributeError, 'has no values'):
+            h.add_nodal_attribute_patch('unset_attribute',
+                                        box(.2, .2, .7, .7), 1.)
+
+        h.generate_constant_mannings_n(.025)
+        self.assertEqual(
+            len(h.mannings_n_at_sea_floor['non_default_indexes']), 0)
+        h.add_nodal_attribute_patch(
+            'test_attribute',
+            Polygon([(.9, .9), (1.1, .9), (1.1, 1.1), (.9, 1.1)]), [1., 2.])
+        values[3] = [1., 2.]
+        np.testing.assert_array_equal(attribute.to_dense(), values)
+        h.add_nodal_attribute_patches(
+            'test_attribute',
+            [box(.2, .2, .7, .7), box(.6, .3, .7, .4)],
+            [[6., 7.], [8., 9.]])
+        values[[6, 8]] = [6., 7.]
+        values[7] = [8., 9.]  # later patches win
+        np.testing.assert_array_equal(attribute.to_dense(), values)
+
+        tmpdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(tmpdir.name) / 'fort.13'
+        h.nodal_attributes.write(path)
+        u = AdcircMesh(self.nodes, self.elements, fort13=path)
+        self.assertEqual(str(u.nodal_attributes), str(h.nodal_attributes))
+        np.testing.assert_array_equal(
+            u.get_nodal_attribute('test_attribute').to_dense(), values)
+
+    def test_fort13_round_trip(self):
+        fort13 = '\n'.join([
+            'test fort.13',
+            '11',
+            '2',
+            'mannings_n_at_sea_floor',
+            'unitless',
+            '1',
+            '2.5000000000000001E-02',
+            'test_attribute',
+            'm',
+            '2',
+            '1.0000000000000000E+00 2.0000000000000000E+00',
+            'mannings_n_at_sea_floor',
+            '1',
+            '11 0.1',
+            'test_attribute',
+            '3',
+            '2 1.0 2.0',
+            '4 1.0 5.0',
+            '8 3.0 4.0',
+        ]) + '\n'
+        tmpdir = tempfile.TemporaryDirectory()
+        path = pathlib.Path(tmpdir.name) / 'fort.13'
+        with open(path, 'w') as f:
+            f.write(fort13)
+        h = AdcircMesh(self.nodes, self.elements, fort13=path)
+        attribute = h.get_nodal_attribute('test_attribute')
+        self.assertEqual(attribute['non_default_indexes'].tolist(), [1, 3, 7])
+        np.testing.assert_array_equal(attribute.to_dense()[[1, 3, 7]],
+                                      [[1., 2.], [1., 5.], [3., 4.]])
+        self.assertEqual(str(h.nodal_attributes), fort13)
+        h.nodal_attributes.write(path, overwrite=True)
+        with open(path) as f:
+            self.assertEqual(f.read(), fort13)
+
+        # formatted by another tool: the values are kept, not the text
+        other = '\n'.join([
+            'test fort.13',
+            '11',
+            '1',
+            'mannings_n_at_sea_floor',
+            '1',
+            '1',
+            '0.025',
+            'mannings_n_at_sea_floor',
+            '2',
+            '  3   0.100000E+00',
+            ' 11   2.000000E-02',
+        ])
+        with open(path, 'w') as f:
+            f.write(other)
+        h = AdcircMesh(self.nodes, self.elements, fort13=path)
+        attribute = h.get_nodal_attribute('mannings_n_at_sea_floor')
+        self.assertEqual(attribute['units'], 'unitless')
+        self.assertEqual(parse_fort13(path)['mannings_n_at_sea_floor'][
+            'units'], 'unitless')
+        self.assertEqual(str(h.nodal_attributes).split('\n')[-5:], [
+            'mannings_n_at_sea_floor', '2', '3 0.1', '11 0.02', ''])
+        h.nodal_attributes.write(path, overwrite=True)
+        u = AdcircMesh(self.nodes, self.elements, fort13=path)
+        np.testing.assert_array_equal(
+            u.get_nodal_attribute('mannings_n_at_sea_floor').to_dense(),
+            attribute.to_dense())
+        self.assertEqual(str(u.nodal_attributes), str(h.nodal_attributes))
+
+    def test_node_id_lookup(self):
+        nodes = {str(3 * int(id)): node for id, node in self.nodes.items()}
+        elements = {id: [str(3 * int(node_id)) for node_id in geom]
+                    for id, geom in self.elements.items()}
+        h = AdcircMesh(nodes, elements)
+        self.assertEqual(h.nodes.get_index_by_id('9'), 2)
+        self.assertEqual(h.nodes.get_index_by_id(33), 10)
+        self.assertEqual(
+            h.nodes.get_index_by_id(['3', '6', '30']).tolist(), [0, 1, 9])
+        self.assertEqual(h.nodes.get_id_by_index(4), 15)
+        self.assertRaises(KeyError, h.nodes.get_index_by_id, '4')
+        self.assertEqual(h.nodes.get_index_by_id(9.), 2)
+        self.assertRaises(KeyError, h.nodes.get_index_by_id, 9.7)
+        self.assertRaises(KeyError, h.nodes.get_index_by_id, [3., 6.5])
+        # contiguous id's take the arithmetic path
+        self.assertRaises(KeyError, AdcircMesh(self.nodes, self.elements)
+                          .nodes.get_index_by_id, 1.7)
+        self.assertEqual(h.triangles.shape, (9, 3))
+        self.assertEqual(h.quads.tolist(), [[4, 9, 10, 0]])
+        self.assertEqual(h.elements.connectivity.dtype.itemsize, 4)
+
     def test_triplot(self):
         h = AdcircMesh(self.nodes, self.elements, self.boundaries)
         h.triplot()
@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+import io
+import unittest
+
+import numpy as np
+
+from adcircpy.mesh.parsers import grd
+
+
+FORT14 = """gr3_unittest EPSG:4326
+10 11
+1 0.0 0.0 5.0
+2 0.5 0.0 4.0
+3 1.0 0.0 3.0
+4 1.0 1.0 2.0
+5 0.0 1.0 1.0
+6 0.5 1.5 0.0
+7 0.33 0.33 -1.0
+8 0.66 0.33 -2.0
+9 0.5 0.66 -3.0
+10 -1.0 1.0 -4.0
+11 -1.0 0.0 -5.0
+1 3 5 7 9
+2 3 1 2 7
+3 3 2 3 8
+4 3 8 7 2
+5 3 3 4 8
+6 3 4 9 8
+7 3 4 6 5
+8 4 5 10 11 1
+9 3 9 4 5
+10 3 5 1 7
+1 ! total number of ocean boundaries
+4 ! total number of ocean boundary nodes
+4 ! number of nodes for ocean_boundary_0
+10
+11
+1
+2
+2  ! total number of non-ocean boundaries
+5 ! Total number of non-ocean boundary nodes
+2 20 ! boundary 20:0
+4
+6
+3 21 ! boundary 21:0
+6
+5
+10
+"""
+
+
+class GrdParserTestCase(unittest.TestCase):
+
+    def test_buffer_to_arrays(self):
+        legacy = grd.buffer_to_dict(io.StringIO(FORT14))
+        bulk = grd.buffer_to_arrays(io.StringIO(FORT14), chunksize=4)
+
+        self.assertEqual(legacy['description'], bulk['description'])
+
+        node_id, coords, values = bulk['nodes']
+        self.assertEqual(list(map(str, node_id)), list(legacy['nodes']))
+        np.testing.assert_array_equal(
+            coords, [coords for coords, _ in legacy['nodes'].values()])
+        np.testing.assert_array_equal(
+            values, [value for _, value in legacy['nodes'].values()])
+
+        element_id, connectivity = bulk['elements']
+        self.assertEqual(list(map(str, element_id)), list(legacy['elements']))
+        for row, geom in zip(connectivity, legacy['elements'].values()):
+            self.assertEqual(
+                list(map(str, row[row != -1])), geom)
+
+        self.assertEqual(
+            {ibtype: {i: list(map(str, bnd['node_id']))
+                      for i, bnd in bnds.items()}
+             for ibtype, bnds in bulk['boundaries'].items()},
+            {ibtype: {i: bnd['node_id'] for i, bnd in bnds.items()}
+             for ibtype, bnds in legacy['boundaries'].items()})
+
+    def test_arrays_to_buffer(self):
+        legacy = grd.buffer_to_dict(io.StringIO(FORT14))
+        bulk = grd.buffer_to_arrays(io.StringIO(FORT14))
+        buf = io.StringIO()
+        grd.arrays_to_buffer(buf, **bulk, chunksize=3)
+        self.assertEqual(buf.getvalue(), grd.to_string(**legacy))
+
+        buf = io.StringIO()
+        grd.arrays_to_buffer(buf, **bulk, float_format='%.3E')
+        self.assertIn('\n7 3.300E-01 3.300E-01 -1.000E+00\n',
+                      buf.getvalue())
+
+    def test_buffer_to_arrays_malformed(self):
+        lines = FORT14.split('\n')
+        lines[3] = '2 0.5 0.0'
+        self.assertRaises(
+            ValueError, grd.buffer_to_arrays, io.StringIO('\n'.join(lines)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+import pathlib
+import tempfile
+import unittest
+
+import numpy as np
+from scipy.interpolate import griddata
+
+from adcircpy.forcing.tides import cache as tides_cache
+from adcircpy.forcing.tides.dataset import TidalDataset
+from adcircpy.forcing.tides.interpolation import Stencil, interpolate
+
+
+class GridDataset(TidalDataset):
+    """In-memory tidal dataset, recording the blocks read from it."""
+
+    def __init__(self, x, y, values):
+        super().__init__()
+        self._x, self._y, self._values = x, y, values
+        self.reads = []
+
+    def get_amplitude(self, constituent, vertices):
+        return self._get_interpolation('amplitude', constituent, vertices)
+
+    def get_phase(self, constituent, vertices):
+        return self._get_interpolation('phase', constituent, vertices)
+
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def constituents(self):
+        return ['M2']
+
+    def _read_window(self, variable, constituent, window):
+        self.reads.append(window)
+        return np.ma.concatenate([self._values[xslice, window.yslice]
+                                  for xslice in window.xslices])
+
+
+class TidalInterpolationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(0., 360., 2.)
+        self.y = np.arange(-80., 81., 2.)
+        x, y = np.meshgrid(self.x, self.y, indexing='ij')
+        self.values = 1. + .5 * x - .25 * y
+
+    def test_bilinear(self):
+        rng = np.random.default_rng(0)
+        xq = rng.uniform(-80., -60., 100)
+        yq = rng.uniform(20., 40., 100)
+        x, y = np.meshgrid(self.x, self.y, indexing='ij')
+        expected = griddata((x.flatten(), y.flatten()),
+                            self.values.flatten(), (xq + 360., yq))
+        np.testing.assert_allclose(
+            interpolate(self.x, self.y, self.values, xq, yq, period=360.),
+            expected)
+
+    def test_seam(self):
+        values = interpolate(self.x, self.y, self.values, [359., -1., 0.],
+                             [0., 0., 0.], period=360.)
+        # halfway between the last node (358) and the first one (0)
+        np.testing.assert_allclose(values, [90.5, 90.5, 1.])
+
+    def test_masked_fallback(self):
+        values = np.ma.masked_array(self.values, mask=False)
+        values[10:12, 10:13] = np.ma.masked
+        result = Stencil(self.x, self.y, [22.5, 40.], [-59.2, -59.])(values)
+        # the cell of the first point has masked corners, so it takes the
+        # value of the nearest valid node, (24, -60)
+        self.assertEqual(result[0], self.values[12, 10])
+        self.assertAlmostEqual(result[1], 1. + .5 * 40. + .25 * 59.)
+
+    def test_outside(self):
+        values = interpolate(self.x, self.y, self.values, [10.], [85.],
+                             period=360.)
+        # outside the grid, so it takes the value of the nearest node
+        self.assertEqual(values[0], self.values[5, -1])
+
+    def test_window(self):
+        dataset = GridDataset(self.x, self.y, self.values)
+        vertices = np.array([[-3., 10.], [1., 12.], [3., 11.]])
+        window = dataset._get_window(vertices)
+        # wraps around the end of the x axis, buffered by 2 cells
+        self.assertEqual(window.xslices, (slice(176, 180), slice(0, 5)))
+        self.assertEqual(window.yslice, slice(43, 50))
+        np.testing.assert_allclose(window.x, np.arange(352., 369., 2.))
+        np.testing.assert_allclose(
+            dataset.get_amplitude('M2', vertices),
+            interpolate(self.x, self.y, self.values, vertices[:, 0],
+                        vertices[:, 1], period=360.))
+        dataset.get_amplitude('M2', vertices)
+        self.assertEqual(len(dataset.reads), 1)
+
+    def test_window_inland(self):
+        values = np.ma.masked_array(self.values, mask=False)
+        values[20:61, 20:61] = np.ma.masked
+        dataset = GridDataset(self.x, self.y, values)
+        vertices = np.array([[70., 20.5], [10., 10.]])
+        expected = interpolate(self.x, self.y, values, vertices[:, 0],
+                               vertices[:, 1], period=360.)
+        # the first vertex is deep inside the masked block, so its nearest
+        # valid node, (70, 42), is only found on a wider block
+        self.assertEqual(expected[0], self.values[35, 61])
+        np.testing.assert_array_equal(
+            dataset.get_amplitude('M2', vertices), expected)
+        self.assertGreater(len(dataset.reads), 1)
+
+        dataset = GridDataset(self.x, self.y,
+                              np.ma.masked_array(self.values, mask=True))
+        self.assertTrue(np.all(np.isnan(
+            dataset.get_amplitude('M2', vertices))))
+
+    def test_get_all(self):
+        dataset = GridDataset(self.x, self.y, self.values)
+        vertices = np.array([[-70., 30.], [-69.5, 31.], [-69., 33.3]])
+        stencil = dataset.get_stencil(vertices)
+        self.assertIs(dataset.get_stencil(stencil), stencil)
+        amplitude, phase = dataset.get_all(['M2', 'S2'], stencil)
+        self.assertEqual(amplitude.shape, (2, 3))
+        expected = dataset('M2', vertices)
+        np.testing.assert_array_equal(amplitude[1], expected[0])
+        np.testing.assert_array_equal(phase[0], expected[1])
+        # one block read per variable and constituent
+        self.assertEqual(len(dataset.reads), 4)
+
+    def test_cache(self):
+        dataset = GridDataset(self.x, self.y, self.values)
+        vertices = np.array([[-70., 30.], [-69.5, 31.], [-69., 33.3]])
+        tmpdir = tempfile.TemporaryDirectory()
+        cache_dir = pathlib.Path(tmpdir.name)
+        amplitude, phase = tides_cache.get_all(dataset, ['M2'], vertices,
+                                               cache_dir)
+        self.assertEqual(len(dataset.reads), 2)
+        # warm: only the missing constituent is sampled
+        cached = tides_cache.get_all(dataset, ['S2', 'M2'], vertices,
+                                     cache_dir)
+        self.assertEqual(len(dataset.reads), 4)
+        np.testing.assert_array_equal(cached[0][1], amplitude[0])
+        tides_cache.get_all(dataset, ['S2', 'M2'], vertices, cache_dir)
+        self.assertEqual(len(dataset.reads), 4)
+        entries = tides_cache.entries(cache_dir)
+        self.assertEqual(sorted(entry['constituent'] for entry in entries),
+                         ['m2', 's2'])
+        self.assertEqual(entries[0]['size'], 3)
+        # other vertices miss
+        self.assertIsNone(tides_cache.load(dataset, 'M2', vertices[:2],
+                                           cache_dir))
+        tides_cache.clear(dataset, cache_dir)
+        self.assertEqual(tides_cache.entries(cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
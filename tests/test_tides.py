@@ -0,0 +1,42 @@
+#! /usr/bin/env python
+from datetime import datetime, timedelta
+import unittest
+
+import numpy as np
+
+from adcircpy.forcing.tides import Tides, get_astronomical_arguments
+
+
+class TidesTestCase(unittest.TestCase):
+
+    def test_astronomical_arguments(self):
+        constituents = ['M2', 'S2', 'N2', 'K1', 'O1', 'M4', 'L2', 'K2',
+                        'Mf', 'M1']
+        start_dates = [datetime(1995, 3, 1, 6) + timedelta(days=97 * i,
+                                                           hours=5 * i)
+                       for i in range(20)]
+        spinup_time = timedelta(days=2)
+        nodal_factors, greenwich_factors = get_astronomical_arguments(
+            constituents, start_dates, timedelta(days=10), spinup_time)
+        self.assertEqual(nodal_factors.shape, (10, 20))
+        tides = Tides()
+        for j, start_date in enumerate(start_dates):
+            tides.start_date = start_date
+            tides.end_date = start_date + timedelta(days=10)
+            tides.spinup_time = spinup_time
+            for i, constituent in enumerate(constituents):
+                self.assertEqual(nodal_factors[i, j],
+                                 tides.get_nodal_factor(constituent))
+                self.assertEqual(greenwich_factors[i, j],
+                                 tides.get_greenwich_factor(constituent))
+            del tides.end_date, tides.start_date
+
+        np.testing.assert_array_equal(
+            get_astronomical_arguments(['M2'], start_dates[:2],
+                                       datetime(2030, 1, 1))[0],
+            get_astronomical_arguments(['M2'], start_dates[:2],
+                                       [datetime(2030, 1, 1)] * 2)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()